@@ -0,0 +1,104 @@
+"""
+API Benchmark: requests/sec + latency percentiles per dashboard endpoint
+
+Purpose: Measure serve_hn endpoints in-process through Flask's test client
+         (no network), so runs are comparable across commits.
+Inputs: etlpipeline/data/hn_posts.db (or any hn_posts DB via --db)
+Outputs: Table on stdout, optional JSON report (--json)
+Usage:
+    python benchmarks/bench_api.py --requests 2000
+    python benchmarks/bench_api.py --cache --json bench_api.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+ETL_DIR = Path(__file__).resolve().parent.parent / "etlpipeline" / "etl"
+sys.path.insert(0, str(ETL_DIR))
+
+ENDPOINTS = ["/api/dashboard", "/api/users", "/api/trending", "/api/activity"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def bench_endpoint(client: Any, endpoint: str, requests: int, warmup: int,
+                   clear_cache: Any = None) -> Dict[str, float]:
+    """Time `requests` sequential GETs of one endpoint."""
+    for _ in range(warmup):
+        client.get(endpoint)
+
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        if clear_cache is not None:
+            clear_cache()
+        t0 = time.perf_counter()
+        response = client.get(endpoint)
+        latencies.append(time.perf_counter() - t0)
+        if response.status_code != 200:
+            raise RuntimeError(f"{endpoint} returned {response.status_code}")
+    elapsed = time.perf_counter() - started
+
+    return {
+        "requests": requests,
+        "requests_per_sec": round(requests / elapsed, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+def run(requests: int, warmup: int, use_cache: bool) -> Dict[str, Dict[str, float]]:
+    """Benchmark every dashboard endpoint; cache is cleared per request unless use_cache."""
+    import serve_hn
+
+    clear_cache = None
+    if not use_cache and hasattr(serve_hn, "response_cache"):
+        clear_cache = serve_hn.response_cache.clear
+
+    client = serve_hn.app.test_client()
+    return {
+        endpoint: bench_endpoint(client, endpoint, requests, warmup, clear_cache)
+        for endpoint in ENDPOINTS
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--cache", action="store_true",
+                        help="keep the response cache warm (default: measure the query path)")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    parser.add_argument("--db", type=Path, help="serve this hn_posts DB (sets HN_DB_PATH)")
+    args = parser.parse_args()
+
+    if args.db:
+        # Read by serve_hn at import time
+        os.environ["HN_DB_PATH"] = str(args.db.resolve())
+
+    logging.disable(logging.INFO)
+    results = run(args.requests, args.warmup, args.cache)
+
+    print(f"{'endpoint':<18}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for endpoint, stats in results.items():
+        print(f"{endpoint:<18}{stats['requests_per_sec']:>10}"
+              f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
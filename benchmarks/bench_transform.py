@@ -0,0 +1,129 @@
+"""
+Transform Benchmark: extract flattening + transform(), legacy vs vectorized
+
+Purpose: Compare the old path (DataFrame of every search field, per-row
+         `user` lambda, inferred to_datetime, in-place column writes) with
+         etl_hn_github.normalize_issues + transform on one synthetic payload.
+Inputs: None (synthetic GitHub search items, 112K by default)
+Outputs: Table on stdout (wall time, tracemalloc peak, frame memory),
+         optional JSON report (--json)
+Usage:
+    python benchmarks/bench_transform.py
+    python benchmarks/bench_transform.py --issues 500000 --repeat 5 --json bench_transform.json
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import pandas as pd
+
+ETL_DIR = Path(__file__).resolve().parent.parent / "etlpipeline" / "etl"
+sys.path.insert(0, str(ETL_DIR))
+
+
+def synthetic_payload(count: int, users: int = 3000) -> List[Dict[str, Any]]:
+    """Search items with GitHub's usual extra fields, so the legacy path pays for them."""
+    newest = datetime(2026, 2, 19, 21, 26, 26, tzinfo=timezone.utc)
+    return [
+        {
+            "url": f"https://api.github.com/repos/org/repo/issues/{i}",
+            "html_url": f"https://github.com/org/repo/issues/{i}",
+            "id": 4_000_000_000 - i,
+            "number": i,
+            "title": f"Add user_{i % users} to contributors list",
+            "user": {"login": f"user_{i % users}", "id": i % users, "type": "User"},
+            "labels": [],
+            "state": "open",
+            "comments": i % 7,
+            "created_at": (newest - timedelta(seconds=13 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": (newest - timedelta(seconds=11 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "author_association": "NONE",
+            "body": "See https://news.ycombinator.com/item?id=" + str(40_000_000 + i),
+            "score": 1.0,
+        }
+        for i in range(count)
+    ]
+
+
+def legacy_extract_transform(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    """The pre-vectorization extract_github_hn tail + transform()."""
+    df = pd.DataFrame(items)
+    df["user"] = df["user"].apply(lambda x: x["login"] if isinstance(x, dict) else str(x))
+    df = df[["id", "title", "user", "comments", "created_at"]]
+
+    df["created_at"] = pd.to_datetime(df["created_at"])
+    df["score"] = df["comments"] * 0.5
+    return df[["id", "title", "user", "score", "comments", "created_at"]]
+
+
+def vectorized_extract_transform(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    import etl_hn_github
+    return etl_hn_github.transform(etl_hn_github.normalize_issues(items))
+
+
+def measure(func: Callable[[List[Dict[str, Any]]], pd.DataFrame],
+            items: List[Dict[str, Any]], repeat: int) -> Dict[str, float]:
+    """Median wall time over `repeat` runs, then one traced run for peak memory."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    frame = func(items)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "seconds": round(statistics.median(timings), 4),
+        "peak_mb": round(peak / 2**20, 1),
+        "frame_mb": round(frame.memory_usage(deep=True).sum() / 2**20, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--issues", type=int, default=112_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", type=Path, help="write results to this file")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    items = synthetic_payload(args.issues)
+
+    legacy = legacy_extract_transform(items)
+    vectorized = vectorized_extract_transform(items)
+    pd.testing.assert_frame_equal(
+        legacy.reset_index(drop=True),
+        vectorized.astype(legacy.dtypes.to_dict()),
+        check_dtype=False,
+    )
+
+    results = {
+        "issues": args.issues,
+        "legacy": measure(legacy_extract_transform, items, args.repeat),
+        "vectorized": measure(vectorized_extract_transform, items, args.repeat),
+    }
+
+    print(f"{args.issues} issues, median of {args.repeat}")
+    print(f"{'path':<12}{'seconds':>10}{'peak MB':>10}{'frame MB':>10}")
+    for name in ("legacy", "vectorized"):
+        row = results[name]
+        print(f"{name:<12}{row['seconds']:>10.3f}{row['peak_mb']:>10.1f}{row['frame_mb']:>10.1f}")
+    print(f"speedup {results['legacy']['seconds'] / results['vectorized']['seconds']:.1f}x")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Load Test: serve_hn under gunicorn, throughput vs. worker count
+
+Purpose: Start the production server (etl/gunicorn.conf.py) once per worker
+         count, drive it over HTTP with keep-alive client processes, and
+         report req/s and latency percentiles, so scaling with HN_WORKERS
+         is measured rather than assumed. Each server is stopped with
+         SIGTERM, which also exercises the graceful shutdown path.
+Inputs: hn_posts DB (--db, default etlpipeline/data/hn_posts.db); gunicorn
+        installed (etlpipeline/requirements.txt)
+Outputs: Table on stdout, optional JSON report (--json)
+Usage:
+    python benchmarks/load_test.py --workers 1,2,4 --clients 16 --duration 10
+    python benchmarks/load_test.py --db benchmarks/.fixtures/hn_1000000_42_<date>.db --threads 8
+"""
+
+import argparse
+import http.client
+import json
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+ETLPIPELINE_DIR = ROOT / "etlpipeline"
+GUNICORN_CONF = ETLPIPELINE_DIR / "etl" / "gunicorn.conf.py"
+DEFAULT_DB = ETLPIPELINE_DIR / "data" / "hn_posts.db"
+
+ENDPOINTS = ["/api/dashboard", "/api/users", "/api/trending", "/api/activity"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(db: Path, workers: int, threads: int, port: int) -> subprocess.Popen:
+    """Launch gunicorn and wait until /health answers 200."""
+    env = dict(
+        os.environ,
+        HN_DB_PATH=str(db.resolve()),
+        HN_WORKERS=str(workers),
+        HN_THREADS=str(threads),
+        HN_BIND=f"127.0.0.1:{port}",
+        HN_LOG_LEVEL="warning",
+    )
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", str(GUNICORN_CONF)],
+        cwd=ETLPIPELINE_DIR, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with {server.returncode} (is it installed?)")
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                return server
+        except OSError:
+            pass
+        time.sleep(0.2)
+
+    server.kill()
+    raise RuntimeError("gunicorn did not become healthy within 30s")
+
+
+def stop_server(server: subprocess.Popen, timeout: float = 35) -> int:
+    """SIGTERM (graceful shutdown) and wait; returns the exit code."""
+    server.send_signal(signal.SIGTERM)
+    try:
+        return server.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        server.kill()
+        return server.wait()
+
+
+def client(port: int, start_at: float, stop_at: float, offset: int) -> Tuple[int, int, List[float]]:
+    """
+    One keep-alive client (own process, so the load generator isn't GIL-bound).
+
+    Cycles through ENDPOINTS; returns (requests, errors, latencies).
+    """
+    connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+    latencies: List[float] = []
+    errors = 0
+    index = offset
+
+    time.sleep(max(0.0, start_at - time.time()))
+    while time.time() < stop_at:
+        endpoint = ENDPOINTS[index % len(ENDPOINTS)]
+        index += 1
+        t0 = time.perf_counter()
+        try:
+            connection.request("GET", endpoint)
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - t0)
+
+    connection.close()
+    return len(latencies) + errors, errors, latencies
+
+
+def run_load(port: int, clients: int, duration: float, warmup: float) -> Dict[str, Any]:
+    """Drive the server with `clients` processes; warmup requests are not counted."""
+    with ProcessPoolExecutor(max_workers=clients) as pool:
+        now = time.time()
+        list(pool.map(client, [port] * clients, [now + 1] * clients,
+                      [now + 1 + warmup] * clients, range(clients)))
+
+        start_at = time.time() + 1  # let every client process start first
+        futures = [
+            pool.submit(client, port, start_at, start_at + duration, offset)
+            for offset in range(clients)
+        ]
+        results = [future.result() for future in futures]
+
+    latencies = [latency for _, _, client_latencies in results for latency in client_latencies]
+    requests = sum(count for count, _, _ in results)
+    return {
+        "requests": requests,
+        "errors": sum(errors for _, errors, _ in results),
+        "requests_per_sec": round(requests / duration, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 3) if latencies else None,
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3) if latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated HN_WORKERS values")
+    parser.add_argument("--threads", type=int, default=4, help="HN_THREADS per worker")
+    parser.add_argument("--clients", type=int, default=16, help="concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="measured seconds per run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="unmeasured seconds per run")
+    parser.add_argument("--json", type=Path, help="write results to this JSON file")
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        parser.error(f"database not found: {args.db}")
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for workers in (int(value) for value in args.workers.split(",")):
+        port = free_port()
+        server = start_server(args.db, workers, args.threads, port)
+        try:
+            stats = run_load(port, args.clients, args.duration, args.warmup)
+        finally:
+            exit_code = stop_server(server)
+        stats["exit_code"] = exit_code
+        results[str(workers)] = stats
+
+    print(f"cpus: {os.cpu_count()}, threads/worker: {args.threads}, clients: {args.clients}")
+    print(f"{'workers':>8}{'req/s':>10}{'speedup':>9}{'p50 ms':>10}{'p99 ms':>10}{'errors':>8}{'exit':>6}")
+    baseline = next(iter(results.values()))["requests_per_sec"] or 1
+    for workers, stats in results.items():
+        print(f"{workers:>8}{stats['requests_per_sec']:>10}"
+              f"{stats['requests_per_sec'] / baseline:>8.2f}x"
+              f"{stats['p50_ms']:>10}{stats['p99_ms']:>10}{stats['errors']:>8}{stats['exit_code']:>6}")
+
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
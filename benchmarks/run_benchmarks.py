@@ -0,0 +1,471 @@
+"""
+Benchmark Suite: ETL, dashboard SQL, week 2 scripts, CSV validation and API
+at several dataset sizes, with a stored-baseline regression check
+
+Purpose: Back the scale claims ("112K HN issues -> REST API") with numbers.
+         Each size gets seeded synthetic fixtures (week_1/generate_hn_data),
+         then every stage is timed against them:
+             etl      etl_hn_github.transform / load (replace into a fresh DB)
+             queries  every queries.QUERIES entry (default parameters), per engine
+                      (--query-engines; DuckDB results must match SQLite's)
+             sql      every week_2/*.sql script, statement by statement
+             csv      read_and_validate_csv per engine, safe_int_series and
+                      safe_int(log=False) on a column
+             api      bench_api.py per endpoint (subprocess, --db fixture)
+             scan     whole-CSV read vs. the Parquet dataset (analyzer
+                      columns; user+comments of the last 7 days), with
+                      bytes read (needs pyarrow)
+Inputs: None (fixtures are generated under --workdir and reused per size,
+        seed and day; created_at ends today so date('now') filters match)
+Outputs: Table on stdout, JSON report (--output); with --baseline, exit
+         code 1 when a metric regressed by more than --tolerance
+Usage:
+    python benchmarks/run_benchmarks.py --sizes 10k,112k --output bench.json
+    python benchmarks/run_benchmarks.py --sizes 112k,1m --baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --sizes 10m --stages etl,queries,api
+"""
+
+import argparse
+import json
+import logging
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+BENCH_DIR = REPO_DIR / "benchmarks"
+ETL_DIR = REPO_DIR / "etlpipeline" / "etl"
+WEEK1_DIR = REPO_DIR / "week_1"
+WEEK2_DIR = REPO_DIR / "week_2"
+sys.path.insert(0, str(ETL_DIR))
+sys.path.insert(0, str(WEEK1_DIR))
+
+DEFAULT_WORKDIR = BENCH_DIR / ".fixtures"
+DEFAULT_SIZES = "10k,112k"
+STAGES = ("etl", "queries", "sql", "csv", "api", "scan")
+SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+# Metric -> True when lower is better; the first one present is compared.
+# min_s rather than median_s: the fastest run is the least noisy estimate.
+COMPARED_METRICS = {"min_s": True, "p50_ms": True, "requests_per_sec": False}
+
+CSV_REQUIRED_HEADERS = ["id", "user", "score", "comments"]
+CSV_REQUIRED_NON_EMPTY = ["id", "user"]
+CSV_INT_FIELDS = ["score", "comments"]
+
+
+def parse_size(text: str) -> int:
+    """ "10k" -> 10_000, "1m" -> 1_000_000, "5000" -> 5000."""
+    text = text.strip().lower().replace("_", "")
+    multiplier = SIZE_SUFFIXES.get(text[-1:], 1)
+    number = text[:-1] if text[-1:] in SIZE_SUFFIXES else text
+    return int(float(number) * multiplier)
+
+
+def timed(func: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    """Median / min wall time of `repeat` calls."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_s": round(statistics.median(timings), 6),
+        "min_s": round(min(timings), 6),
+        "runs": repeat,
+    }
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+def fixture_options(end: datetime) -> Dict[str, Any]:
+    """iter_hn_frames options shared by every fixture (skewed users, like HN)."""
+    return {"end": end, "user_skew": 1.1, "users": 5000}
+
+
+def prepare_fixtures(rows: int, seed: int, workdir: Path, end: datetime) -> Tuple[Path, Path]:
+    """Generate (or reuse) the hn_posts DB and the CSV for one size."""
+    import generate_hn_data
+
+    workdir.mkdir(parents=True, exist_ok=True)
+    stem = f"hn_{rows}_{seed}_{end:%Y%m%d}"
+    db_path = workdir / f"{stem}.db"
+    csv_path = workdir / f"{stem}.csv"
+
+    for path, fmt in ((db_path, "sqlite"), (csv_path, "csv")):
+        if not path.exists():
+            partial = path.with_suffix(".partial")
+            partial.unlink(missing_ok=True)
+            generate_hn_data.generate_hn_dataset(
+                partial, rows, fmt=fmt, seed=seed, **fixture_options(end)
+            )
+            partial.rename(path)
+    return db_path, csv_path
+
+
+def extract_frame(rows: int, seed: int, end: datetime) -> pd.DataFrame:
+    """Same rows as the fixtures, shaped like normalize_issues() output."""
+    import generate_hn_data
+
+    frame = pd.concat(
+        generate_hn_data.iter_hn_frames(rows, seed=seed, **fixture_options(end)),
+        ignore_index=True,
+    )
+    # GitHub's "YYYY-MM-DDTHH:MM:SSZ"
+    created_at = np.datetime_as_string(
+        frame["created_at"].dt.tz_convert(None).to_numpy().astype("datetime64[s]"),
+        timezone="UTC",
+    )
+    return frame[["id", "title", "user", "comments"]].assign(created_at=created_at)
+
+
+# ============================================================================
+# Stages
+# ============================================================================
+
+def bench_etl(rows: int, seed: int, end: datetime, workdir: Path, repeat: int) -> Dict[str, Any]:
+    """transform() on the extracted frame; load(mode="replace") into a fresh DB."""
+    import etl_hn_github
+
+    extracted = extract_frame(rows, seed, end)
+    transformed = etl_hn_github.transform(extracted.copy())
+
+    with tempfile.TemporaryDirectory(dir=workdir) as scratch:
+        scratch_db = Path(scratch) / "load.db"
+
+        def load_fresh() -> None:
+            for suffix in ("", "-wal", "-shm"):
+                Path(f"{scratch_db}{suffix}").unlink(missing_ok=True)
+            etl_hn_github.load(transformed, str(scratch_db), mode="replace")
+
+        return {
+            "transform": timed(lambda: etl_hn_github.transform(extracted.copy()), repeat),
+            "load": timed(load_fresh, max(1, min(repeat, 3))),
+        }
+
+
+def connect_read_only(db_path: Path) -> sqlite3.Connection:
+    return sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+
+
+def bench_queries(db_path: Path, repeat: int, query_engines: Iterable[str]) -> Dict[str, Any]:
+    """
+    Every dashboard query with its default parameters, fully fetched, per
+    engine (engines.py).
+
+    SQLite timings keep the plain query names; DuckDB ones are
+    "<name>@duckdb", plus the one-off "snapshot@duckdb" copy of the tables.
+    A DuckDB result that differs from SQLite's is reported as an error.
+    """
+    import engines
+    from queries import QUERIES
+
+    connection = connect_read_only(db_path)
+    try:
+        results: Dict[str, Any] = {}
+        if "sqlite" in query_engines:
+            results.update({
+                query.name: timed(
+                    lambda query=query: connection.execute(query.sql, query.bind(query.defaults)).fetchall(),
+                    repeat,
+                )
+                for query in QUERIES
+            })
+        if "duckdb" in query_engines:
+            snapshot = engines.DuckDBSnapshot()
+            try:
+                results["snapshot@duckdb"] = timed(
+                    lambda: snapshot.refresh(connection, fingerprint=object()), 1
+                )
+            except ImportError as error:
+                return {**results, "snapshot@duckdb": {"error": str(error)}}
+            for name, difference in engines.parity(connection, snapshot=snapshot).items():
+                results[f"{name}@duckdb"] = (
+                    {"error": f"differs from SQLite: {difference}"} if difference
+                    else timed(lambda query=QUERIES[name]: snapshot.fetch(
+                        query.duckdb_sql, query.bind(query.defaults)), repeat)
+                )
+            snapshot.close()
+        return results
+    finally:
+        connection.close()
+
+
+def split_statements(script: str) -> List[str]:
+    """Split a .sql script on complete statements (semicolons in comments/strings are kept)."""
+    statements, pending = [], ""
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ""
+    if pending.strip() and not all(
+            part.strip().startswith("--") or not part.strip() for part in pending.splitlines()
+    ):
+        statements.append(pending.strip())
+    return statements
+
+
+def bench_sql_scripts(db_path: Path, repeat: int) -> Dict[str, Any]:
+    """Every week_2/*.sql script, all statements fully fetched per run ({"error": ...} if one fails)."""
+    connection = connect_read_only(db_path)
+    try:
+        results = {}
+        for script in sorted(WEEK2_DIR.glob("*.sql")):
+            statements = split_statements(script.read_text(encoding="utf-8"))
+
+            def run_script(statements: List[str] = statements) -> None:
+                for statement in statements:
+                    connection.execute(statement).fetchall()
+
+            try:
+                results[script.name] = timed(run_script, repeat)
+            except sqlite3.Error as error:
+                # A broken script is a result, not a reason to drop the rest of the run
+                results[script.name] = {"error": str(error)}
+        return results
+    finally:
+        connection.close()
+
+
+def bench_csv(csv_path: Path, repeat: int, engines: Iterable[str]) -> Dict[str, Any]:
+    """read_and_validate_csv per engine, then column-wise and scalar safe_int."""
+    from row_validation import read_and_validate_csv
+    from safe_integer_converter import safe_int, safe_int_series
+
+    results = {}
+    for engine in engines:
+        results[f"validate_{engine}"] = timed(
+            lambda engine=engine: read_and_validate_csv(
+                csv_path, CSV_REQUIRED_HEADERS, CSV_REQUIRED_NON_EMPTY, CSV_INT_FIELDS,
+                engine=engine,
+            ),
+            repeat,
+        )
+
+    comments = pd.read_csv(csv_path, usecols=["comments"], dtype=str)["comments"]
+    values = comments.tolist()
+    results["safe_int_series"] = timed(
+        lambda: safe_int_series(comments, default=0, lower=0), repeat
+    )
+    results["safe_int_scalar"] = timed(
+        lambda: [safe_int(value, 0, log=False) for value in values], repeat
+    )
+    return results
+
+
+def bench_scans(db_path: Path, csv_path: Path, repeat: int) -> Dict[str, Any]:
+    """Whole CSV (the analyzer's old input) vs. projected / date-pruned Parquet reads."""
+    import parquet_store
+
+    dataset = db_path.parent / f"{db_path.stem}_parquet"
+    try:
+        if not dataset.exists():
+            partial = dataset.with_name(dataset.name + ".partial")
+            connection = connect_read_only(db_path)
+            try:
+                parquet_store.export_dates(connection, None, partial)
+            finally:
+                connection.close()
+            partial.rename(dataset)
+    except ImportError as error:
+        return {"parquet": {"error": str(error)}}
+
+    analyzer_columns = ["user", "comments", "score", "created_at"]
+    window = ["user", "comments"]
+    since = parquet_store.days_ago(7)
+    return {
+        "csv_full": {
+            **timed(lambda: pd.read_csv(csv_path), repeat),
+            "bytes": csv_path.stat().st_size,
+        },
+        "parquet_analyzer_columns": {
+            **timed(lambda: parquet_store.read_posts(dataset, analyzer_columns), repeat),
+            "bytes": parquet_store.scan_bytes(dataset, analyzer_columns),
+        },
+        "parquet_user_comments_7d": {
+            **timed(lambda: parquet_store.read_posts(dataset, window, since=since), repeat),
+            "bytes": parquet_store.scan_bytes(dataset, window, since=since),
+        },
+    }
+
+
+def bench_api(db_path: Path, requests: int) -> Dict[str, Any]:
+    """bench_api.py against the fixture DB in a subprocess (serve_hn binds its DB at import)."""
+    with tempfile.TemporaryDirectory() as scratch:
+        report = Path(scratch) / "api.json"
+        subprocess.run(
+            [sys.executable, str(BENCH_DIR / "bench_api.py"),
+             "--db", str(db_path), "--requests", str(requests), "--json", str(report)],
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+        return json.loads(report.read_text())
+
+
+# ============================================================================
+# Suite + Baseline
+# ============================================================================
+
+def run_suite(sizes: List[str], stages: List[str], seed: int, workdir: Path,
+              repeat: int, api_requests: int, engines: List[str],
+              query_engines: List[str]) -> Dict[str, Any]:
+    """{size label: {stage: {benchmark: metrics}}} for every size and stage."""
+    end = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+    results: Dict[str, Any] = {}
+
+    for label in sizes:
+        rows = parse_size(label)
+        print(f"== {label} ({rows} rows)", flush=True)
+        db_path, csv_path = prepare_fixtures(rows, seed, workdir, end)
+
+        size_results: Dict[str, Any] = {}
+        for stage in stages:
+            start = time.perf_counter()
+            if stage == "etl":
+                size_results[stage] = bench_etl(rows, seed, end, workdir, repeat)
+            elif stage == "queries":
+                size_results[stage] = bench_queries(db_path, repeat, query_engines)
+            elif stage == "sql":
+                size_results[stage] = bench_sql_scripts(db_path, repeat)
+            elif stage == "csv":
+                size_results[stage] = bench_csv(csv_path, repeat, engines)
+            elif stage == "api":
+                size_results[stage] = bench_api(db_path, api_requests)
+            elif stage == "scan":
+                size_results[stage] = bench_scans(db_path, csv_path, repeat)
+            print(f"   {stage:<8} {time.perf_counter() - start:8.1f}s", flush=True)
+
+        results[label] = size_results
+    return results
+
+
+def flatten(results: Dict[str, Any]) -> Dict[str, Dict[str, float]]:
+    """{size: {stage: {name: metrics}}} -> {"size/stage/name": metrics}."""
+    return {
+        f"{size}/{stage}/{name}": metrics
+        for size, stages in results.items()
+        for stage, benchmarks in stages.items()
+        for name, metrics in benchmarks.items()
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float,
+            min_seconds: float) -> List[str]:
+    """
+    Regressions of `current` vs `baseline` (both run_suite results).
+
+    A metric regresses when it is worse by more than `tolerance` (0.2 =
+    20%). Timings where both sides are under `min_seconds` are noise and
+    skipped; benchmarks missing from either side are ignored.
+    """
+    regressions = []
+    old_metrics = flatten(baseline)
+
+    for key, new in flatten(current).items():
+        old = old_metrics.get(key)
+        if old is None:
+            continue
+
+        for metric, lower_is_better in COMPARED_METRICS.items():
+            if metric not in new or metric not in old:
+                continue
+            before, after = old[metric], new[metric]
+            if metric == "min_s" and max(before, after) < min_seconds:
+                break
+            if before <= 0:
+                break
+
+            change = (after - before) / before
+            if (change if lower_is_better else -change) > tolerance:
+                regressions.append(f"{key} {metric}: {before} -> {after} ({change:+.0%})")
+            break
+
+    return regressions
+
+
+def print_table(results: Dict[str, Any]) -> None:
+    print(f"{'benchmark':<52}{'median s':>12}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}{'bytes':>12}")
+    for key, metrics in flatten(results).items():
+        if "error" in metrics:
+            print(f"{key:<52}  ERROR: {metrics['error']}")
+            continue
+        cells = [
+            f"{metrics[name]:>{width}}" if name in metrics else " " * width
+            for name, width in (("median_s", 12), ("requests_per_sec", 10),
+                                ("p50_ms", 10), ("p99_ms", 10), ("bytes", 12))
+        ]
+        print(f"{key:<52}{''.join(cells)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default=DEFAULT_SIZES,
+                        help="comma-separated row counts, e.g. 10k,112k,1m,10m")
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--engines", default="pandas,mmap",
+                        help="read_and_validate_csv engines (python is slow above ~1m)")
+    parser.add_argument("--query-engines", default="sqlite,duckdb",
+                        help="engines for the queries stage (duckdb is optional)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--api-requests", type=int, default=500)
+    parser.add_argument("--workdir", type=Path, default=DEFAULT_WORKDIR,
+                        help="fixture cache directory")
+    parser.add_argument("--output", type=Path, help="write the JSON report here")
+    parser.add_argument("--baseline", type=Path, help="compare against this JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs baseline (0.25 = 25%%)")
+    parser.add_argument("--min-seconds", type=float, default=0.005,
+                        help="ignore timings below this in both runs")
+    args = parser.parse_args()
+
+    sizes = [size.strip() for size in args.sizes.split(",") if size.strip()]
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"unknown stages {sorted(unknown)}; choose from {STAGES}")
+
+    logging.disable(logging.WARNING)
+    results = run_suite(sizes, stages, args.seed, args.workdir, args.repeat,
+                        args.api_requests, args.engines.split(","), args.query_engines.split(","))
+    print_table(results)
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        regressions = compare(results, baseline["results"], args.tolerance, args.min_seconds)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"\nNo regressions vs {args.baseline} (tolerance {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
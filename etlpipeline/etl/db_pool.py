@@ -0,0 +1,289 @@
+"""
+Read-only SQLite connection pool for serve_hn.py
+
+Purpose: Reuse read-only connections to hn_posts.db across requests and
+         remember the schema check until the database file changes.
+Inputs: data/hn_posts.db (Day 15 ETL output)
+Outputs: Pooled sqlite3.Connection objects (mode=ro, query_only)
+Raises: FileNotFoundError (missing DB),
+        TimeoutError (pool exhausted),
+        sqlite3.Error
+Usage:
+    pool = ReadOnlyConnectionPool(DB_PATH, size=4)
+    with pool.connection() as connection:
+        connection.execute("SELECT COUNT(*) FROM hn_posts")
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# (st_dev, st_ino, st_mtime_ns, st_size) of the database file, followed by
+# (st_mtime_ns, st_size) of its WAL sidecar ((0, 0) when there is none)
+Fingerprint = Tuple[int, int, int, int, int, int]
+
+# ============================================================================
+# Database File Fingerprint
+# ============================================================================
+
+def database_fingerprint(db_path: Path) -> Fingerprint:
+    """
+    Identify the current version of the database file.
+
+    In WAL mode a commit lands in `<db>-wal` and only reaches the main file
+    at checkpoint, so the sidecar is part of the fingerprint too.
+
+    Raises:
+        FileNotFoundError: If the database file does not exist.
+    """
+    try:
+        stat = os.stat(db_path)
+    except FileNotFoundError:
+        logger.error("Database file not found at %s", db_path)
+        raise FileNotFoundError(
+            f"ETL database missing. Expected at: {db_path}. "
+            f"Run the Day 15 ETL script to create it."
+        ) from None
+
+    try:
+        wal = os.stat(f"{db_path}-wal")
+        wal_version = (wal.st_mtime_ns, wal.st_size)
+    except FileNotFoundError:
+        wal_version = (0, 0)
+
+    return (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size) + wal_version
+
+
+# ============================================================================
+# Connection Pool
+# ============================================================================
+
+class ReadOnlyConnectionPool:
+    """
+    Thread-safe pool of read-only connections to one SQLite file.
+
+    Connections are opened lazily (up to `size`) with a `mode=ro` URI and
+    `PRAGMA query_only`, handed out LIFO and returned after each request.
+    When the file behind `db_path` is replaced (new inode) every pooled
+    connection is retired so the next request sees the new database.
+
+    Pools are per process: after a fork (gunicorn workers, also with
+    --preload) the child starts with an empty pool and opens its own
+    connections.
+
+    `immutable=True` adds `immutable=1` to the URI, which skips SQLite's
+    file locking entirely. Only use it for databases that are never written
+    while the API runs (e.g. baked into the image); in that mode any change
+    to the file's mtime/size also retires the pool.
+    """
+
+    def __init__(
+            self,
+            db_path: Path,
+            size: int = 4,
+            immutable: bool = False,
+            acquire_timeout: float = 5.0,
+    ) -> None:
+        if size < 1:
+            raise ValueError("pool size must be >= 1")
+
+        self.db_path = Path(db_path)
+        self.size = size
+        self.immutable = immutable
+        self.acquire_timeout = acquire_timeout
+        self.fingerprint: Optional[Fingerprint] = None
+
+        self._idle: "queue.LifoQueue[Tuple[int, sqlite3.Connection]]" = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._generation = 0
+        # Connections inherited through fork(); kept referenced, never used or closed
+        self._inherited: List[sqlite3.Connection] = []
+        _pools.add(self)
+
+    def _reset_after_fork(self) -> None:
+        """
+        Runs in the child right after fork(), before any other thread exists.
+
+        SQLite connections must not be used across fork(), so the parent's
+        connections are parked in _inherited and the child starts empty.
+        """
+        while True:
+            try:
+                self._inherited.append(self._idle.get_nowait()[1])
+            except queue.Empty:
+                break
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._opened = 0
+        self._generation += 1
+
+    def _connection_uri(self) -> str:
+        uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        if self.immutable:
+            uri += "&immutable=1"
+        return uri
+
+    def _open(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            self._connection_uri(), uri=True, check_same_thread=False
+        )
+        connection.execute("PRAGMA query_only = ON")
+        logger.info("✅ Opened read-only connection to %s", self.db_path)
+        return connection
+
+    def _refresh(self) -> int:
+        """Stat the DB file, retiring the pool if it was replaced."""
+        fingerprint = database_fingerprint(self.db_path)
+
+        with self._lock:
+            previous = self.fingerprint
+            if previous is not None and self._is_stale(previous, fingerprint):
+                self._generation += 1
+                logger.info("Database file changed, recycling connection pool")
+            self.fingerprint = fingerprint
+            return self._generation
+
+    def _is_stale(self, previous: Fingerprint, current: Fingerprint) -> bool:
+        if self.immutable:
+            return previous != current
+        return previous[:2] != current[:2]
+
+    def current_fingerprint(self) -> Fingerprint:
+        """
+        Stat the DB file now and return its fingerprint (data version).
+
+        Raises:
+            FileNotFoundError: If the database file does not exist.
+        """
+        self._refresh()
+        return self.fingerprint
+
+    def _acquire(self, generation: int) -> sqlite3.Connection:
+        while True:
+            try:
+                conn_generation, connection = self._idle.get_nowait()
+            except queue.Empty:
+                break
+
+            if conn_generation == generation:
+                return connection
+            self._discard(connection)
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+
+        if can_open:
+            try:
+                return self._open()
+            except sqlite3.Error:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            conn_generation, connection = self._idle.get(timeout=self.acquire_timeout)
+        except queue.Empty:
+            raise TimeoutError(
+                f"No database connection available after {self.acquire_timeout}s "
+                f"(pool size {self.size})"
+            ) from None
+
+        if conn_generation != generation:
+            self._discard(connection)
+            return self._acquire(generation)
+        return connection
+
+    def _discard(self, connection: sqlite3.Connection) -> None:
+        connection.close()
+        with self._lock:
+            self._opened -= 1
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """
+        Borrow a pooled read-only connection for the duration of a block.
+
+        Raises:
+            FileNotFoundError: If the database file does not exist.
+            TimeoutError: If every connection stays busy for `acquire_timeout`.
+        """
+        generation = self._refresh()
+        connection = self._acquire(generation)
+
+        try:
+            yield connection
+        finally:
+            if generation == self._generation:
+                self._idle.put((generation, connection))
+            else:
+                self._discard(connection)
+
+    def close(self) -> None:
+        """Close every idle connection (busy ones close when returned)."""
+        with self._lock:
+            self._generation += 1
+
+        while True:
+            try:
+                _, connection = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._discard(connection)
+
+
+_pools: "weakref.WeakSet[ReadOnlyConnectionPool]" = weakref.WeakSet()
+
+
+def _reset_pools_after_fork() -> None:
+    for pool in list(_pools):
+        pool._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # POSIX only
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+# ============================================================================
+# Schema Validation Cache
+# ============================================================================
+
+class FingerprintCache:
+    """
+    Remember one computed value per database fingerprint.
+
+    Used to run `validate_table_schema` once per DB version instead of
+    issuing a `PRAGMA table_info` on every request.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[Fingerprint] = None
+        self._value: Any = None
+
+    def get(self, fingerprint: Optional[Fingerprint], compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if fingerprint is not None and fingerprint == self._fingerprint:
+                return self._value
+
+        value = compute()
+
+        with self._lock:
+            self._fingerprint = fingerprint
+            self._value = value
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fingerprint = None
+            self._value = None
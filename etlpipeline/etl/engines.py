@@ -0,0 +1,300 @@
+"""
+Query engines for the queries.py catalog: SQLite (default) or DuckDB
+
+Purpose: Run each dashboard query on the engine that suits its shape.
+         SQLite's row-store executor answers the small rollup lookups
+         well; GROUP BY / window / self-join heavy queries can instead run
+         on an in-process columnar DuckDB snapshot of the same .db file.
+         The snapshot copies only the tables the routed queries read and
+         is rebuilt when the DB fingerprint changes (a new ETL load).
+Inputs: Pooled sqlite3 connections (serve_hn.py), HN_QUERY_ENGINE /
+        HN_QUERY_ENGINES, queries.QUERY_CATALOG / DUCKDB_CATALOG
+Outputs: (column names, row tuples) per query; a parity report
+Raises: ImportError (duckdb not installed but configured), ValueError
+        (unknown engine name)
+Usage:
+    HN_QUERY_ENGINES="TRENDING_TITLES_LAST_7D=duckdb,WEEK_OVER_WEEK_GROWTH=duckdb" python serve_hn.py
+    HN_QUERY_ENGINE=duckdb python serve_hn.py           # every query that has a DuckDB variant
+
+    cd etlpipeline/etl
+    python engines.py parity --db ../data/hn_posts.db   # exit 1 on any difference
+"""
+
+import argparse
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from queries import DUCKDB_CATALOG, QUERIES, QUERY_CATALOG
+
+logger = logging.getLogger(__name__)
+
+ENGINE_NAMES = ("sqlite", "duckdb")
+# Tables a DuckDB snapshot may copy (everything the catalog reads)
+SNAPSHOT_TABLES = ("hn_posts", "user_daily", "daily_totals")
+SNAPSHOT_BATCH_ROWS = 100_000
+# SQLite declared type -> DuckDB column type (values keep SQLite's storage
+# classes: dates stay TEXT, so comparisons match SQLite's textual ones)
+DUCKDB_TYPES = {"INTEGER": "BIGINT", "REAL": "DOUBLE", "TEXT": "VARCHAR"}
+
+Rows = Tuple[List[str], List[Tuple[Any, ...]]]
+
+
+def duckdb_module() -> Any:
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("The duckdb query engine needs duckdb (pip install duckdb)") from e
+    return duckdb
+
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+def parse_engine(name: str) -> str:
+    engine = name.strip().lower()
+    if engine not in ENGINE_NAMES:
+        raise ValueError(f"Unknown query engine {name!r}; choose from {ENGINE_NAMES}")
+    return engine
+
+
+def parse_query_engines(text: Optional[str]) -> Dict[str, str]:
+    """"NAME=engine,NAME=engine" (HN_QUERY_ENGINES) -> {query name: engine}."""
+    engines = {}
+    for item in (text or "").split(","):
+        if not item.strip():
+            continue
+        name, separator, engine = item.partition("=")
+        if not separator or name.strip() not in QUERY_CATALOG:
+            raise ValueError(f"HN_QUERY_ENGINES: expected QUERY_NAME=engine, got {item.strip()!r}")
+        engines[name.strip()] = parse_engine(engine)
+    return engines
+
+
+DEFAULT_ENGINE = parse_engine(os.environ.get("HN_QUERY_ENGINE", "sqlite"))
+QUERY_ENGINES = parse_query_engines(os.environ.get("HN_QUERY_ENGINES"))
+# DuckDB threads per process (unset = DuckDB's default, one per core)
+DUCKDB_THREADS = int(os.environ["HN_DUCKDB_THREADS"]) if os.environ.get("HN_DUCKDB_THREADS") else None
+
+
+def engine_for(query_name: str, default: str = DEFAULT_ENGINE,
+               overrides: Optional[Dict[str, str]] = None) -> str:
+    """Configured engine of one query; queries without a DuckDB variant stay on SQLite."""
+    engine = (QUERY_ENGINES if overrides is None else overrides).get(query_name, default)
+    if engine == "duckdb" and query_name not in DUCKDB_CATALOG:
+        return "sqlite"
+    return engine
+
+
+def tables_read(sql_queries: Iterable[str]) -> Set[str]:
+    """SNAPSHOT_TABLES referenced by any of the queries."""
+    tables = set()
+    for sql_query in sql_queries:
+        tables.update(
+            table for table in SNAPSHOT_TABLES
+            if re.search(rf"\b{table}\b", sql_query, re.IGNORECASE)
+        )
+    return tables
+
+
+# ============================================================================
+# Engines
+# ============================================================================
+
+def fetch_sqlite(connection: sqlite3.Connection, sql_query: str,
+                 params: Optional[Mapping[str, Any]] = None) -> Rows:
+    cursor = connection.execute(sql_query, params or {})
+    rows = cursor.fetchall()
+    return [column[0] for column in cursor.description], rows
+
+
+class DuckDBSnapshot:
+    """
+    In-memory DuckDB copy of some SQLite tables, one version at a time.
+
+    refresh() compares the caller's DB fingerprint with the snapshot's and
+    rebuilds (tables copied in one SQLite read transaction, so rollups and
+    hn_posts stay consistent) when it changed; concurrent callers wait for
+    the rebuild. A new snapshot is swapped in whole, and queries still
+    running on the old one finish there.
+
+    fetch() is thread-safe: every call gets its own DuckDB cursor.
+    """
+
+    def __init__(self, tables: Iterable[str] = SNAPSHOT_TABLES,
+                 threads: Optional[int] = DUCKDB_THREADS) -> None:
+        self.tables = sorted(tables)
+        self.threads = threads
+        self.fingerprint: Any = None
+        self.built_at: Optional[float] = None
+        self.build_seconds: Optional[float] = None
+        self.table_rows: Dict[str, int] = {}
+        self._database: Any = None
+        self._lock = threading.Lock()
+
+    def refresh(self, connection: sqlite3.Connection, fingerprint: Any) -> bool:
+        """Rebuild from `connection` unless the snapshot already is `fingerprint`; True if rebuilt."""
+        if self._database is not None and fingerprint == self.fingerprint:
+            return False
+        with self._lock:
+            if self._database is not None and fingerprint == self.fingerprint:
+                return False
+            started = time.perf_counter()
+            database, table_rows = self._build(connection)
+            self._database = database
+            self.fingerprint = fingerprint
+            self.table_rows = table_rows
+            self.built_at = time.time()
+            self.build_seconds = round(time.perf_counter() - started, 3)
+        logger.info("🦆 DuckDB snapshot of %s built in %.2fs (%s)",
+                    ", ".join(self.tables), self.build_seconds, table_rows)
+        return True
+
+    def _build(self, connection: sqlite3.Connection) -> Tuple[Any, Dict[str, int]]:
+        duckdb = duckdb_module()
+        import numpy as np
+
+        database = duckdb.connect(":memory:")
+        if self.threads is not None:
+            database.execute(f"SET threads = {int(self.threads)}")
+
+        table_rows = {}
+        connection.execute("BEGIN")
+        try:
+            for table in self.tables:
+                columns = connection.execute(f"PRAGMA table_info({table})").fetchall()
+                if not columns:
+                    raise sqlite3.OperationalError(f"no such table: {table}")
+                names = [column[1] for column in columns]
+                definitions = ", ".join(
+                    f'"{name}" {DUCKDB_TYPES.get(declared.upper(), "VARCHAR")}'
+                    for _, name, declared, *_ in columns
+                )
+                database.execute(f"CREATE TABLE {table} ({definitions})")
+
+                quoted = ", ".join(f'"{name}"' for name in names)
+                cursor = connection.execute(f"SELECT {quoted} FROM {table}")
+                copied = 0
+                while True:
+                    rows = cursor.fetchmany(SNAPSHOT_BATCH_ROWS)
+                    if not rows:
+                        break
+                    batch = {
+                        name: np.array(values, dtype=object)
+                        for name, values in zip(names, zip(*rows))
+                    }
+                    database.register("sqlite_batch", batch)
+                    database.execute(f"INSERT INTO {table} SELECT * FROM sqlite_batch")
+                    database.unregister("sqlite_batch")
+                    copied += len(rows)
+                table_rows[table] = copied
+        except BaseException:
+            database.close()
+            raise
+        finally:
+            connection.execute("ROLLBACK")
+        return database, table_rows
+
+    def fetch(self, sql_query: str, params: Optional[Mapping[str, Any]] = None) -> Rows:
+        """Run a DuckDB-dialect query ($name parameters) on the current snapshot (refresh() first)."""
+        database = self._database
+        if database is None:
+            raise RuntimeError("DuckDB snapshot not built; call refresh() first")
+        cursor = database.cursor()
+        try:
+            cursor.execute(sql_query, params)
+            rows = cursor.fetchall()
+            return [column[0] for column in cursor.description], rows
+        finally:
+            cursor.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tables": self.table_rows or self.tables,
+            "built_at": self.built_at,
+            "build_seconds": self.build_seconds,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._database is not None:
+                self._database.close()
+            self._database = None
+            self.fingerprint = None
+
+
+# ============================================================================
+# Parity
+# ============================================================================
+
+def _same_value(left: Any, right: Any) -> bool:
+    if isinstance(left, float) or isinstance(right, float):
+        if left is None or right is None:
+            return left is right
+        return math.isclose(float(left), float(right), rel_tol=1e-9, abs_tol=1e-9)
+    return left == right
+
+
+def compare_results(expected: Rows, actual: Rows) -> Optional[str]:
+    """First difference between two results (columns, row order, values), or None."""
+    expected_columns, expected_rows = expected
+    actual_columns, actual_rows = actual
+    if list(expected_columns) != list(actual_columns):
+        return f"columns {expected_columns} != {actual_columns}"
+    if len(expected_rows) != len(actual_rows):
+        return f"{len(expected_rows)} rows != {len(actual_rows)} rows"
+    for index, (left, right) in enumerate(zip(expected_rows, actual_rows)):
+        if len(left) != len(right) or not all(map(_same_value, left, right)):
+            return f"row {index}: {left} != {right}"
+    return None
+
+
+def parity(connection: sqlite3.Connection, names: Optional[Sequence[str]] = None,
+           snapshot: Optional[DuckDBSnapshot] = None) -> Dict[str, Optional[str]]:
+    """
+    Run every catalog query (or `names`) with its default parameters on
+    SQLite and on a DuckDB snapshot (`snapshot` must already be refreshed
+    from `connection`; default: a new one).
+
+    Returns:
+        {query name: first difference, or None when identical}
+    """
+    names = [name for name in (names or QUERY_CATALOG) if name in DUCKDB_CATALOG]
+    if snapshot is None:
+        snapshot = DuckDBSnapshot(tables_read(DUCKDB_CATALOG[name] for name in names))
+        snapshot.refresh(connection, fingerprint=None)
+    return {
+        name: compare_results(
+            fetch_sqlite(connection, QUERY_CATALOG[name], QUERIES[name].bind(QUERIES[name].defaults)),
+            snapshot.fetch(DUCKDB_CATALOG[name], QUERIES[name].bind(QUERIES[name].defaults)),
+        )
+        for name in names
+    }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="SQLite vs. DuckDB result parity for the query catalog")
+    parser.add_argument("command", choices=["parity"])
+    parser.add_argument("--db", type=Path, default=Path(__file__).parent.parent / "data" / "hn_posts.db")
+    parser.add_argument("--query", action="append", help="only this query (repeatable)")
+    args = parser.parse_args()
+
+    sqlite_connection = sqlite3.connect(f"{args.db.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        differences = parity(sqlite_connection, args.query)
+    finally:
+        sqlite_connection.close()
+
+    for query_name, difference in differences.items():
+        logger.info(f"{'✅' if difference is None else '❌'} {query_name}"
+                    f"{'' if difference is None else ': ' + difference}")
+    sys.exit(1 if any(differences.values()) else 0)
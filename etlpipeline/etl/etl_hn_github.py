@@ -8,55 +8,245 @@ Raises: requests.RequestException,
 Usage: python etl_hn_github.py
 """
 
-import requests 
+import numpy as np
 import pandas as pd 
 import sqlite3
+import json
+import os
 from pathlib import Path 
-from typing import List, Dict 
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set
 import logging 
+from operator import itemgetter
+
+from github_client import ETagCache, GitHubSearchClient, RequestStats
+from parquet_store import PARQUET_DIR, export_dates, parquet_enabled
+from profiling import parse_mode, profiled
+from run_report import RunRecorder, runs_db_path
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def extract_github_hn(limit: int = 1000) -> pd.DataFrame: 
-    """Extract HN discussions from Github issues."""
-    url = "https://api.github.com/search/issues"
-    params = {
-        "q": "hackernews", 
-        "sort": "created", 
-        "order": "desc",
-        "per_page": 100
-    }
-
-    all_data = []
-    for page in range(1, (limit // 100) + 2):
-        params["page"] = page
-        resp = requests.get(url, params=params)
-        resp.raise_for_status()
-
-        issues = resp.json().get("items", [])
-        all_data.extend(issues)
-        logger.info(f"Extracted page {page}: {len(issues)} issues")
-
-        if len(issues) < 100: 
-            break
-
-    df = pd.DataFrame(all_data)
-    if df.empty: 
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "hn_posts.db"
+# Conditional-request cache: unchanged search pages come back as free 304s
+ETAG_CACHE_PATH = Path(
+    os.environ.get("GITHUB_ETAG_CACHE", Path(__file__).parent.parent / "data" / "github_etags.json")
+)
+# JSON run report of the last run_etl (etl_runs in hn_posts_runs.db keeps the history)
+RUN_REPORT_PATH = Path(
+    os.environ.get("ETL_REPORT_PATH", Path(__file__).parent.parent / "data" / "etl_last_run.json")
+)
+# %z accepts GitHub's trailing "Z" and keeps pandas on its ISO-8601 fast path
+GITHUB_TIME_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+# ============================================================================
+# SQLite Schema (id is the upsert key; etl_state holds the watermark)
+# ============================================================================
+
+EXTRACT_COLUMNS = ["id", "title", "user", "comments", "created_at"]
+HN_POSTS_COLUMNS = ["id", "title", "user", "score", "comments", "created_at"]
+
+CREATE_HN_POSTS = """
+CREATE TABLE IF NOT EXISTS hn_posts (
+    id INTEGER PRIMARY KEY,
+    title TEXT,
+    user TEXT,
+    score REAL,
+    comments INTEGER,
+    created_at TEXT
+)
+"""
+
+CREATE_ETL_STATE = """
+CREATE TABLE IF NOT EXISTS etl_state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+)
+"""
+
+# Window queries range-scan created_at; the first two are covering for
+# TOP_USERS_LAST_7D / ACTIVITY_LAST_24H / WEEK_OVER_WEEK_GROWTH, the
+# expression indexes serve DAILY_LEADERS and TRENDING_TITLES_LAST_7D.
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_hn_posts_created_at "
+    "ON hn_posts (created_at, user, score, comments)",
+    "CREATE INDEX IF NOT EXISTS idx_hn_posts_user_created_at "
+    "ON hn_posts (user, created_at, score)",
+    "CREATE INDEX IF NOT EXISTS idx_hn_posts_event_date "
+    "ON hn_posts (DATE(created_at), user)",
+    "CREATE INDEX IF NOT EXISTS idx_hn_posts_created_title "
+    "ON hn_posts (created_at, LOWER(title))",
+]
+
+UPSERT_HN_POSTS = """
+INSERT INTO hn_posts (id, title, user, score, comments, created_at)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    title = excluded.title,
+    user = excluded.user,
+    score = excluded.score,
+    comments = excluded.comments,
+    created_at = excluded.created_at
+WHERE title IS NOT excluded.title
+   OR user IS NOT excluded.user
+   OR score IS NOT excluded.score
+   OR comments IS NOT excluded.comments
+   OR created_at IS NOT excluded.created_at
+"""
+
+WATERMARK_KEY = "created_at_watermark"
+
+# ============================================================================
+# Daily Rollups (queries.py reads these instead of regrouping hn_posts)
+# ============================================================================
+
+CREATE_USER_DAILY = """
+CREATE TABLE IF NOT EXISTS user_daily (
+    event_date TEXT NOT NULL,
+    user TEXT NOT NULL,
+    posts INTEGER NOT NULL,
+    total_comments INTEGER NOT NULL,
+    total_score REAL NOT NULL,
+    PRIMARY KEY (event_date, user)
+) WITHOUT ROWID
+"""
+
+CREATE_DAILY_TOTALS = """
+CREATE TABLE IF NOT EXISTS daily_totals (
+    event_date TEXT PRIMARY KEY,
+    posts INTEGER NOT NULL,
+    total_comments INTEGER NOT NULL,
+    total_score REAL NOT NULL,
+    active_users INTEGER NOT NULL,
+    first_created_at TEXT,
+    last_created_at TEXT
+) WITHOUT ROWID
+"""
+
+# {date_filter} is "" for a full rebuild or an IN (json_each) filter
+ROLLUP_USER_DAILY = """
+INSERT INTO user_daily (event_date, user, posts, total_comments, total_score)
+SELECT 
+    DATE(created_at), 
+    user, 
+    COUNT(*), 
+    COALESCE(SUM(comments), 0), 
+    COALESCE(SUM(score), 0)
+FROM hn_posts
+WHERE user IS NOT NULL 
+    AND DATE(created_at) IS NOT NULL {date_filter}
+GROUP BY DATE(created_at), user
+"""
+
+ROLLUP_DAILY_TOTALS = """
+INSERT INTO daily_totals (
+    event_date, posts, total_comments, total_score, 
+    active_users, first_created_at, last_created_at
+)
+SELECT 
+    DATE(created_at), 
+    COUNT(*), 
+    COALESCE(SUM(comments), 0), 
+    COALESCE(SUM(score), 0), 
+    COUNT(DISTINCT user), 
+    MIN(created_at), 
+    MAX(created_at)
+FROM hn_posts
+WHERE DATE(created_at) IS NOT NULL {date_filter}
+GROUP BY DATE(created_at)
+"""
+
+DATES_FILTER = "AND DATE(created_at) IN (SELECT value FROM json_each(?))"
+
+
+def extract_github_hn(
+        limit: int = 1000, 
+        since: Optional[str] = None, 
+        client: Optional[GitHubSearchClient] = None
+) -> pd.DataFrame: 
+    """
+    Extract HN discussions from Github issues.
+
+    since: Optional high-watermark (hn_posts.created_at format); only issues
+        created at or after it are requested, oldest first (search_order).
+    client: GitHubSearchClient to use (pooled session, concurrent pages,
+        rate limiting, ETags). Defaults to one built from env
+        (GITHUB_API_URL, GITHUB_TOKEN, GITHUB_MAX_WORKERS).
+    """
+    client = client or default_client()
+    all_data = client.search_issues(search_query(since), limit, order=search_order(since))
+
+    df = normalize_issues(all_data)
+    # Nothing newer than the watermark is a normal incremental outcome
+    if df.empty and not since: 
         raise ValueError("No data extracted from GitHub")
-    
-    # Extract user.login from nested JSON
-    df['user'] = df['user'].apply(lambda x: x['login'] if isinstance(x, dict) else str(x))
 
-    return df[["id", 'title', 'user','comments', 'created_at']]
+    return df
+
+
+def default_client(observer: Optional[Callable[[RequestStats], None]] = None) -> GitHubSearchClient: 
+    """GitHubSearchClient configured from env (GITHUB_API_URL, GITHUB_TOKEN, GITHUB_MAX_WORKERS)."""
+    return GitHubSearchClient(
+        max_workers=int(os.environ.get("GITHUB_MAX_WORKERS", "4")),
+        etag_cache=ETagCache(ETAG_CACHE_PATH),
+        observer=observer,
+    )
+
+
+def search_query(since: Optional[str]) -> str: 
+    """GitHub search string, narrowed to created:>=watermark when given."""
+    query = "hackernews"
+    if since: 
+        query += f" created:>={to_github_timestamp(since)}"
+    return query
+
+
+def search_order(since: Optional[str]) -> str: 
+    """
+    Newest first for full runs; oldest first from a watermark.
+
+    An incremental run cut off by `limit` must end with a contiguous range
+    of issues starting at the watermark, since advance_watermark moves it
+    to the newest issue loaded: newest first would skip everything between
+    the old watermark and the oldest issue fetched, for good.
+    """
+    return "asc" if since else "desc"
+
+
+def normalize_issues(issues: List[Dict]) -> pd.DataFrame: 
+    """
+    Raw search items (one page or chunk) -> id/title/user/comments/created_at frame.
+
+    Pulls only the needed fields straight off the item dicts, column by
+    column, instead of building a frame of every search field and then
+    flattening `user` row by row. `user` becomes categorical (a few
+    thousand logins across 100K+ issues) and `comments` int32.
+    """
+    if not issues: 
+        return pd.DataFrame(columns=EXTRACT_COLUMNS)
+
+    users = [
+        user["login"] if isinstance(user, dict) else str(user)
+        for user in map(itemgetter("user"), issues)
+    ]
+
+    return pd.DataFrame({
+        "id": np.fromiter(map(itemgetter("id"), issues), dtype=np.int64, count=len(issues)), 
+        "title": list(map(itemgetter("title"), issues)), 
+        "user": pd.Categorical(np.array(users, dtype=object)), 
+        "comments": np.fromiter(map(itemgetter("comments"), issues), dtype=np.int32, count=len(issues)), 
+        "created_at": list(map(itemgetter("created_at"), issues)), 
+    })
 
 
 def transform(df: pd.DataFrame) -> pd.DataFrame: 
-    """Clean/transform for hnanalysis.sql"""
+    """Clean/transform for hnanalysis.sql (returns a new frame, input untouched)"""
 
-    df["created_at"] = pd.to_datetime(df["created_at"])
-    df["score"] = df["comments"] * 0.5 # Proxy score (real HN has upvotes)
-    df = df[["id", "title", 'user', "score", "comments", "created_at"]]
+    df = df.assign(
+        # GitHub always sends ISO-8601 UTC; an explicit format skips inference
+        created_at=pd.to_datetime(df["created_at"], format=GITHUB_TIME_FORMAT, utc=True), 
+        score=(df["comments"] * 0.5).astype(np.float32), # Proxy score (real HN has upvotes)
+        comments=df["comments"].astype(np.int32), 
+    )[HN_POSTS_COLUMNS]
 
     # Validate for hnanalysis.sql
     if df["score"].min() < 0: 
@@ -66,30 +256,483 @@ def transform(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
-def load(df: pd.DataFrame, db_path: str = "hn_posts.db") -> None: 
-    """Load to SQLite for hnanalysis.sql"""
+def to_github_timestamp(created_at: str) -> str: 
+    """'2026-02-19 21:26:26+00:00' -> '2026-02-19T21:26:26Z' for search qualifiers."""
+    return pd.Timestamp(created_at).tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def connect_for_load(db_path: str) -> sqlite3.Connection: 
+    """
+    Open the ETL write connection and make sure the schema and indexes exist.
+
+    WAL journal mode lets serve_hn keep reading the previous snapshot while
+    a load transaction is open. Rollup tables are created (and backfilled)
+    here too. Tables created by the old
+    `to_sql(if_exists="replace")` loader (no primary key) are migrated once.
+    """
+    Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+
+    conn.execute("BEGIN IMMEDIATE")
+    try: 
+        migrate_legacy_table(conn)
+        conn.execute(CREATE_HN_POSTS)
+        conn.execute(CREATE_ETL_STATE)
+        for create_index in CREATE_INDEXES: 
+            conn.execute(create_index)
+
+        has_rollups = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'daily_totals'"
+        ).fetchone()
+        conn.execute(CREATE_USER_DAILY)
+        conn.execute(CREATE_DAILY_TOTALS)
+        if not has_rollups: 
+            # First run on an existing DB: backfill every date once
+            refresh_rollups(conn, None)
+        conn.execute("COMMIT")
+    except sqlite3.Error: 
+        conn.execute("ROLLBACK")
+        conn.close()
+        raise
+
+    return conn
+
+
+def migrate_legacy_table(conn: sqlite3.Connection) -> None: 
+    """Rebuild a pre-upsert hn_posts table (no primary key) in place."""
+    columns = conn.execute("PRAGMA table_info(hn_posts)").fetchall()
+    if not columns: 
+        return 
+
+    primary_keys = [row[1] for row in columns if row[5]]
+    if primary_keys == ["id"]: 
+        return 
+
+    logger.info("Migrating legacy hn_posts table to id PRIMARY KEY schema")
+    conn.execute("ALTER TABLE hn_posts RENAME TO hn_posts_legacy")
+    conn.execute(CREATE_HN_POSTS)
+    conn.execute(
+        "INSERT OR REPLACE INTO hn_posts (id, title, user, score, comments, created_at) "
+        "SELECT id, title, user, score, comments, created_at FROM hn_posts_legacy"
+    )
+    conn.execute("DROP TABLE hn_posts_legacy")
+
+
+def dates_for_ids(conn: sqlite3.Connection, ids: List[int]) -> Set[str]: 
+    """Distinct DATE(created_at) of the given hn_posts ids."""
+    rows = conn.execute(
+        "SELECT DISTINCT DATE(created_at) FROM hn_posts "
+        "WHERE id IN (SELECT value FROM json_each(?))",
+        (json.dumps(ids),)
+    )
+    return {row[0] for row in rows if row[0] is not None}
+
+
+def refresh_rollups(conn: sqlite3.Connection, dates: Optional[Set[str]]) -> None: 
+    """
+    Recompute user_daily/daily_totals for the given dates (None = all dates).
+
+    Runs inside the caller's transaction so rollups and hn_posts commit
+    together. Affected dates are re-aggregated from hn_posts through the
+    DATE(created_at) index; untouched days are left as they are.
+    """
+    if dates is None: 
+        conn.execute("DELETE FROM user_daily")
+        conn.execute("DELETE FROM daily_totals")
+        conn.execute(ROLLUP_USER_DAILY.format(date_filter=""))
+        conn.execute(ROLLUP_DAILY_TOTALS.format(date_filter=""))
+        return 
+
+    if not dates: 
+        return 
+
+    dates_json = json.dumps(sorted(dates))
+    for table in ("user_daily", "daily_totals"): 
+        conn.execute(
+            f"DELETE FROM {table} WHERE event_date IN (SELECT value FROM json_each(?))",
+            (dates_json,)
+        )
+    conn.execute(ROLLUP_USER_DAILY.format(date_filter=DATES_FILTER), (dates_json,))
+    conn.execute(ROLLUP_DAILY_TOTALS.format(date_filter=DATES_FILTER), (dates_json,))
+
+
+def read_watermark(db_path: str) -> Optional[str]: 
+    """Return the newest created_at loaded so far, or None for a fresh DB."""
+    if not Path(db_path).exists(): 
+        return None
+
     conn = sqlite3.connect(db_path)
+    try: 
+        row = conn.execute(
+            "SELECT value FROM etl_state WHERE key = ?", (WATERMARK_KEY,)
+        ).fetchone()
+    except sqlite3.OperationalError: 
+        # Pre-upsert DB: no etl_state table yet
+        row = conn.execute("SELECT MAX(created_at) FROM hn_posts").fetchone()
+    finally: 
+        conn.close()
+
+    return row[0] if row else None
+
+
+def to_rows(df: pd.DataFrame) -> List[tuple]: 
+    """DataFrame -> list of plain tuples in HN_POSTS_COLUMNS order for executemany."""
+    df = df[HN_POSTS_COLUMNS].assign(created_at=df["created_at"].astype(str))
+    return list(df.itertuples(index=False, name=None))
+
+
+def load(
+        df: pd.DataFrame, 
+        db_path: str = str(DEFAULT_DB_PATH), 
+        mode: str = "upsert", 
+        recorder: Optional[RunRecorder] = None
+) -> None: 
+    """
+    Load to SQLite for hnanalysis.sql
+
+    mode="upsert" inserts new ids and updates existing ones; mode="replace"
+    swaps the whole table contents. Either way the write is one
+    transaction, so readers never see an empty or missing table, and the
+    created_at high-watermark and daily rollups (only the dates touched by
+    this batch, on upsert) are updated in the same commit. The whole call
+    is timed as the recorder's load stage (COMMIT separately). The touched
+    dates are then mirrored into the Parquet dataset (export_parquet).
+
+    Raises:
+        ValueError: Unknown mode
+        sqlite3.Error: Write failures (transaction rolled back)
+    """
+    if mode not in ("upsert", "replace"): 
+        raise ValueError(f"mode must be 'upsert' or 'replace', got {mode!r}")
+
+    recorder = recorder or RunRecorder()
+    conn = connect_for_load(db_path)
 
     try: 
-        df.to_sql("hn_posts", conn, if_exists="replace", index=False)
-        logger.info(f"Loaded {len(df)} rows to {db_path}")
+        with recorder.stage("load") as stage: 
+            rows = to_rows(df)
+            conn.execute("BEGIN IMMEDIATE")
+            if mode == "replace": 
+                conn.execute("DELETE FROM hn_posts")
+            touched_dates = write_rows(conn, rows, full_refresh=(mode == "replace"))
+            advance_watermark(conn)
+            recorder.commit(conn)
+            stage.rows += len(rows)
+            logger.info(f"Loaded {len(rows)} rows to {db_path} ({mode})")
+
+            finish_load(conn)
+
+        export_parquet(conn, touched_dates, recorder)
+
+    except sqlite3.Error: 
+        if conn.in_transaction: 
+            conn.execute("ROLLBACK")
+        raise
 
     finally: 
         conn.close()
 
-def run_etl(limit: int = 1000) -> None: 
-    """Full ETL pipeline with validation."""
 
-    if limit < 1 or limit > 5000: 
-        raise ValueError("limit must be 1-5000")
-    
-    df_raw = extract_github_hn(limit)
+def write_rows(
+        conn: sqlite3.Connection, 
+        rows: List[tuple], 
+        full_refresh: bool = False
+) -> Optional[Set[str]]: 
+    """
+    Upsert rows and refresh the rollups they touch (caller owns the transaction).
+
+    Rows identical to the stored ones are not rewritten, and when no row
+    changed the rollups are left alone: an incremental run that only
+    re-fetches the watermark issue writes nothing to the DB.
+
+    Returns:
+        The DATE(created_at) values touched (None after a full refresh,
+        empty when no row changed).
+    """
+    if full_refresh: 
+        conn.executemany(UPSERT_HN_POSTS, rows)
+        refresh_rollups(conn, None)
+        return None
+
+    ids = [row[0] for row in rows]
+    # Old dates too, in case an upsert moved an issue to another day
+    affected_dates = dates_for_ids(conn, ids)
+    changes = conn.total_changes
+    conn.executemany(UPSERT_HN_POSTS, rows)
+    if conn.total_changes == changes: 
+        return set()
+    affected_dates |= dates_for_ids(conn, ids)
+    refresh_rollups(conn, affected_dates)
+    return affected_dates
+
+
+def advance_watermark(conn: sqlite3.Connection) -> None: 
+    """Store MAX(created_at) as the next incremental run's starting point."""
+    conn.execute(
+        "INSERT INTO etl_state (key, value) "
+        "SELECT ?, MAX(created_at) FROM hn_posts WHERE true "
+        "ON CONFLICT(key) DO UPDATE SET value = excluded.value WHERE value IS NOT excluded.value",
+        (WATERMARK_KEY,)
+    )
+
+
+def export_parquet(
+        conn: sqlite3.Connection, 
+        dates: Optional[Set[str]], 
+        recorder: RunRecorder
+) -> None: 
+    """
+    Mirror committed dates (None = all) into the Parquet dataset.
+
+    Runs after the commit: SQLite stays the source of truth, and a failed
+    export fails the run so the gap is visible (`parquet_store.py export`
+    rebuilds everything). Skipped when ETL_PARQUET is off, or in "auto"
+    mode without pyarrow.
+    """
+    if not parquet_enabled(): 
+        return
+    with recorder.stage("parquet") as stage: 
+        stage.rows += export_dates(conn, dates, PARQUET_DIR)
+
+
+def finish_load(conn: sqlite3.Connection) -> None: 
+    """
+    Refresh planner statistics for the indexes, then fold the WAL back
+    into the main file so its mtime marks the new version.
+
+    Skipped when the connection changed no row: the file, and with it
+    serve_hn's cache fingerprint, stays as it was.
+    """
+    if not conn.total_changes: 
+        return
+    conn.execute("PRAGMA optimize")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+# ============================================================================
+# Streaming Pipeline (page -> chunk -> transform -> commit)
+# ============================================================================
+
+def iter_chunks(pages: Iterable[List[Dict]], chunk_size: int) -> Iterator[List[Dict]]: 
+    """Regroup extracted pages into lists of at least chunk_size issues (last may be short)."""
+    buffer: List[Dict] = []
+    for page in pages: 
+        buffer.extend(page)
+        if len(buffer) >= chunk_size: 
+            yield buffer
+            buffer = []
+    if buffer: 
+        yield buffer
+
+
+def stream_etl(
+        limit: int, 
+        db_path: str = str(DEFAULT_DB_PATH), 
+        incremental: bool = True, 
+        chunk_size: int = 500, 
+        max_pending_pages: int = 2, 
+        client: Optional[GitHubSearchClient] = None, 
+        recorder: Optional[RunRecorder] = None
+) -> int: 
+    """
+    Streaming ETL: each chunk is flattened, transformed and committed as it arrives.
+
+    Peak memory is bounded by chunk_size plus max_pending_pages prefetched
+    pages (the extractor stops fetching while a chunk is being loaded), not
+    by `limit`. Chunks are upserted in their own transactions so data shows
+    up in serve_hn while the extract is still running. Incremental runs
+    page oldest first (search_order), so a run stopped by `limit` has
+    every issue up to the newest one it loaded; the watermark still only
+    advances after the last chunk, so a failed run re-fetches rather than
+    skips. Streaming never deletes rows; incremental=False re-fetches
+    `limit` issues (newest first) and upserts.
+
+    Time spent waiting for pages is charged to the recorder's extract
+    stage, per-chunk work to transform/load; a client without an observer
+    gets the recorder's, so its HTTP attempts show up in the report.
+
+    Returns:
+        Number of rows loaded.
+    """
+    since = read_watermark(db_path) if incremental else None
+    if since: 
+        logger.info(f"Incremental run from watermark {since}")
+
+    recorder = recorder or RunRecorder(mode="stream", incremental=incremental)
+    client = client or default_client()
+    if client.observer is None: 
+        client.observer = recorder.observe_request
+    pages = recorder.timed_pages(
+        client.iter_search_pages(
+            search_query(since), limit, max_pending=max_pending_pages, order=search_order(since)
+        )
+    )
+
+    conn = connect_for_load(db_path)
+    loaded = 0
+    touched_dates: Set[str] = set()
+    try: 
+        for chunk in iter_chunks(pages, chunk_size): 
+            with recorder.stage("transform") as stage: 
+                rows = to_rows(transform(normalize_issues(chunk)))
+                stage.rows += len(rows)
+
+            with recorder.stage("load") as stage: 
+                conn.execute("BEGIN IMMEDIATE")
+                touched_dates |= write_rows(conn, rows)
+                recorder.commit(conn)
+                stage.rows += len(rows)
+
+            loaded += len(rows)
+            logger.info(f"Committed chunk of {len(rows)} rows ({loaded} total)")
+
+        if loaded: 
+            with recorder.stage("load"): 
+                conn.execute("BEGIN IMMEDIATE")
+                advance_watermark(conn)
+                recorder.commit(conn)
+                finish_load(conn)
+            # Once per run, not per chunk: chunks of the same day would rewrite it repeatedly
+            export_parquet(conn, touched_dates, recorder)
+
+    except sqlite3.Error: 
+        if conn.in_transaction: 
+            conn.execute("ROLLBACK")
+        raise
+
+    finally: 
+        conn.close()
+
+    return loaded
+
+def batch_etl(
+        limit: int, 
+        db_path: str = str(DEFAULT_DB_PATH), 
+        incremental: bool = True, 
+        recorder: Optional[RunRecorder] = None
+) -> int: 
+    """
+    In-memory ETL: extract everything, transform once, load in one transaction.
+
+    Returns:
+        Number of rows loaded (0 when nothing is newer than the watermark).
+    """
+    recorder = recorder or RunRecorder(mode="batch", incremental=incremental)
+    since = read_watermark(db_path) if incremental else None
+    if since: 
+        logger.info(f"Incremental run from watermark {since}")
+
+    with recorder.stage("extract") as stage: 
+        df_raw = extract_github_hn(
+            limit, since=since, client=default_client(observer=recorder.observe_request)
+        )
+        stage.rows += len(df_raw)
+
     if len(df_raw) == 0: 
-        raise ValueError("No data extracted")
+        logger.info("No issues newer than watermark")
+        return 0
     
-    df_clean = transform(df_raw)
-    load(df_clean)
-    logger.info(f"✅ ETL COMPLETE: {len(df_clean)} rows")
+    with recorder.stage("transform") as stage: 
+        df_clean = transform(df_raw)
+        stage.rows += len(df_clean)
+
+    load(df_clean, db_path, mode="upsert" if incremental else "replace", recorder=recorder)
+    return len(df_clean)
+
+
+def record_run(recorder: RunRecorder, db_path: str, report_path: Optional[Path]) -> None: 
+    """
+    Write the JSON run report and append the run to etl_runs in the run
+    history DB (runs_db_path), not the served DB: a run that loads nothing
+    then leaves serve_hn's caches valid.
+
+    Best effort: a report that cannot be stored is logged, never raised,
+    so it cannot mask the run's own result or error.
+    """
+    report = recorder.report()
+    stages = report["stages"]
+    logger.info(
+        f"Run {report['status']}: {report['duration_seconds']}s, {report['rows_loaded']} rows "
+        f"({report['rows_per_sec']} rows/s) | extract {stages['extract']['seconds']}s "
+        f"({stages['extract']['requests']} requests, {stages['extract']['bytes']} bytes) | "
+        f"transform {stages['transform']['seconds']}s | load {stages['load']['seconds']}s "
+        f"(commit {stages['load'].get('commit_seconds', 0)}s) | peak RSS {report['peak_rss_mb']} MB"
+    )
+
+    try: 
+        if report_path is not None: 
+            recorder.write_json(report_path)
+        runs_path = runs_db_path(db_path)
+        runs_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(runs_path, isolation_level=None)
+        try: 
+            recorder.save(conn)
+        finally: 
+            conn.close()
+    except (OSError, sqlite3.Error) as error: 
+        logger.warning(f"Could not store run report: {error}")
+
+
+def run_etl(
+        limit: int = 1000, 
+        db_path: str = str(DEFAULT_DB_PATH), 
+        incremental: bool = True, 
+        stream: bool = False, 
+        chunk_size: int = 500, 
+        max_pending_pages: int = 2, 
+        report_path: Optional[Path] = RUN_REPORT_PATH
+) -> Dict[str, Any]: 
+    """
+    Full ETL pipeline with validation.
+
+    incremental=True only fetches issues at or after the stored
+    created_at watermark and upserts them; False re-extracts `limit`
+    issues and replaces the table contents.
+
+    stream=True runs stream_etl instead (chunked, bounded memory); the
+    1-5000 limit cap only applies to the in-memory mode.
+
+    Every run (failed ones too) is instrumented: the run report (stage
+    timings, rows/sec, HTTP latency/bytes/rate-limit headroom, commit
+    time, peak RSS) goes to report_path (ETL_REPORT_PATH; None = skip)
+    and into the etl_runs table (hn_posts_runs.db) that /health reads.
+
+    Returns:
+        The run report dict.
+    """
+
+    if limit < 1 or (not stream and limit > 5000): 
+        raise ValueError("limit must be 1-5000 (or >= 1 with stream=True)")
+
+    recorder = RunRecorder(mode="stream" if stream else "batch", incremental=incremental)
+    try: 
+        if stream: 
+            loaded = stream_etl(
+                limit, db_path, incremental, chunk_size, max_pending_pages, recorder=recorder
+            )
+        else: 
+            loaded = batch_etl(limit, db_path, incremental, recorder=recorder)
+    except Exception as error: 
+        recorder.finish("failed", error=error)
+        record_run(recorder, db_path, report_path)
+        raise
+
+    recorder.finish("ok", rows_loaded=loaded)
+    record_run(recorder, db_path, report_path)
+    logger.info(f"✅ ETL COMPLETE{' (streaming)' if stream else ''}: {loaded} rows")
+    return recorder.report()
 
 if __name__ == "__main__": 
-    run_etl()
\ No newline at end of file
+    stream = os.environ.get("ETL_STREAM", "").lower() in ("1", "true", "yes")
+    # HN_PROFILE=cprofile|sample profiles the whole run (sample also sees the extract workers)
+    with profiled("etl_stream" if stream else "etl", parse_mode(os.environ.get("HN_PROFILE")), all_threads=True): 
+        if stream: 
+            run_etl(
+                limit=int(os.environ.get("ETL_LIMIT", "1000")), 
+                stream=True, 
+                chunk_size=int(os.environ.get("ETL_CHUNK_SIZE", "500")), 
+            )
+        else: 
+            run_etl()
\ No newline at end of file
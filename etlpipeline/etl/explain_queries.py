@@ -0,0 +1,102 @@
+"""
+Query Plan Check: EXPLAIN QUERY PLAN for every registered dashboard query
+
+Purpose: Fail fast when a query in queries.QUERIES falls back to a
+         full table scan (e.g. an index was dropped or a query rewritten),
+         or when the DB has not been migrated to the rollup tables yet.
+Inputs: hn_posts.db with the ETL schema + indexes (default ../data/hn_posts.db)
+Outputs: Plan per query on stdout; exit code 1 if any query full-scans
+         or the rollup tables are missing
+Usage:
+    cd etlpipeline/etl
+    python explain_queries.py                 # default DB
+    python explain_queries.py /tmp/hn_posts.db
+"""
+
+import logging
+import re
+import sqlite3
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Mapping, Optional, Set
+
+from queries import QUERIES, ROLLUP_TABLES, missing_rollups
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path(__file__).parent.parent / "data" / "hn_posts.db"
+
+# "SCAN hn_posts" with no "USING ... INDEX" suffix = reads every table row
+FULL_SCAN = re.compile(r"^SCAN (\w+)$")
+
+def base_tables(connection: sqlite3.Connection) -> Set[str]:
+    """Real tables in the DB (CTEs and subqueries also show up as SCAN lines)."""
+    rows = connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    return {row[0] for row in rows}
+
+
+def explain(connection: sqlite3.Connection, sql_query: str,
+            params: Optional[Mapping[str, Any]] = None) -> List[str]:
+    """Return the EXPLAIN QUERY PLAN detail lines for one query."""
+    return [row[3] for row in connection.execute(f"EXPLAIN QUERY PLAN {sql_query}", params or {})]
+
+
+def find_full_scans(plan: List[str], tables: Set[str]) -> List[str]:
+    """Plan lines that scan a raw (non-rollup) table without any index."""
+    scans = []
+    for detail in plan:
+        match = FULL_SCAN.match(detail.strip())
+        if match and match.group(1) in tables and match.group(1) not in ROLLUP_TABLES:
+            scans.append(detail.strip())
+    return scans
+
+
+def check_query_plans(db_path: Path) -> Dict[str, List[str]]:
+    """
+    Explain every catalog query against db_path.
+
+    Returns:
+        {query_name: [full-scan plan lines]} for offending queries only,
+        or {query_name: [migration error]} for every query that reads a
+        rollup table the DB does not have yet (serve_hn would run its
+        hn_posts fallback; the ETL's next load creates the tables).
+
+    Raises:
+        FileNotFoundError: db_path missing
+        sqlite3.Error: A query fails to compile
+    """
+    if not db_path.exists():
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    connection = sqlite3.connect(f"{db_path.resolve().as_uri()}?mode=ro", uri=True)
+    try:
+        missing = missing_rollups(connection)
+        if missing:
+            error = f"needs migration: rollup tables missing ({', '.join(missing)}); run etl_hn_github.py"
+            return {query.name: [error] for query in QUERIES if query.fallback_sql is not None}
+
+        tables = base_tables(connection)
+        failures = {}
+        for query in QUERIES:
+            plan = explain(connection, query.sql, query.bind(query.defaults))
+            logger.info("%s:\n    %s", query.name, "\n    ".join(plan))
+
+            full_scans = find_full_scans(plan, tables)
+            if full_scans:
+                failures[query.name] = full_scans
+        return failures
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    db_path = Path(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_DB_PATH
+    failures = check_query_plans(db_path)
+
+    for query_name, problems in failures.items():
+        logger.error("❌ %s: %s", query_name, "; ".join(problems))
+
+    if failures:
+        sys.exit(1)
+    logger.info("✅ %d queries use indexes", len(QUERIES))
@@ -0,0 +1,485 @@
+"""
+GitHub Search Client: pooled, concurrent, rate-limit-aware page fetcher
+
+Purpose: Fetch GitHub issue search pages for etl_hn_github.extract_github_hn
+         with keep-alive sessions, bounded concurrency, a token bucket fed
+         by X-RateLimit-* headers, retry with exponential backoff + jitter,
+         and ETag / If-None-Match revalidation.
+Inputs: GitHub REST API (or a local stub, see github_stub_server.py)
+Outputs: Lists of raw issue dicts, in page order
+Raises: requests.RequestException (retries exhausted / 4xx)
+Usage:
+    client = GitHubSearchClient(base_url="http://127.0.0.1:8765")
+    issues = client.search_issues("hackernews", limit=1000)
+"""
+
+import json
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+GITHUB_API_URL = "https://api.github.com"
+PER_PAGE = 100
+# GitHub search never returns more than 1000 results per query
+SEARCH_RESULT_CAP = 1000
+
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+# Search pages kept for revalidation (a full run of the default limit is 10)
+ETAG_CACHE_MAX_ENTRIES = 100
+
+
+class RequestStats(NamedTuple):
+    """One HTTP attempt, as passed to GitHubSearchClient(observer=...)."""
+    url: str
+    page: Optional[int]
+    status: int                      # 0 = connection error / timeout
+    seconds: float
+    bytes: int
+    rate_remaining: Optional[int]    # X-RateLimit-Remaining
+    rate_limit: Optional[int]        # X-RateLimit-Limit
+    attempt: int
+
+
+CREATED_QUALIFIER = re.compile(r"\s*\bcreated:(\S+)")
+
+
+def created_window(query: str, order: str, boundary: str) -> str:
+    """
+    `query` narrowed to created_at >= boundary (asc) or <= boundary (desc).
+
+    A created: qualifier already in `query` (the ETL watermark) is folded
+    into the same range, so the request never carries two of them.
+
+    Raises:
+        ValueError: More than one created: qualifier, or one that is not
+            >=X, <=X or X..Y
+    """
+    qualifiers = CREATED_QUALIFIER.findall(query)
+    if len(qualifiers) > 1:
+        raise ValueError(f"more than one created: qualifier in {query!r}")
+    low = high = "*"
+    if qualifiers:
+        value = qualifiers[0]
+        if value.startswith(">="):
+            low = value[2:]
+        elif value.startswith("<="):
+            high = value[2:]
+        elif ".." in value:
+            low, high = value.split("..", 1)
+        else:
+            raise ValueError(f"unsupported created: qualifier {value!r}")
+        query = CREATED_QUALIFIER.sub("", query).strip()
+
+    if order == "asc":
+        low = boundary
+    else:
+        high = boundary
+    if low == "*":
+        return f"{query} created:<={high}"
+    if high == "*":
+        return f"{query} created:>={low}"
+    return f"{query} created:{low}..{high}"
+
+
+def retry_after_seconds(value: str) -> Optional[float]:
+    """Retry-After as seconds: delay-seconds or an HTTP-date (RFC 9110); None if unparseable."""
+    try:
+        seconds = float(value)
+    except ValueError:
+        pass
+    else:
+        return max(seconds, 0.0) if math.isfinite(seconds) else None
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max((when - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def header_int(headers: Mapping[str, str], name: str) -> Optional[int]:
+    value = headers.get(name)
+    return int(value) if value is not None and value.isdigit() else None
+
+# ============================================================================
+# Token Bucket (driven by X-RateLimit-* headers)
+# ============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket that paces requests to the server's budget.
+
+    Starts at `rate` tokens/sec with `capacity` burst. Each response's
+    X-RateLimit-Remaining / X-RateLimit-Reset headers re-derive the rate so
+    the remaining budget is spread over the rest of the window; a
+    Remaining of 0 (or a Retry-After) blocks everyone until reset.
+    """
+
+    def __init__(self, rate: float = 0.5, capacity: int = 4) -> None:
+        self.rate = rate
+        self.capacity = capacity
+        self.max_capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until one token is available, then take it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+
+                if now >= self._blocked_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                wait = max(
+                    self._blocked_until - now,
+                    (1 - self._tokens) / self.rate if self.rate > 0 else 1.0,
+                )
+            time.sleep(min(wait, 60.0))
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for `seconds` (Retry-After / exhausted budget)."""
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def update_from_headers(self, headers: Mapping[str, str]) -> None:
+        """Re-derive the refill rate from X-RateLimit-Remaining / -Reset."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+
+        seconds_to_reset = max(float(reset) - time.time(), 1.0)
+        remaining_calls = int(remaining)
+
+        if remaining_calls <= 0:
+            logger.warning("GitHub rate limit exhausted, pausing %.0fs", seconds_to_reset)
+            self.pause(seconds_to_reset)
+            return
+
+        with self._lock:
+            self.rate = remaining_calls / seconds_to_reset
+            self.capacity = max(1, min(self.max_capacity, remaining_calls))
+
+
+# ============================================================================
+# ETag Cache (conditional requests)
+# ============================================================================
+
+class ETagCache:
+    """
+    url -> (ETag, items) store for If-None-Match revalidation.
+
+    A 304 Not Modified reply costs no rate-limit budget on GitHub and
+    carries no body, so the cached items are replayed instead. Optionally
+    persisted as JSON so nightly runs can revalidate across processes.
+
+    Bounded to `max_entries` URLs, least recently used evicted first, so
+    URLs runs no longer request do not pile up in the file.
+    """
+
+    def __init__(self, path: Optional[Path] = None, max_entries: int = ETAG_CACHE_MAX_ENTRIES) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if path is not None and path.exists():
+            for key, (etag, payload) in json.loads(path.read_text()).items():
+                self._entries[key] = (etag, payload)
+            self._evict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Tuple[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, etag: str, payload: Any) -> None:
+        with self._lock:
+            self._entries[key] = (etag, payload)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def save(self) -> None:
+        """Persist the entries, least recently used first (the order eviction resumes from)."""
+        if self.path is None:
+            return
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self.path.write_text(json.dumps(self._entries))
+
+
+# ============================================================================
+# Search Client
+# ============================================================================
+
+class GitHubSearchClient:
+    """
+    Concurrent GitHub issue-search pager.
+
+    Page 1 is fetched first to learn `total_count`; the remaining pages are
+    fetched through a thread pool of `max_workers` sharing one pooled
+    keep-alive session and one token bucket.
+    """
+
+    def __init__(
+            self,
+            base_url: Optional[str] = None,
+            token: Optional[str] = None,
+            max_workers: int = 4,
+            max_retries: int = 5,
+            backoff_base: float = 1.0,
+            backoff_cap: float = 60.0,
+            timeout: float = 30.0,
+            etag_cache: Optional[ETagCache] = None,
+            rate_limiter: Optional[TokenBucket] = None,
+            observer: Optional[Callable[[RequestStats], None]] = None,
+    ) -> None:
+        self.base_url = (base_url or os.environ.get("GITHUB_API_URL", GITHUB_API_URL)).rstrip("/")
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.timeout = timeout
+        self.etag_cache = etag_cache if etag_cache is not None else ETagCache()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else TokenBucket(
+            capacity=max_workers
+        )
+        # Called (from worker threads) after every HTTP attempt, e.g. RunRecorder.observe_request
+        self.observer = observer
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Accept"] = "application/vnd.github+json"
+
+        token = token or os.environ.get("GITHUB_TOKEN")
+        if token:
+            self.session.headers["Authorization"] = f"Bearer {token}"
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff: U(0, min(cap, base * 2^attempt))."""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def get_json(self, path: str, params: Mapping[str, Any], conditional: bool = True) -> Any:
+        """
+        GET base_url + path with retries, rate limiting and ETag revalidation
+        (conditional=False: a one-off URL, neither revalidated nor cached).
+
+        Raises:
+            requests.HTTPError: Non-retryable status or retries exhausted
+            requests.RequestException: Network errors after retries
+        """
+        url = f"{self.base_url}{path}"
+        cache_key = requests.Request("GET", url, params=params).prepare().url
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+
+            headers = {}
+            cached = self.etag_cache.get(cache_key) if conditional else None
+            if cached is not None:
+                headers["If-None-Match"] = cached[0]
+
+            started = time.perf_counter()
+            try:
+                resp = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as error:
+                self._observe(cache_key, params, 0, started, 0, {}, attempt)
+                if attempt == self.max_retries:
+                    raise
+                delay = self._backoff(attempt)
+                logger.warning("GET %s failed (%s), retry in %.1fs", cache_key, error, delay)
+                time.sleep(delay)
+                continue
+
+            self._observe(cache_key, params, resp.status_code, started,
+                          len(resp.content), resp.headers, attempt)
+            self.rate_limiter.update_from_headers(resp.headers)
+
+            if resp.status_code == 304 and cached is not None:
+                logger.info("Not modified (ETag hit): %s", cache_key)
+                return cached[1]
+
+            if self._is_rate_limited(resp) or resp.status_code in RETRYABLE_STATUS:
+                if attempt == self.max_retries:
+                    resp.raise_for_status()
+                retry_after = retry_after_seconds(resp.headers.get("Retry-After", ""))
+                delay = retry_after if retry_after is not None else self._backoff(attempt)
+                if retry_after is not None:
+                    self.rate_limiter.pause(delay)
+                logger.warning("GET %s -> %d, retry in %.1fs", cache_key, resp.status_code, delay)
+                time.sleep(delay)
+                continue
+
+            resp.raise_for_status()
+            payload = resp.json()
+
+            etag = resp.headers.get("ETag")
+            if etag and conditional:
+                self.etag_cache.put(cache_key, etag, payload)
+            return payload
+
+        raise requests.HTTPError(f"Retries exhausted for {cache_key}")
+
+    def _observe(self, url: str, params: Mapping[str, Any], status: int, started: float,
+                 size: int, headers: Mapping[str, str], attempt: int) -> None:
+        if self.observer is None:
+            return
+        self.observer(RequestStats(
+            url=url,
+            page=params.get("page"),
+            status=status,
+            seconds=time.perf_counter() - started,
+            bytes=size,
+            rate_remaining=header_int(headers, "X-RateLimit-Remaining"),
+            rate_limit=header_int(headers, "X-RateLimit-Limit"),
+            attempt=attempt,
+        ))
+
+    @staticmethod
+    def _is_rate_limited(resp: requests.Response) -> bool:
+        """GitHub signals primary/secondary limits with 403 + headers."""
+        return resp.status_code == 403 and (
+            resp.headers.get("X-RateLimit-Remaining") == "0"
+            or "Retry-After" in resp.headers
+        )
+
+    def fetch_search_page(self, query: str, page: int, order: str = "desc") -> Dict[str, Any]:
+        """One page of /search/issues sorted by created_at (desc = newest first)."""
+        params = {
+            "q": query,
+            "sort": "created",
+            "order": order,
+            "per_page": PER_PAGE,
+            "page": page,
+        }
+        # created:-bounded queries (watermark, result-cap windows) differ from
+        # run to run, so their pages would never be revalidated
+        payload = self.get_json("/search/issues", params, conditional="created:" not in query)
+        logger.info(f"Extracted page {page}: {len(payload.get('items', []))} issues")
+        return payload
+
+    def iter_search_pages(
+            self,
+            query: str,
+            limit: int = 1000,
+            max_pending: Optional[int] = None,
+            order: str = "desc",
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield pages of issues in created_at `order` until about `limit` issues are seen.
+
+        At most `max_pending` pages (default: max_workers) are in flight
+        ahead of the consumer, so a slow transform/load applies backpressure
+        instead of buffering the whole extract. GitHub only serves the first
+        1000 results of a query; past that the search restarts from the
+        last issue seen (`created:<=` newest first, `created:>=` oldest
+        first, combined with any created: qualifier in `query` by
+        created_window) so limits above 1000 keep going (boundary
+        duplicates are harmless: the loader upserts by id).
+
+        order="asc" is for incremental runs: a run cut off by `limit` then
+        has every issue from the watermark up to the newest one it fetched,
+        so advancing the watermark to that issue skips nothing.
+
+        Raises:
+            requests.RequestException: A page failed after retries
+        """
+        max_pending = max_pending or self.max_workers
+        fetched = 0
+        window_query = query
+        last_boundary: Optional[str] = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                while fetched < limit:
+                    first = self.fetch_search_page(window_query, 1, order)
+                    items = first.get("items", [])
+                    if not items:
+                        return
+
+                    total_count = first.get("total_count", len(items))
+                    total = min(total_count, SEARCH_RESULT_CAP)
+                    last_page = min(
+                        -(-(limit - fetched) // PER_PAGE), -(-total // PER_PAGE)
+                    )
+
+                    pending: Deque[Future] = deque()
+                    next_page = 2
+                    while True:
+                        fetched += len(items)
+                        yield items
+                        if len(items) < PER_PAGE:
+                            return
+
+                        while next_page <= last_page and len(pending) < max_pending:
+                            pending.append(
+                                pool.submit(self.fetch_search_page, window_query, next_page, order)
+                            )
+                            next_page += 1
+
+                        if not pending:
+                            break
+                        items = pending.popleft().result().get("items", [])
+                        if not items:
+                            return
+
+                    if total_count <= SEARCH_RESULT_CAP:
+                        return
+
+                    # Window exhausted (result cap) - continue from the last issue seen
+                    boundary = items[-1]["created_at"]
+                    if boundary == last_boundary:
+                        return
+                    last_boundary = boundary
+                    window_query = created_window(query, order, boundary)
+
+        finally:
+            self.etag_cache.save()
+
+    def search_issues(self, query: str, limit: int = 1000, order: str = "desc") -> List[Dict[str, Any]]:
+        """
+        Fetch up to `limit` issues (rounded up to whole pages) in created_at `order`.
+
+        Raises:
+            requests.RequestException: A page failed after retries
+        """
+        return [
+            issue
+            for page in self.iter_search_pages(query, limit, order=order)
+            for issue in page
+        ]
@@ -0,0 +1,216 @@
+"""
+GitHub Search Stub Server: offline replay of /search/issues pages
+
+Purpose: Run the extractor (github_client.py / etl_hn_github.py) without
+         network access. Serves canned search pages with ETags, 304s,
+         X-RateLimit-* headers and optional injected 503s.
+Inputs: Directory of recorded search responses (page_1.json, page_2.json, ...)
+        or a synthetic issue count
+Outputs: Local HTTP server mimicking api.github.com/search/issues
+Usage:
+    python github_stub_server.py --issues 1000 --port 8765
+    python github_stub_server.py --pages-dir fixtures/search --fail-first 2
+    GITHUB_API_URL=http://127.0.0.1:8765 python etl_hn_github.py
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Like GitHub: only the first 1000 matches of a query can be paged through
+SEARCH_RESULT_CAP = 1000
+CREATED_QUALIFIER = re.compile(r"created:(>=|<=|>|<)(\S+)")
+CREATED_RANGE = re.compile(r"created:([^\s.]+)\.\.(\S+)")
+
+# ============================================================================
+# Canned Pages
+# ============================================================================
+
+def synthesize_issues(count: int, newest: Optional[datetime] = None) -> List[Dict[str, Any]]:
+    """Deterministic fake search items shaped like GitHub's, newest first."""
+    newest = newest or datetime(2026, 2, 19, 21, 26, 26, tzinfo=timezone.utc)
+    return [
+        {
+            "id": 4_000_000_000 - i,
+            "title": f"Add user_{i % 50} to contributors list",
+            "user": {"login": f"user_{i % 50}", "type": "User"},
+            "comments": i % 7,
+            "created_at": (newest - timedelta(minutes=7 * i)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        }
+        for i in range(count)
+    ]
+
+
+def filter_by_query(items: List[Dict[str, Any]], query: str) -> List[Dict[str, Any]]:
+    """Apply `created:>=...` / `created:<=...` / `created:A..B` qualifiers (ISO-8601 strings compare in order)."""
+    compare = {
+        ">=": lambda a, b: a >= b,
+        "<=": lambda a, b: a <= b,
+        ">": lambda a, b: a > b,
+        "<": lambda a, b: a < b,
+    }
+    for operator, bound in CREATED_QUALIFIER.findall(query):
+        items = [item for item in items if compare[operator](item["created_at"], bound)]
+    for low, high in CREATED_RANGE.findall(query):
+        items = [item for item in items
+                 if (low == "*" or item["created_at"] >= low) and (high == "*" or item["created_at"] <= high)]
+    return items
+
+
+def load_canned_items(pages_dir: Path) -> List[Dict[str, Any]]:
+    """Concatenate the items of recorded page_N.json responses in page order."""
+    page_files = sorted(
+        pages_dir.glob("page_*.json"), key=lambda path: int(path.stem.split("_")[1])
+    )
+    if not page_files:
+        raise FileNotFoundError(f"No page_*.json files in {pages_dir}")
+
+    items: List[Dict[str, Any]] = []
+    for page_file in page_files:
+        items.extend(json.loads(page_file.read_text()).get("items", []))
+    return items
+
+
+# ============================================================================
+# HTTP Handler
+# ============================================================================
+
+class StubState:
+    """Shared, thread-safe counters for one stub server."""
+
+    def __init__(self, items: List[Dict[str, Any]], rate_limit: int, fail_first: int) -> None:
+        self.items = items
+        self.rate_limit = rate_limit
+        self.remaining = rate_limit
+        self.reset_at = int(time.time()) + 60
+        self.fail_remaining = fail_first
+        self.requests = 0
+        self.not_modified = 0
+        self.lock = threading.Lock()
+
+
+class SearchHandler(BaseHTTPRequestHandler):
+    """Serves GET /search/issues?q=...&order=asc|desc&page=N&per_page=M from StubState."""
+
+    state: StubState
+
+    def log_message(self, format: str, *args: Any) -> None:
+        logger.debug(format, *args)
+
+    def _send(self, status: int, body: bytes = b"", headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        url = urlparse(self.path)
+        if url.path != "/search/issues":
+            self._send(404, b'{"message": "Not Found"}')
+            return
+
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            if time.time() >= state.reset_at:
+                state.remaining, state.reset_at = state.rate_limit, int(time.time()) + 60
+
+            if state.fail_remaining > 0:
+                state.fail_remaining -= 1
+                self._send(503, b'{"message": "Service Unavailable"}')
+                return
+
+            rate_headers = {
+                "X-RateLimit-Limit": str(state.rate_limit),
+                "X-RateLimit-Remaining": str(max(state.remaining - 1, 0)),
+                "X-RateLimit-Reset": str(state.reset_at),
+            }
+            if state.remaining <= 0:
+                rate_headers["Retry-After"] = str(max(state.reset_at - int(time.time()), 1))
+                self._send(403, b'{"message": "API rate limit exceeded"}', rate_headers)
+                return
+
+        params = parse_qs(url.query)
+        page = int(params.get("page", ["1"])[0])
+        per_page = min(int(params.get("per_page", ["30"])[0]), 100)
+        start = (page - 1) * per_page
+        matches = filter_by_query(state.items, params.get("q", [""])[0])
+        if params.get("order", ["desc"])[0] == "asc":
+            matches = sorted(matches, key=lambda item: item["created_at"])
+
+        if start >= SEARCH_RESULT_CAP:
+            self._send(422, b'{"message": "Only the first 1000 search results are available"}')
+            return
+
+        body = json.dumps({
+            "total_count": len(matches),
+            "incomplete_results": False,
+            "items": matches[start:min(start + per_page, SEARCH_RESULT_CAP)],
+        }).encode("utf-8")
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+        if self.headers.get("If-None-Match") == etag:
+            # Like GitHub: conditional hits do not count against the limit
+            with state.lock:
+                state.not_modified += 1
+            self._send(304, headers={"ETag": etag, **rate_headers})
+            return
+
+        with state.lock:
+            state.remaining -= 1
+        self._send(200, body, {
+            "Content-Type": "application/json; charset=utf-8",
+            "ETag": etag,
+            **rate_headers,
+        })
+
+
+def make_stub_server(
+        items: List[Dict[str, Any]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: int = 5000,
+        fail_first: int = 0,
+) -> ThreadingHTTPServer:
+    """
+    Build (not start) a stub server; port=0 picks a free port.
+
+    Usage:
+        server = make_stub_server(synthesize_issues(1000))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+    """
+    handler = type("BoundSearchHandler", (SearchHandler,), {
+        "state": StubState(items, rate_limit, fail_first),
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay GitHub search pages locally")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--pages-dir", type=Path, help="directory of page_N.json responses")
+    source.add_argument("--issues", type=int, default=1000, help="synthetic issue count")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rate-limit", type=int, default=5000)
+    parser.add_argument("--fail-first", type=int, default=0, help="answer the first N requests with 503")
+    args = parser.parse_args()
+
+    items = load_canned_items(args.pages_dir) if args.pages_dir else synthesize_issues(args.issues)
+    server = make_stub_server(items, port=args.port, rate_limit=args.rate_limit, fail_first=args.fail_first)
+    logger.info("🧪 GitHub stub serving %d issues on http://127.0.0.1:%d", len(items), args.port)
+    server.serve_forever()
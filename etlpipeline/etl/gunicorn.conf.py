@@ -0,0 +1,60 @@
+"""
+Gunicorn config for serve_hn.py (production serving)
+
+Purpose: Serve the dashboard API with several worker processes (each with
+         its own threads, read-only connection pool, response cache and
+         metrics) and shut down gracefully on SIGTERM: workers stop
+         accepting, finish in-flight requests (up to HN_GRACEFUL_TIMEOUT)
+         and close their pooled connections.
+Inputs: Env vars (HN_BIND, HN_WORKERS, HN_THREADS, ...) + serve_hn config
+Outputs: WSGI server on HN_BIND (default 0.0.0.0:5000)
+Usage:
+    cd etlpipeline
+    gunicorn -c etl/gunicorn.conf.py
+    HN_WORKERS=4 HN_THREADS=8 gunicorn -c etl/gunicorn.conf.py
+"""
+
+import os
+from pathlib import Path
+
+wsgi_app = "serve_hn:create_app()"
+pythonpath = str(Path(__file__).parent)
+
+bind = os.environ.get("HN_BIND", "0.0.0.0:5000")
+
+# Processes scale CPU-bound work (JSON, row building) past the GIL;
+# threads overlap SQLite reads and slow clients within a worker
+workers = int(os.environ.get("HN_WORKERS", str(os.cpu_count() or 1)))
+threads = int(os.environ.get("HN_THREADS", "4"))
+worker_class = "gthread"
+
+# One pooled read-only connection per request thread (read by serve_hn at import)
+os.environ.setdefault("HN_DB_POOL_SIZE", str(threads))
+
+timeout = int(os.environ.get("HN_TIMEOUT", "30"))
+graceful_timeout = int(os.environ.get("HN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.environ.get("HN_KEEPALIVE", "5"))
+# Recycle workers after N requests (0 = never), jittered so they don't restart together
+max_requests = int(os.environ.get("HN_MAX_REQUESTS", "0"))
+max_requests_jitter = max_requests // 10
+# Import the app once in the master; the pools are fork-safe either way
+preload_app = os.environ.get("HN_PRELOAD_APP", "0") == "1"
+
+accesslog = os.environ.get("HN_ACCESS_LOG")  # "-" = stdout, unset = off
+errorlog = "-"
+loglevel = os.environ.get("HN_LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    server.log.info("Worker %s started (%d threads)", worker.pid, threads)
+
+
+def worker_exit(server, worker):
+    """Runs in the worker after its last request: close its SQLite connections."""
+    import serve_hn
+
+    serve_hn.shutdown()
+
+
+def on_exit(server):
+    server.log.info("All workers stopped")
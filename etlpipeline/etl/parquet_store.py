@@ -0,0 +1,239 @@
+"""
+Columnar copy of hn_posts: date-partitioned Parquet dataset
+
+Purpose: Analytical scans (week_2 analyzer, user/comments windows) read
+         only the columns and days they need instead of a whole CSV or
+         table. SQLite stays the source of truth: after every committed
+         load, each DATE(created_at) the load touched is re-exported as
+         one zstd-compressed file, so upserts and moved rows stay exact:
+             hn_posts_parquet/event_date=2026-02-19/part-0.parquet
+Inputs: hn_posts.db (etl_hn_github.py load / stream_etl)
+Outputs: Hive-partitioned Parquet dataset (ETL_PARQUET_DIR)
+Raises: ImportError (pyarrow not installed, when required)
+Usage:
+    export_dates(conn, {"2026-02-19"})
+    df = read_posts(PARQUET_DIR, columns=["user", "comments"], since="2026-02-13")
+
+    cd etlpipeline/etl
+    python parquet_store.py export                  # full rebuild from data/hn_posts.db
+    python parquet_store.py scan --days 7           # bytes a 7-day user/comments scan reads
+"""
+
+import argparse
+import logging
+import os
+import shutil
+import sqlite3
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Set, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+PARQUET_DIR = Path(
+    os.environ.get("ETL_PARQUET_DIR", Path(__file__).parent.parent / "data" / "hn_posts_parquet")
+)
+# auto = export when pyarrow is installed, 1 = required (ImportError), 0 = off
+PARQUET_MODE = os.environ.get("ETL_PARQUET", "auto").lower()
+
+PARTITION = "event_date"
+COLUMNS = ["id", "title", "user", "score", "comments", "created_at"]
+COMPRESSION = "zstd"
+PART_FILE = "part-0.parquet"
+
+SELECT_DAY = (
+    "SELECT id, title, user, score, comments, created_at FROM hn_posts "
+    "WHERE created_at >= ? AND created_at < ? ORDER BY created_at, id"
+)
+
+
+def _pyarrow() -> Tuple[Any, Any, Any]:
+    """(pyarrow, pyarrow.parquet, pyarrow.dataset), imported on first use."""
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("The Parquet store needs pyarrow (pip install pyarrow)") from e
+    return pa, pq, ds
+
+
+def parquet_enabled() -> bool:
+    """Whether loads should export Parquet (ETL_PARQUET)."""
+    if PARQUET_MODE in ("0", "false", "no", "off"):
+        return False
+    if PARQUET_MODE in ("1", "true", "yes", "on"):
+        _pyarrow()
+        return True
+    try:
+        _pyarrow()
+    except ImportError:
+        return False
+    return True
+
+
+def _schema(pa: Any) -> Any:
+    return pa.schema([
+        ("id", pa.int64()),
+        ("title", pa.string()),
+        ("user", pa.string()),
+        ("score", pa.float64()),
+        ("comments", pa.int64()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+    ])
+
+
+def _partitioning(ds: Any, pa: Any) -> Any:
+    # Dates as strings: hive directory names compare correctly as text
+    return ds.partitioning(pa.schema([(PARTITION, pa.string())]), flavor="hive")
+
+
+def partition_path(directory: Path, event_date: str) -> Path:
+    return directory / f"{PARTITION}={event_date}"
+
+
+def export_dates(conn: sqlite3.Connection, dates: Optional[Iterable[str]],
+                 directory: Path = PARQUET_DIR) -> int:
+    """
+    Rewrite the partition of every given date from hn_posts (None = all).
+
+    Each partition file is written to a temp name and renamed into place,
+    so readers see the old or the new day, never half a file. A date with
+    no rows left loses its partition; a full export also drops partitions
+    of dates that no longer exist.
+
+    Returns:
+        Rows written.
+
+    Raises:
+        ImportError: pyarrow not installed
+    """
+    pa, pq, _ = _pyarrow()
+    schema = _schema(pa)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    if dates is None:
+        dates = {
+            row[0] for row in conn.execute("SELECT DISTINCT DATE(created_at) FROM hn_posts")
+            if row[0] is not None
+        }
+        existing = {path.name.split("=", 1)[1] for path in directory.glob(f"{PARTITION}=*")}
+        for stale in existing - dates:
+            shutil.rmtree(partition_path(directory, stale))
+
+    written = 0
+    for event_date in sorted(dates):
+        next_date = (date.fromisoformat(event_date) + timedelta(days=1)).isoformat()
+        rows = conn.execute(SELECT_DAY, (event_date, next_date)).fetchall()
+        target = partition_path(directory, event_date)
+        if not rows:
+            shutil.rmtree(target, ignore_errors=True)
+            continue
+
+        frame = pd.DataFrame(rows, columns=COLUMNS)
+        frame["created_at"] = pd.to_datetime(frame["created_at"], format="ISO8601", utc=True)
+        table = pa.Table.from_pandas(frame, schema=schema, preserve_index=False)
+
+        target.mkdir(parents=True, exist_ok=True)
+        temp = target / f".{PART_FILE}.tmp"
+        pq.write_table(table, temp, compression=COMPRESSION)
+        os.replace(temp, target / PART_FILE)
+        written += len(rows)
+
+    logger.info(f"Exported {written} rows ({len(dates)} dates) to {directory}")
+    return written
+
+
+def _dataset(directory: Path) -> Any:
+    pa, _, ds = _pyarrow()
+    if not directory.is_dir():
+        raise FileNotFoundError(f"Parquet dataset missing: {directory}")
+    return ds.dataset(directory, format="parquet", partitioning=_partitioning(ds, pa))
+
+
+def _date_filter(since: Optional[str], until: Optional[str]) -> Any:
+    """Partition filter: since <= event_date < until (ISO dates, either optional)."""
+    _, _, ds = _pyarrow()
+    expression = None
+    if since is not None:
+        expression = ds.field(PARTITION) >= since
+    if until is not None:
+        upper = ds.field(PARTITION) < until
+        expression = upper if expression is None else expression & upper
+    return expression
+
+
+def read_posts(directory: Path = PARQUET_DIR, columns: Optional[List[str]] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read hn_posts from the dataset, only `columns` and only partitions with
+    since <= event_date < until. `event_date` itself is a valid column.
+
+    Raises:
+        FileNotFoundError: Dataset directory missing
+        ImportError: pyarrow not installed
+    """
+    dataset = _dataset(directory)
+    table = dataset.to_table(columns=columns, filter=_date_filter(since, until))
+    return table.to_pandas()
+
+
+def scan_bytes(directory: Path = PARQUET_DIR, columns: Optional[List[str]] = None,
+               since: Optional[str] = None, until: Optional[str] = None) -> int:
+    """Compressed bytes of the column chunks read_posts would read (from file metadata)."""
+    wanted: Optional[Set[str]] = set(columns) if columns is not None else None
+    total = 0
+    for fragment in _dataset(directory).get_fragments(filter=_date_filter(since, until)):
+        metadata = fragment.metadata
+        for group in range(metadata.num_row_groups):
+            row_group = metadata.row_group(group)
+            for index in range(row_group.num_columns):
+                column = row_group.column(index)
+                if wanted is None or column.path_in_schema in wanted:
+                    total += column.total_compressed_size
+    return total
+
+
+def days_ago(days: int, today: Optional[date] = None) -> str:
+    """date('now', '-N days') of the SQL queries, as an ISO date."""
+    today = today or datetime.now(timezone.utc).date()
+    return (today - timedelta(days=days)).isoformat()
+
+
+def top_commenters(directory: Path = PARQUET_DIR, days: int = 7, limit: int = 10) -> pd.DataFrame:
+    """
+    Users with the most comments over the last `days` days.
+
+    Reads only the user and comments columns of the matching partitions.
+    """
+    posts = read_posts(directory, columns=["user", "comments"], since=days_ago(days))
+    return (posts.groupby("user", sort=False)["comments"]
+            .agg(total_comments="sum", posts="size")
+            .sort_values("total_comments", ascending=False, kind="stable")
+            .head(limit)
+            .reset_index())
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="hn_posts Parquet dataset")
+    parser.add_argument("command", choices=["export", "scan"])
+    parser.add_argument("--db", type=Path, default=Path(__file__).parent.parent / "data" / "hn_posts.db")
+    parser.add_argument("--dir", type=Path, default=PARQUET_DIR)
+    parser.add_argument("--days", type=int, default=7, help="scan: window of the user/comments scan")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        connection = sqlite3.connect(f"{args.db.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            export_dates(connection, None, args.dir)
+        finally:
+            connection.close()
+    else:
+        full = scan_bytes(args.dir)
+        window = scan_bytes(args.dir, ["user", "comments"], since=days_ago(args.days))
+        logger.info(f"Full dataset: {full:,} bytes; user+comments, last {args.days} days: "
+                    f"{window:,} bytes ({window / full:.1%})")
+        logger.info("\n%s", top_commenters(args.dir, args.days).to_string(index=False))
@@ -0,0 +1,291 @@
+"""
+Opt-in profiling for serve_hn.py requests and the ETL / API entry points
+
+Purpose: Capture where time goes on production data without attaching
+         tools inside the container. Two modes, both stdlib only:
+           - "cprofile": deterministic cProfile of the calling thread,
+             written as a .pstats file (pstats / snakeviz compatible)
+           - "sample": a background thread samples stacks every
+             HN_PROFILE_INTERVAL_MS and writes collapsed stacks
+             ("a;b;c 42", flamegraph.pl / speedscope compatible); low
+             overhead and it also sees the ETL's extract worker threads
+         Files are named <label>-<timestamp>-<pid>-<seq>.<ext> in
+         HN_PROFILE_DIR; only the newest HN_PROFILE_KEEP are kept.
+Inputs: Label (endpoint / entry point) + mode
+Outputs: .pstats / .collapsed files, summary of the top cumulative
+         functions per label
+Usage:
+    with profiled("etl", mode="sample", all_threads=True):
+        run_etl()
+
+    cd etlpipeline/etl
+    python profiling.py                          # top 15 per label
+    python profiling.py --label api_dashboard --top 30
+"""
+
+import argparse
+import cProfile
+import io
+import itertools
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from types import FrameType
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+PROFILE_DIR = Path(
+    os.environ.get("HN_PROFILE_DIR", Path(__file__).parent.parent / "data" / "profiles")
+)
+# Newest files kept in PROFILE_DIR; older ones are deleted after every write
+PROFILE_KEEP = int(os.environ.get("HN_PROFILE_KEEP", "50"))
+SAMPLE_INTERVAL_SECONDS = float(os.environ.get("HN_PROFILE_INTERVAL_MS", "1")) / 1000
+
+MODES = ("cprofile", "sample")
+EXTENSIONS = {"cprofile": ".pstats", "sample": ".collapsed"}
+PROFILE_FILE = re.compile(r"^(?P<label>.+)-\d{8}T\d{6}-\d+-\d+\.(?P<ext>pstats|collapsed)$")
+
+_sequence = itertools.count(1)
+
+
+def parse_mode(value: Optional[str]) -> Optional[str]:
+    """Env / query-string value -> profiling mode ("1"/"true" mean cprofile), None = off."""
+    value = (value or "").strip().lower()
+    if value in ("", "0", "false", "no", "off"):
+        return None
+    if value in ("1", "true", "yes", "on"):
+        return "cprofile"
+    if value not in MODES:
+        raise ValueError(f"Unknown profile mode {value!r} (use one of {', '.join(MODES)})")
+    return value
+
+
+def safe_label(label: str) -> str:
+    """'/api/dashboard' -> 'api_dashboard' (file-name safe)."""
+    return re.sub(r"[^A-Za-z0-9]+", "_", label).strip("_") or "root"
+
+
+def frame_name(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({Path(code.co_filename).name}:{code.co_firstlineno})"
+
+
+def collapse_stack(frame: Optional[FrameType]) -> str:
+    """Root-first 'outer;inner;leaf' stack of a frame."""
+    names = []
+    while frame is not None:
+        names.append(frame_name(frame).replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Sample the stacks of some (or all) threads on a timer.
+
+    sys._current_frames() is read while holding the GIL, so each sample is
+    a consistent snapshot; the cost is one short GIL hand-off per interval.
+    """
+
+    def __init__(self, thread_ids: Optional[Set[int]] = None,
+                 interval: float = SAMPLE_INTERVAL_SECONDS) -> None:
+        self.thread_ids = thread_ids
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                    continue
+                self.stacks[collapse_stack(frame)] += 1
+            self.samples += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def write(self, path: Path) -> None:
+        lines = [f"{stack} {count}" for stack, count in self.stacks.most_common()]
+        path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+class ProfileSession:
+    """
+    One profile: start(), run the code, stop() -> written file.
+
+    cprofile covers the thread that called start() only. Python 3.12+
+    allows a single active cProfile per process, so a concurrent request
+    gets start() == False and simply runs unprofiled.
+    """
+
+    def __init__(self, label: str, mode: str = "cprofile", all_threads: bool = False,
+                 directory: Path = PROFILE_DIR, keep: int = PROFILE_KEEP) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profile mode {mode!r} (use one of {', '.join(MODES)})")
+        self.label = safe_label(label)
+        self.mode = mode
+        self.all_threads = all_threads
+        self.directory = Path(directory)
+        self.keep = keep
+        self.path: Optional[Path] = None
+        self._profiler: Optional[cProfile.Profile] = None
+        self._sampler: Optional[StackSampler] = None
+
+    def start(self) -> bool:
+        if self.mode == "cprofile":
+            profiler = cProfile.Profile()
+            try:
+                profiler.enable()
+            except ValueError as error:
+                logger.warning("Profiling %s skipped: %s", self.label, error)
+                return False
+            self._profiler = profiler
+        else:
+            thread_ids = None if self.all_threads else {threading.get_ident()}
+            self._sampler = StackSampler(thread_ids)
+            self._sampler.start()
+        return True
+
+    def stop(self) -> Optional[Path]:
+        """Stop and write the profile (idempotent); None if nothing was captured."""
+        profiler, sampler = self._profiler, self._sampler
+        self._profiler = self._sampler = None
+        if profiler is None and sampler is None:
+            return self.path
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        stamp = time.strftime("%Y%m%dT%H%M%S")
+        self.path = self.directory / (
+            f"{self.label}-{stamp}-{os.getpid()}-{next(_sequence)}{EXTENSIONS[self.mode]}"
+        )
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(str(self.path))
+        else:
+            sampler.stop()
+            sampler.write(self.path)
+
+        prune(self.directory, self.keep)
+        logger.info("📈 Profile written: %s", self.path)
+        return self.path
+
+
+@contextmanager
+def profiled(label: str, mode: Optional[str] = "cprofile", all_threads: bool = False) -> Iterator[ProfileSession]:
+    """Profile the with-block (mode=None = no-op); the file is written even on exceptions."""
+    session = ProfileSession(label, mode or "cprofile", all_threads=all_threads)
+    started = mode is not None and session.start()
+    try:
+        yield session
+    finally:
+        if started:
+            session.stop()
+
+
+def profile_files(directory: Path) -> List[Path]:
+    """Profile files in directory, oldest first."""
+    if not directory.is_dir():
+        return []
+    files = []
+    for path in directory.iterdir():
+        if PROFILE_FILE.match(path.name):
+            try:
+                files.append((path.stat().st_mtime, path))
+            except FileNotFoundError:  # pruned by another worker meanwhile
+                continue
+    return [path for _, path in sorted(files)]
+
+
+def prune(directory: Path, keep: int) -> int:
+    """Delete all but the newest `keep` profile files; returns how many were removed."""
+    stale = profile_files(directory)[:-keep] if keep > 0 else profile_files(directory)
+    for path in stale:
+        path.unlink(missing_ok=True)
+    return len(stale)
+
+
+# ============================================================================
+# Summaries (CLI)
+# ============================================================================
+
+def group_by_label(files: Iterable[Path]) -> Dict[str, Dict[str, List[Path]]]:
+    """{label: {"pstats": [...], "collapsed": [...]}}"""
+    groups: Dict[str, Dict[str, List[Path]]] = defaultdict(lambda: defaultdict(list))
+    for path in files:
+        match = PROFILE_FILE.match(path.name)
+        groups[match.group("label")][match.group("ext")].append(path)
+    return groups
+
+
+def summarize_pstats(files: List[Path], top: int) -> str:
+    """Top `top` functions by cumulative time, merged over all files."""
+    stream = io.StringIO()
+    stats = pstats.Stats(*(str(path) for path in files), stream=stream)
+    stats.strip_dirs().sort_stats("cumulative").print_stats(top)
+    return stream.getvalue().strip()
+
+
+def summarize_collapsed(files: List[Path], top: int) -> str:
+    """Top `top` functions by inclusive samples (on the stack), merged over all files."""
+    inclusive: Counter = Counter()
+    total = 0
+    for path in files:
+        for line in path.read_text(encoding="utf-8").splitlines():
+            stack, _, count = line.rpartition(" ")
+            if not stack:
+                continue
+            samples = int(count)
+            total += samples
+            for name in set(stack.split(";")):
+                inclusive[name] += samples
+
+    lines = [f"{total} stack samples (one per thread per tick)", f"{'samples':>9} {'%':>6}  function"]
+    for name, samples in inclusive.most_common(top):
+        lines.append(f"{samples:>9} {100 * samples / total:>5.1f}%  {name}")
+    return "\n".join(lines)
+
+
+def summarize(directory: Path = PROFILE_DIR, top: int = 15, label: Optional[str] = None) -> str:
+    groups = group_by_label(profile_files(directory))
+    if label is not None:
+        groups = {name: files for name, files in groups.items() if name == safe_label(label)}
+    if not groups:
+        return f"No profiles in {directory}"
+
+    sections = []
+    for name in sorted(groups):
+        for ext, summarizer in (("pstats", summarize_pstats), ("collapsed", summarize_collapsed)):
+            files = groups[name].get(ext)
+            if files:
+                sections.append(
+                    f"=== {name} ({len(files)} {ext} file{'s' if len(files) > 1 else ''}) ===\n"
+                    + summarizer(files, top)
+                )
+    return "\n\n".join(sections)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    parser = argparse.ArgumentParser(description="Summarize saved profiles per endpoint / entry point")
+    parser.add_argument("--dir", type=Path, default=PROFILE_DIR, help="Profile directory (HN_PROFILE_DIR)")
+    parser.add_argument("--top", type=int, default=15, help="Functions per label")
+    parser.add_argument("--label", help="Only this label, e.g. api_dashboard or /api/dashboard")
+    args = parser.parse_args()
+
+    logger.info(summarize(args.dir, args.top, args.label))
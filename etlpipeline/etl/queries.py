@@ -2,43 +2,50 @@
 Day 17: HN Dashboard SQL Queries. 
 
 Purpose: Clean, readable queries for week_3/etl/serve_hn.py
-Inputs: hn_posts.db (Day 15 ETL output)
+Inputs: hn_posts.db (Day 15 ETL output): hn_posts + the user_daily /
+        daily_totals rollups the ETL maintains on every load
 Outputs: JSON-ready DataFrames for 4 API enpoints
+
+Window, limit and threshold values are bound parameters (:days, :limit,
+...), declared with types and defaults in the QUERIES registry below; the
+defaults reproduce the fixed views the names describe (last 7 days, ...).
+Every LIMITed query orders by a unique key last, so the rows returned do
+not depend on the engine's plan (ties would otherwise pick arbitrary rows).
+DUCKDB_CATALOG holds the same queries in DuckDB's dialect (engines.py).
+A DB the ETL has not migrated yet (no rollup tables) is served by each
+query's hn_posts fallback instead (hn_posts_fallback).
 """
+
+import re
+import sqlite3
+from typing import List, Optional
+
+from query_registry import QueryParam, QueryRegistry
 # ============================================================================
 # 1. DAILY LEADERS (enhanced readability)
 # ============================================================================
 
 DAILY_LEADERS = """
--- Top user per day by comment volume 
+-- Top user per day by comment volume (user_daily rollup: one row per day x user)
 
-WITH daily_totals AS (
-    SELECT
-        DATE(created_at) as event_date, 
-        user, 
-        COUNT(*) as total_comments
-    FROM hn_posts
-    WHERE user IS NOT NULL 
-    GROUP BY event_date, user
-    ), 
-daily_max AS (
+WITH daily_max AS (
     SELECT 
         event_date, 
-        MAX(total_comments) as max_comments_per_day
-    FROM daily_totals
+        MAX(posts) as max_comments_per_day
+    FROM user_daily
     GROUP BY event_date
 )
 SELECT 
     'DAILY_LEADER' as metric_type,
-    daily_totals.event_date,
-    daily_totals.user, 
-    daily_totals.total_comments
-FROM daily_totals
-JOIN daily_max ON daily_totals.event_date = daily_max.event_date
-    AND daily_totals.total_comments = daily_max.max_comments_per_day
+    user_daily.event_date,
+    user_daily.user, 
+    user_daily.posts as total_comments
+FROM user_daily
+JOIN daily_max ON user_daily.event_date = daily_max.event_date
+    AND user_daily.posts = daily_max.max_comments_per_day
 
-ORDER BY daily_totals.event_date DESC 
-LIMIT 20
+ORDER BY user_daily.event_date DESC, user_daily.user
+LIMIT :limit
 """
 
 # ============================================================================
@@ -46,20 +53,20 @@ LIMIT 20
 # ============================================================================
 
 TOP_USERS_LAST_7D = """
--- Most active users by comments and engagement (past week)
+-- Most active users by comments and engagement (past `days` days, user_daily rollup)
 SELECT 
     user, 
-    COUNT(*) as total_comments, 
-    ROUND(AVG(score), 2) as average_score,
-    COUNT(DISTINCT DATE(created_at)) as active_days
+    SUM(posts) as total_comments, 
+    ROUND(SUM(total_score) / SUM(posts), 2) as average_score,
+    COUNT(*) as active_days
 
-FROM hn_posts
-WHERE created_at >= date('now', '-7 days')
-    AND user IS NOT NULL
+FROM user_daily
+WHERE event_date >= date('now', '-' || :days || ' days')
 GROUP BY user 
-HAVING total_comments >= 2
-ORDER BY total_comments DESC, average_score DESC
-LIMIT 10
+-- SUM(posts), not the alias: user_daily has its own total_comments column
+HAVING SUM(posts) >= :min_comments
+ORDER BY SUM(posts) DESC, average_score DESC, user
+LIMIT :limit
 """
 
 # ============================================================================
@@ -75,20 +82,20 @@ WITH title_frequencies AS (
         COUNT(DISTINCT id) as unique_discussions
     
     FROM hn_posts 
-    WHERE created_at >= date('now', '-7 days')
+    WHERE created_at >= date('now', '-' || :days || ' days')
         AND title IS NOT NULL
         AND LENGTH(title > 15)
         AND title NOT LIKE '%hacker news%'
     GROUP BY LOWER(title)
-    HAVING mention_count >=2
+    HAVING mention_count >= :min_mentions
 )
 SELECT 
     normalized_title, 
     mention_count, 
     unique_discussions
 FROM title_frequencies
-ORDER BY mention_count DESC, unique_discussions DESC
-LIMIT 8
+ORDER BY mention_count DESC, unique_discussions DESC, normalized_title
+LIMIT :limit
 """
 
 # ============================================================================
@@ -96,18 +103,22 @@ LIMIT 8
 # ============================================================================
 
 ACTIVITY_LAST_24H = """
--- Pipeline health metrics for last 24 hours
+-- Pipeline health metrics for the last `days` day(s) (daily_totals rollup)
 SELECT 
-    COUNT(*) as total_issues,
-    COUNT(DISTINCT user) as distinct_users, 
-    ROUND(AVG(comments), 1) as average_comments, 
-    ROUND(AVG(score), 2) as average_score,
-    MIN(created_at) as earliest_activity, 
-    MAX(created_at) as latest_activity, 
-    COUNT(DISTINCT DATE(created_at)) as active_days
-
-FROM hn_posts 
-WHERE created_at >= date('now', '-1 day')
+    COALESCE(SUM(posts), 0) as total_issues,
+    (
+        SELECT COUNT(DISTINCT user) 
+        FROM user_daily 
+        WHERE event_date >= date('now', '-' || :days || ' days')
+    ) as distinct_users, 
+    ROUND(SUM(total_comments) * 1.0 / SUM(posts), 1) as average_comments, 
+    ROUND(SUM(total_score) / SUM(posts), 2) as average_score,
+    MIN(first_created_at) as earliest_activity, 
+    MAX(last_created_at) as latest_activity, 
+    COUNT(*) as active_days
+
+FROM daily_totals 
+WHERE event_date >= date('now', '-' || :days || ' days')
 """
 
 # ============================================================================
@@ -118,10 +129,10 @@ WEEK_OVER_WEEK_GROWTH = """
 -- Week-over-week activity growth trends
 WITH weekly_totals AS (
     SELECT 
-        strftime('%Y-W%W', created_at) as week_number, 
-        COUNT(*) as total_issues, 
-        AVG(comments) as average_comments
-    FROM hn_posts
+        strftime('%Y-W%W', event_date) as week_number, 
+        SUM(posts) as total_issues, 
+        SUM(total_comments) * 1.0 / SUM(posts) as average_comments
+    FROM daily_totals
     GROUP BY week_number
 )
 
@@ -131,10 +142,203 @@ SELECT
     average_comments, 
     LAG(total_issues) OVER (ORDER BY week_number) as previous_week_issues, 
     ROUND(
-        (total_issues - LAG(total_issues) OVER (ORER BY week_number)) * 100.0
+        (total_issues - LAG(total_issues) OVER (ORDER BY week_number)) * 100.0
         / NULLIF(LAG(total_issues) OVER (ORDER BY week_number), 0), 1
     ) as week_over_week_growth_percentage
 FROM weekly_totals
 ORDER BY week_number DESC 
-LIMIT 8
-"""
\ No newline at end of file
+LIMIT :limit
+"""
+
+# ============================================================================
+# DUCKDB DIALECT - same results on engines.DuckDBSnapshot (parity-checked)
+# ============================================================================
+# Differences from SQLite, kept explicit rather than translated:
+#   - "user" is quoted (bare `user` is CURRENT_USER in DuckDB)
+#   - parameters are $name instead of :name
+#   - date('now', '-N days') -> strftime(UTC today - N, '%Y-%m-%d'); dates
+#     and timestamps stay TEXT in the snapshot, so comparisons are textual
+#   - `* 1.0 /` -> `::DOUBLE /` (1.0 is a DECIMAL literal in DuckDB)
+#   - SQLite LIKE is case-insensitive -> ILIKE
+#   - LENGTH(title > 15) is always 1 in SQLite, so it is dropped
+
+# Only the parameter marker differs
+DUCKDB_DAILY_LEADERS = DAILY_LEADERS.replace("LIMIT :limit", "LIMIT $limit")
+
+DUCKDB_TOP_USERS_LAST_7D = """
+SELECT
+    "user",
+    SUM(posts) as total_comments,
+    ROUND(SUM(total_score) / SUM(posts), 2) as average_score,
+    COUNT(*) as active_days
+FROM user_daily
+WHERE event_date >= strftime(CAST(now() AT TIME ZONE 'UTC' AS DATE) - CAST($days AS INTEGER), '%Y-%m-%d')
+GROUP BY "user"
+HAVING SUM(posts) >= $min_comments
+ORDER BY SUM(posts) DESC, average_score DESC, "user"
+LIMIT $limit
+"""
+
+DUCKDB_TRENDING_TITLES_LAST_7D = """
+WITH title_frequencies AS (
+    SELECT
+        LOWER(title) as normalized_title,
+        COUNT(*) as mention_count,
+        COUNT(DISTINCT id) as unique_discussions
+    FROM hn_posts
+    WHERE created_at >= strftime(CAST(now() AT TIME ZONE 'UTC' AS DATE) - CAST($days AS INTEGER), '%Y-%m-%d')
+        AND title IS NOT NULL
+        AND title NOT ILIKE '%hacker news%'
+    GROUP BY LOWER(title)
+    HAVING COUNT(*) >= $min_mentions
+)
+SELECT
+    normalized_title,
+    mention_count,
+    unique_discussions
+FROM title_frequencies
+ORDER BY mention_count DESC, unique_discussions DESC, normalized_title
+LIMIT $limit
+"""
+
+DUCKDB_ACTIVITY_LAST_24H = """
+SELECT
+    COALESCE(SUM(posts), 0) as total_issues,
+    (
+        SELECT COUNT(DISTINCT "user")
+        FROM user_daily
+        WHERE event_date >= strftime(CAST(now() AT TIME ZONE 'UTC' AS DATE) - CAST($days AS INTEGER), '%Y-%m-%d')
+    ) as distinct_users,
+    ROUND(SUM(total_comments)::DOUBLE / SUM(posts), 1) as average_comments,
+    ROUND(SUM(total_score) / SUM(posts), 2) as average_score,
+    MIN(first_created_at) as earliest_activity,
+    MAX(last_created_at) as latest_activity,
+    COUNT(*) as active_days
+FROM daily_totals
+WHERE event_date >= strftime(CAST(now() AT TIME ZONE 'UTC' AS DATE) - CAST($days AS INTEGER), '%Y-%m-%d')
+"""
+
+DUCKDB_WEEK_OVER_WEEK_GROWTH = """
+WITH weekly_totals AS (
+    SELECT
+        strftime(CAST(event_date AS DATE), '%Y-W%W') as week_number,
+        SUM(posts) as total_issues,
+        SUM(total_comments)::DOUBLE / SUM(posts) as average_comments
+    FROM daily_totals
+    GROUP BY week_number
+)
+SELECT
+    week_number,
+    total_issues,
+    average_comments,
+    LAG(total_issues) OVER (ORDER BY week_number) as previous_week_issues,
+    ROUND(
+        (total_issues - LAG(total_issues) OVER (ORDER BY week_number))::DOUBLE * 100
+        / NULLIF(LAG(total_issues) OVER (ORDER BY week_number), 0), 1
+    ) as week_over_week_growth_percentage
+FROM weekly_totals
+ORDER BY week_number DESC
+LIMIT $limit
+"""
+
+# ============================================================================
+# HN_POSTS FALLBACK - the same queries on a DB without the rollup tables
+# ============================================================================
+# etl_hn_github.connect_for_load creates and backfills the rollups on its
+# next load; until then (e.g. a DB from before the rollups) CTEs named
+# like the missing tables regroup hn_posts exactly as the ETL's
+# ROLLUP_USER_DAILY / ROLLUP_DAILY_TOTALS do, so results match a
+# migrated DB while the rest of the query text stays as it is.
+
+ROLLUP_TABLES = ("user_daily", "daily_totals")
+
+ROLLUP_CTES = {
+    "user_daily": """user_daily AS (
+    SELECT
+        DATE(created_at) as event_date,
+        user,
+        COUNT(*) as posts,
+        COALESCE(SUM(comments), 0) as total_comments,
+        COALESCE(SUM(score), 0) as total_score
+    FROM hn_posts
+    WHERE user IS NOT NULL
+        AND DATE(created_at) IS NOT NULL
+    GROUP BY DATE(created_at), user
+)""",
+    "daily_totals": """daily_totals AS (
+    SELECT
+        DATE(created_at) as event_date,
+        COUNT(*) as posts,
+        COALESCE(SUM(comments), 0) as total_comments,
+        COALESCE(SUM(score), 0) as total_score,
+        COUNT(DISTINCT user) as active_users,
+        MIN(created_at) as first_created_at,
+        MAX(created_at) as last_created_at
+    FROM hn_posts
+    WHERE DATE(created_at) IS NOT NULL
+    GROUP BY DATE(created_at)
+)""",
+}
+
+# Leading "-- comment" lines, then the query's own WITH (if any)
+QUERY_START = re.compile(r"^(\s*(?:--[^\n]*\n\s*)*)(WITH\s+)?", re.IGNORECASE)
+
+
+def hn_posts_fallback(sql_query: str) -> Optional[str]:
+    """`sql_query` with the rollup tables it reads defined as CTEs over hn_posts (None if it reads none)."""
+    ctes = ",\n".join(
+        cte for table, cte in ROLLUP_CTES.items() if re.search(rf"\b{table}\b", sql_query)
+    )
+    if not ctes:
+        return None
+    return QUERY_START.sub(
+        lambda match: f"{match.group(1)}WITH {ctes}{',' if match.group(2) else ''}\n",
+        sql_query, count=1,
+    )
+
+
+def missing_rollups(connection: sqlite3.Connection) -> List[str]:
+    """ROLLUP_TABLES the DB does not have yet (empty once the ETL has migrated it)."""
+    tables = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    return [table for table in ROLLUP_TABLES if table not in tables]
+
+
+# ============================================================================
+# QUERY REGISTRY - every dashboard query, its parameters and dialect variants
+# ============================================================================
+# serve_hn.py binds request arguments (?days=30&limit=20) through these
+# declarations; explain_queries.py and engines.py use the defaults.
+
+
+def window_days(default: int) -> QueryParam:
+    return QueryParam("days", int, default, 1, 365)
+
+
+def row_limit(default: int, maximum: int = 100) -> QueryParam:
+    return QueryParam("limit", int, default, 1, maximum)
+
+
+QUERIES = QueryRegistry()
+QUERIES.register("DAILY_LEADERS", DAILY_LEADERS,
+                 row_limit(20, maximum=500),
+                 duckdb_sql=DUCKDB_DAILY_LEADERS,
+                 fallback_sql=hn_posts_fallback(DAILY_LEADERS))
+QUERIES.register("TOP_USERS_LAST_7D", TOP_USERS_LAST_7D,
+                 window_days(7), row_limit(10), QueryParam("min_comments", int, 2, 1, 10_000),
+                 duckdb_sql=DUCKDB_TOP_USERS_LAST_7D,
+                 fallback_sql=hn_posts_fallback(TOP_USERS_LAST_7D))
+QUERIES.register("TRENDING_TITLES_LAST_7D", TRENDING_TITLES_LAST_7D,
+                 window_days(7), row_limit(8), QueryParam("min_mentions", int, 2, 1, 10_000),
+                 duckdb_sql=DUCKDB_TRENDING_TITLES_LAST_7D)
+QUERIES.register("ACTIVITY_LAST_24H", ACTIVITY_LAST_24H,
+                 window_days(1),
+                 duckdb_sql=DUCKDB_ACTIVITY_LAST_24H,
+                 fallback_sql=hn_posts_fallback(ACTIVITY_LAST_24H))
+QUERIES.register("WEEK_OVER_WEEK_GROWTH", WEEK_OVER_WEEK_GROWTH,
+                 row_limit(8, maximum=104),
+                 duckdb_sql=DUCKDB_WEEK_OVER_WEEK_GROWTH,
+                 fallback_sql=hn_posts_fallback(WEEK_OVER_WEEK_GROWTH))
+
+# Name -> SQL views of the registry
+QUERY_CATALOG = {query.name: query.sql for query in QUERIES}
+DUCKDB_CATALOG = {query.name: query.duckdb_sql for query in QUERIES if query.duckdb_sql is not None}
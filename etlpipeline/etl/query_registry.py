@@ -0,0 +1,161 @@
+"""
+Parameterized query registry for queries.py / serve_hn.py
+
+Purpose: Every dashboard query declares its parameters (time window, row
+         limit, minimum counts) with a type, default and bounds. Requests
+         bind values instead of formatting them into the SQL, so each query
+         has exactly one statement text: sqlite3's per-connection statement
+         cache keeps it prepared for every parameter combination, and the
+         normalized value tuple is a stable response-cache key.
+Inputs: SQL with named parameters (:name for SQLite, $name for DuckDB),
+        optionally a SQLite fallback for DBs without the rollup tables
+Outputs: Normalized parameter tuples, bind dicts, EXPLAIN validation
+Raises: ValueError (invalid parameter value, SQL/declaration mismatch)
+Usage:
+    registry = QueryRegistry()
+    registry.register("TOP_USERS", "SELECT ... WHERE event_date >= date('now', '-' || :days || ' days') LIMIT :limit",
+                      QueryParam("days", int, 7, 1, 365), QueryParam("limit", int, 10, 1, 100))
+    query = registry["TOP_USERS"]
+    values = query.parse({"days": "30"})                 # (30, 10)
+    connection.execute(query.sql, query.bind(values))
+"""
+
+import re
+import sqlite3
+from typing import Any, Callable, Dict, Iterator, List, Mapping, NamedTuple, Optional, Tuple
+
+SQLITE_PARAMETER = re.compile(r"(?<![:\w]):(\w+)")
+DUCKDB_PARAMETER = re.compile(r"\$(\w+)")
+
+
+class QueryParam(NamedTuple):
+    """One typed query parameter; values outside [minimum, maximum] are rejected."""
+
+    name: str
+    type: Callable[[str], Any]
+    default: Any
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+
+    def parse(self, raw: Optional[str]) -> Any:
+        """Query-string value -> typed value (None or "" -> default).
+
+        Raises:
+            ValueError: Not convertible, or out of bounds
+        """
+        if raw is None or raw == "":
+            return self.default
+        try:
+            value = self.type(raw)
+        except (TypeError, ValueError):
+            raise ValueError(f"{self.name} must be {self.type.__name__}, got {raw!r}") from None
+        if (self.minimum is not None and value < self.minimum) or (
+                self.maximum is not None and value > self.maximum):
+            raise ValueError(f"{self.name} must be between {self.minimum} and {self.maximum}, got {value}")
+        return value
+
+    def describe(self) -> Dict[str, Any]:
+        return {"type": self.type.__name__, "default": self.default,
+                "min": self.minimum, "max": self.maximum}
+
+
+class RegisteredQuery:
+    """
+    A named query: SQLite SQL, optional DuckDB variant, declared parameters.
+
+    fallback_sql is the same query on hn_posts alone, served while a DB
+    has not been migrated to the rollup tables `sql` reads.
+    """
+
+    def __init__(self, name: str, sql: str, params: Tuple[QueryParam, ...] = (),
+                 duckdb_sql: Optional[str] = None, fallback_sql: Optional[str] = None) -> None:
+        self.name = name
+        self.sql = sql
+        self.params = params
+        self.duckdb_sql = duckdb_sql
+        self.fallback_sql = fallback_sql
+        self.defaults: Tuple[Any, ...] = tuple(param.default for param in params)
+
+        declared = {param.name for param in params}
+        for dialect, text, pattern in (("SQLite", sql, SQLITE_PARAMETER),
+                                       ("SQLite fallback", fallback_sql, SQLITE_PARAMETER),
+                                       ("DuckDB", duckdb_sql, DUCKDB_PARAMETER)):
+            used = set(pattern.findall(text)) if text is not None else declared
+            if used != declared:
+                raise ValueError(f"{name}: {dialect} SQL uses {sorted(used)}, declared {sorted(declared)}")
+
+    def parse(self, args: Mapping[str, str]) -> Tuple[Any, ...]:
+        """
+        Request arguments -> values in declaration order, defaults filled in.
+
+        Equal views normalize to equal tuples (`?days=07` and `?days=7`;
+        no argument and the default), which is what the cache key needs.
+        Arguments that are not parameters of this query are ignored.
+
+        Raises:
+            ValueError: Invalid value for a declared parameter
+        """
+        return tuple(param.parse(args.get(param.name)) for param in self.params)
+
+    def sql_for(self, fallback: bool = False) -> str:
+        """SQLite SQL to run: the fallback (when there is one) on an unmigrated DB."""
+        return self.fallback_sql if fallback and self.fallback_sql is not None else self.sql
+
+    def bind(self, values: Tuple[Any, ...]) -> Dict[str, Any]:
+        """Named bindings for sqlite3 / duckdb execute()."""
+        return {param.name: value for param, value in zip(self.params, values)}
+
+    def describe(self) -> Dict[str, Any]:
+        return {param.name: param.describe() for param in self.params}
+
+
+class QueryRegistry:
+    """Queries by name, in registration order."""
+
+    def __init__(self) -> None:
+        self._queries: Dict[str, RegisteredQuery] = {}
+
+    def register(self, name: str, sql: str, *params: QueryParam,
+                 duckdb_sql: Optional[str] = None, fallback_sql: Optional[str] = None) -> RegisteredQuery:
+        """
+        Raises:
+            ValueError: Duplicate name, or the SQL's named parameters differ
+                from the declared ones
+        """
+        if name in self._queries:
+            raise ValueError(f"Query {name} already registered")
+        query = RegisteredQuery(name, sql, params, duckdb_sql, fallback_sql)
+        self._queries[name] = query
+        return query
+
+    def __getitem__(self, name: str) -> RegisteredQuery:
+        return self._queries[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._queries
+
+    def __iter__(self) -> Iterator[RegisteredQuery]:
+        return iter(self._queries.values())
+
+    def __len__(self) -> int:
+        return len(self._queries)
+
+    def names(self) -> List[str]:
+        return list(self._queries)
+
+    def validate(self, connection: sqlite3.Connection, fallback: bool = False) -> Dict[str, str]:
+        """
+        Compile every query (EXPLAIN, default values bound) without running it;
+        fallback=True compiles the SQL served on an unmigrated DB (sql_for).
+
+        Returns:
+            {query name: error} for queries SQLite rejects (unknown table or
+            column, syntax error); empty when all compile.
+        """
+        failures = {}
+        for query in self:
+            try:
+                connection.execute(f"EXPLAIN {query.sql_for(fallback)}", query.bind(query.defaults)).fetchall()
+            except sqlite3.Error as error:
+                failures[query.name] = str(error)
+        return failures
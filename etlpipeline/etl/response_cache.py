@@ -0,0 +1,94 @@
+"""
+Dashboard response cache for serve_hn.py
+
+Purpose: Serve repeated dashboard polls from memory until the ETL
+         changes hn_posts.db (or a query's TTL runs out).
+Inputs: Query name + data version (database fingerprint)
+Outputs: Cached payloads, hit/miss counters for /health
+Usage:
+    cache = ResponseCache(max_entries=64)
+    payload = cache.get(("TOP_USERS_LAST_7D", version))
+    if payload is None:
+        payload = run_query()
+        cache.put(("TOP_USERS_LAST_7D", version), payload, ttl_seconds=60)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU cache with optional per-entry TTL.
+
+    Keys should embed the data version, so an ETL load naturally turns
+    every old entry into a miss; stale versions age out through LRU
+    eviction. A TTL of None keeps an entry until it is evicted, which is
+    right for queries that depend only on table contents. Queries relative
+    to `date('now', ...)` need a TTL so the window keeps moving.
+    """
+
+    def __init__(self, max_entries: int = 64) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None on a miss/expiry."""
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and now >= expires_at:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """Store value under key, evicting the least recently used entry."""
+        expires_at = None if ttl_seconds is None else time.monotonic() + ttl_seconds
+
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for the /health endpoint."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+            }
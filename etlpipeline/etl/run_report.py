@@ -0,0 +1,291 @@
+"""
+ETL run instrumentation for etl_hn_github.py
+
+Purpose: Per-stage timing and throughput for one ETL run: extract (every
+         HTTP attempt's latency, bytes and rate-limit headroom), transform
+         and load (rows/sec, SQLite commit time), plus peak RSS. The run is
+         written as a JSON report and kept as a short history in
+         hn_posts_runs.db (etl_runs, next to hn_posts.db), which
+         serve_hn's /health reads for data freshness.
+Inputs: Hooks called by run_etl / stream_etl / GitHubSearchClient(observer=)
+Outputs: JSON run report, etl_runs rows
+Usage:
+    recorder = RunRecorder(mode="batch", incremental=True)
+    client = default_client(observer=recorder.observe_request)
+    with recorder.stage("transform") as stage:
+        df = transform(df_raw)
+        stage.rows += len(df)
+    recorder.finish("ok", rows_loaded=len(df))
+    recorder.write_json(Path("data/etl_last_run.json"))
+"""
+
+import json
+import logging
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TypeVar, Union
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+from github_client import RequestStats
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Rows kept in etl_runs; older runs are pruned on every insert
+RUN_HISTORY = 100
+
+CREATE_ETL_RUNS = """
+CREATE TABLE IF NOT EXISTS etl_runs (
+    run_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    status TEXT NOT NULL,
+    mode TEXT,
+    rows_loaded INTEGER,
+    duration_seconds REAL,
+    extract_seconds REAL,
+    transform_seconds REAL,
+    load_seconds REAL,
+    commit_seconds REAL,
+    peak_rss_mb REAL,
+    report TEXT
+)
+"""
+
+INSERT_ETL_RUN = """
+INSERT INTO etl_runs (
+    started_at, finished_at, status, mode, rows_loaded, duration_seconds,
+    extract_seconds, transform_seconds, load_seconds, commit_seconds,
+    peak_rss_mb, report
+)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def runs_db_path(db_path: Union[str, Path]) -> Path:
+    """
+    The run history DB next to the served one (hn_posts.db -> hn_posts_runs.db).
+
+    Kept out of the served DB so a run that loads nothing leaves its file
+    fingerprint alone: serve_hn keys its response, query-check and DuckDB
+    snapshot caches on that fingerprint.
+    """
+    path = Path(db_path)
+    return path.with_name(f"{path.stem}_runs{path.suffix}")
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Process high-water RSS so far (MB), or None where `resource` is missing."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return round(peak / (2 ** 20 if sys.platform == "darwin" else 2 ** 10), 1)
+
+
+class StageStats:
+    """Accumulated time/rows of one stage (stream mode enters a stage once per chunk)."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.seconds = 0.0
+        self.rows = 0
+        self.calls = 0
+        self.commit_seconds = 0.0
+        self.commits = 0
+        self.peak_rss_mb: Optional[float] = None
+
+    def as_dict(self) -> Dict[str, Any]:
+        stats = {
+            "seconds": round(self.seconds, 4),
+            "rows": self.rows,
+            "rows_per_sec": round(self.rows / self.seconds, 1) if self.seconds else None,
+            "calls": self.calls,
+            "peak_rss_mb": self.peak_rss_mb,
+        }
+        if self.commits:
+            stats["commit_seconds"] = round(self.commit_seconds, 4)
+            stats["commits"] = self.commits
+        return stats
+
+
+class RunRecorder:
+    """
+    Collects one run's stage timings and HTTP attempts (thread-safe for the
+    extract workers), then renders/stores the run report.
+
+    peak_rss_mb per stage is the process high-water mark when the stage
+    last finished, so a stage that raises it is the one where it jumps.
+    """
+
+    def __init__(self, mode: str = "batch", incremental: bool = True) -> None:
+        self.mode = mode
+        self.incremental = incremental
+        self.started_at = utc_now()
+        self.finished_at: Optional[str] = None
+        self.status = "running"
+        self.error: Optional[str] = None
+        self.rows_loaded = 0
+        self.stages: Dict[str, StageStats] = {
+            name: StageStats(name) for name in ("extract", "transform", "load")
+        }
+        self.requests: List[RequestStats] = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._duration: Optional[float] = None
+
+    # ------------------------------------------------------------------ hooks
+
+    def observe_request(self, stats: RequestStats) -> None:
+        """GitHubSearchClient observer: one entry per HTTP attempt."""
+        with self._lock:
+            self.requests.append(stats)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[StageStats]:
+        """Time a block into stage `name`; callers add to `.rows`."""
+        stage = self.stages.setdefault(name, StageStats(name))
+        started = time.perf_counter()
+        try:
+            yield stage
+        finally:
+            stage.seconds += time.perf_counter() - started
+            stage.calls += 1
+            stage.peak_rss_mb = peak_rss_mb()
+
+    def timed_pages(self, pages: Iterable[List[T]]) -> Iterator[List[T]]:
+        """Charge the wait for each page (fetch + backpressure) to extract."""
+        iterator = iter(pages)
+        while True:
+            with self.stage("extract") as stage:
+                page = next(iterator, None)
+                if page is not None:
+                    stage.rows += len(page)
+            if page is None:
+                return
+            yield page
+
+    def commit(self, conn: sqlite3.Connection) -> None:
+        """COMMIT, timed into the load stage's commit_seconds."""
+        started = time.perf_counter()
+        conn.execute("COMMIT")
+        load = self.stages["load"]
+        load.commit_seconds += time.perf_counter() - started
+        load.commits += 1
+
+    def finish(self, status: str, rows_loaded: int = 0, error: Optional[BaseException] = None) -> None:
+        self.status = status
+        self.rows_loaded = rows_loaded
+        self.error = f"{type(error).__name__}: {error}" if error is not None else None
+        self.finished_at = utc_now()
+        self._duration = time.perf_counter() - self._started
+
+    # ----------------------------------------------------------------- report
+
+    def extract_summary(self) -> Dict[str, Any]:
+        with self._lock:
+            requests = list(self.requests)
+
+        latencies_ms = sorted(request.seconds * 1000 for request in requests)
+        headroom = [r.rate_remaining for r in requests if r.rate_remaining is not None]
+        summary: Dict[str, Any] = {
+            "requests": len(requests),
+            "bytes": sum(request.bytes for request in requests),
+            "not_modified": sum(1 for request in requests if request.status == 304),
+            "retries": sum(1 for request in requests if request.attempt > 0),
+            "errors": sum(1 for request in requests if request.status == 0 or request.status >= 400),
+            "min_rate_remaining": min(headroom) if headroom else None,
+        }
+        if latencies_ms:
+            summary.update({
+                "http_p50_ms": round(statistics.median(latencies_ms), 2),
+                "http_p95_ms": round(latencies_ms[int(0.95 * (len(latencies_ms) - 1))], 2),
+                "http_max_ms": round(latencies_ms[-1], 2),
+            })
+        return summary
+
+    def report(self) -> Dict[str, Any]:
+        """The JSON run report (also stored in etl_runs.report)."""
+        duration = self._duration if self._duration is not None else time.perf_counter() - self._started
+        stages = {name: stage.as_dict() for name, stage in self.stages.items()}
+        stages["extract"].update(self.extract_summary())
+
+        with self._lock:
+            requests = [
+                {
+                    "page": r.page,
+                    "status": r.status,
+                    "ms": round(r.seconds * 1000, 2),
+                    "bytes": r.bytes,
+                    "rate_remaining": r.rate_remaining,
+                    "rate_limit": r.rate_limit,
+                    "attempt": r.attempt,
+                }
+                for r in self.requests
+            ]
+
+        return {
+            "status": self.status,
+            "error": self.error,
+            "mode": self.mode,
+            "incremental": self.incremental,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(duration, 3),
+            "rows_loaded": self.rows_loaded,
+            "rows_per_sec": round(self.rows_loaded / duration, 1) if duration else None,
+            "peak_rss_mb": peak_rss_mb(),
+            "stages": stages,
+            "requests": requests,
+        }
+
+    def write_json(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2), encoding="utf-8")
+        logger.info(f"Run report -> {path}")
+
+    def save(self, conn: sqlite3.Connection) -> None:
+        """Append this run to etl_runs and prune to RUN_HISTORY rows (own transaction)."""
+        report = self.report()
+        stages = report["stages"]
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(CREATE_ETL_RUNS)
+            conn.execute(INSERT_ETL_RUN, (
+                report["started_at"],
+                report["finished_at"],
+                report["status"],
+                report["mode"],
+                report["rows_loaded"],
+                report["duration_seconds"],
+                stages["extract"]["seconds"],
+                stages["transform"]["seconds"],
+                stages["load"]["seconds"],
+                stages["load"].get("commit_seconds", 0.0),
+                report["peak_rss_mb"],
+                json.dumps(report),
+            ))
+            conn.execute(
+                "DELETE FROM etl_runs WHERE run_id <= "
+                "(SELECT MAX(run_id) FROM etl_runs) - ?",
+                (RUN_HISTORY,)
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            conn.execute("ROLLBACK")
+            raise
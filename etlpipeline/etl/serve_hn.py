@@ -10,23 +10,34 @@ Inputs: ../data/hn_posts.db (existing data!) + queries.py
 Outputs: JSON endpoints -> LIVE dashboard KPIs
 Usage:
     cd week_3/etl
-    python serve_hn.py
+    python serve_hn.py                         # development server
+    cd .. && gunicorn -c etl/gunicorn.conf.py  # production (create_app())
     curl http://127.0.0.1:5000/api/dashboard
 """
 
-from flask import Flask, jsonify
+from flask import Blueprint, Flask, Response, g, jsonify, request
 import sqlite3
-import pandas as pd 
+import os
+import json
 import logging 
+import time
 from pathlib import Path 
-from typing import Dict, Any, Tuple
-
-from queries import (
-    DAILY_LEADERS, 
-    TOP_USERS_LAST_7D, 
-    TRENDING_TITLES_LAST_7D,
-    ACTIVITY_LAST_24H
-)
+from datetime import datetime, timezone
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+
+try:
+    import orjson  # Optional: ~5x faster serialisation when installed
+except ImportError:
+    orjson = None
+
+from db_pool import FingerprintCache, ReadOnlyConnectionPool
+from engines import DuckDBSnapshot, duckdb_module, engine_for, fetch_sqlite, tables_read
+from metrics import MetricsRegistry
+from profiling import ProfileSession, parse_mode
+from response_cache import ResponseCache
+from run_report import runs_db_path
+from queries import QUERIES, missing_rollups
+from query_registry import RegisteredQuery
 
 # ============================================================================
 # Production Logging & Config
@@ -39,38 +50,156 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
+# Routes and request hooks; create_app() registers them on an app
+api = Blueprint("api", __name__)
 BASE_DIR = Path(__file__).parent
 DATABASE_NAME = "hn_posts"
-DB_PATH = BASE_DIR.parent / 'data' / f'{DATABASE_NAME}.db'
+DB_PATH = Path(
+    os.environ.get("HN_DB_PATH", BASE_DIR.parent / 'data' / f'{DATABASE_NAME}.db')
+)
+
+# Pool sizing: roughly one connection per concurrent request thread
+DB_POOL_SIZE = int(os.environ.get("HN_DB_POOL_SIZE", "4"))
+# Only for DB files that never change while the API runs (skips locking)
+DB_IMMUTABLE = os.environ.get("HN_DB_IMMUTABLE", "0") == "1"
+
+connection_pool = ReadOnlyConnectionPool(
+    DB_PATH, size=DB_POOL_SIZE, immutable=DB_IMMUTABLE
+)
+schema_cache = FingerprintCache()
+# Registered queries compiled (EXPLAIN) once per DB file version
+query_check_cache = FingerprintCache()
+
+
+class QueryCheck(NamedTuple):
+    """Result of cached_query_validation for one DB file version."""
+    missing_rollups: List[str]        # non-empty: queries run their hn_posts fallback
+    invalid_queries: Dict[str, str]   # query name -> SQLite error
+
+# Response cache: entries keyed by (query name, DB fingerprint)
+CACHE_MAX_ENTRIES = int(os.environ.get("HN_CACHE_MAX_ENTRIES", "64"))
+# Queries relative to date('now', ...) must expire even without a new load
+RELATIVE_QUERY_TTL_SECONDS = float(os.environ.get("HN_CACHE_TTL_SECONDS", "60"))
+QUERY_CACHE_TTL_SECONDS = {
+    "TOP_USERS_LAST_7D": RELATIVE_QUERY_TTL_SECONDS,
+    "TRENDING_TITLES_LAST_7D": RELATIVE_QUERY_TTL_SECONDS,
+    "ACTIVITY_LAST_24H": RELATIVE_QUERY_TTL_SECONDS,
+}
+
+response_cache = ResponseCache(max_entries=CACHE_MAX_ENTRIES)
+
+# Query engine per query (engines.py): HN_QUERY_ENGINE, overridden by HN_QUERY_ENGINES
+QUERY_ENGINE_BY_NAME = {query.name: engine_for(query.name) for query in QUERIES}
+DUCKDB_QUERIES = sorted(name for name, engine in QUERY_ENGINE_BY_NAME.items() if engine == "duckdb")
+# Fail at startup, not on the first request, when duckdb is configured but missing
+QUERY_ERRORS = (sqlite3.Error, duckdb_module().Error) if DUCKDB_QUERIES else (sqlite3.Error,)
+# Per process (gunicorn worker), built on first use and after every ETL load
+duckdb_snapshot = DuckDBSnapshot(tables_read(QUERIES[name].duckdb_sql for name in DUCKDB_QUERIES))
 
 # ============================================================================
-# Production DB Connection
+# Metrics (GET /metrics, Prometheus text format)
 # ============================================================================
 
-def get_database_connection() -> sqlite3.Connection: 
-    """
-    Open a connection to the ETL SQLite database. 
+# Log every query whose SQL phase takes at least this many ms (unset = off)
+SLOW_QUERY_MS = float(os.environ["HN_SLOW_QUERY_MS"]) if os.environ.get("HN_SLOW_QUERY_MS") else None
 
-    Raises: 
-        FileNotFoundError: If the expected database file does not exist.
-    """
+metrics = MetricsRegistry()
+REQUEST_SECONDS = metrics.histogram(
+    "hn_request_duration_seconds", "Request latency per endpoint", ["endpoint"]
+)
+PHASE_SECONDS = metrics.histogram(
+    "hn_phase_duration_seconds",
+    "Time per phase: pool_acquire, schema, sql, build, encode (schema_pragma: uncached path; "
+    "snapshot: DuckDB snapshot check/rebuild)",
+    ["phase"],
+)
+QUERY_SECONDS = metrics.histogram(
+    "hn_query_duration_seconds", "SQL execute + fetch time per dashboard query", ["query"]
+)
+REQUESTS = metrics.counter("hn_requests_total", "Requests per endpoint and status", ["endpoint", "status"])
+REQUEST_ERRORS = metrics.counter(
+    "hn_request_errors_total", "5xx responses (incl. unhandled exceptions) per endpoint", ["endpoint"]
+)
+ROWS_RETURNED = metrics.counter("hn_rows_returned_total", "Rows fetched per query (cache misses)", ["query"])
+RESPONSE_BYTES = metrics.counter("hn_response_bytes_total", "Response body bytes per endpoint", ["endpoint"])
+CACHE_LOOKUPS = metrics.counter(
+    "hn_response_cache_lookups_total", "Response cache lookups per query (hit, miss, bypass = profiled)", ["query", "result"]
+)
 
-    if not DB_PATH.exists(): 
 
-        logger.error("Database file not found at %s", {DB_PATH})
-        raise FileNotFoundError(
-            f'ETL database missing. Expected at: {DB_PATH}.'
-            f"Run the Day 15 ETL script to create it."
-        )
+# ============================================================================
+# Profiling (opt-in, etl/profiling.py)
+# ============================================================================
 
-    logger.info(f"✅ Connected to ETL database: {DB_PATH}")
-    return sqlite3.connect(DB_PATH)
+# HN_PROFILE=cprofile|sample profiles every request; HN_PROFILE_REQUESTS=1
+# allows ?profile=1 (cprofile) / ?profile=sample on individual requests
+PROFILE_MODE = parse_mode(os.environ.get("HN_PROFILE"))
+PROFILE_REQUESTS = os.environ.get("HN_PROFILE_REQUESTS", "0") == "1"
+
+
+def log_if_slow(query_name: str, seconds: float, row_count: int) -> None:
+    """Slow-query log: one warning per query at or above HN_SLOW_QUERY_MS."""
+    if SLOW_QUERY_MS is not None and seconds * 1000 >= SLOW_QUERY_MS:
+        logger.warning("🐢 Slow query %s: %.1f ms, %d rows", query_name, seconds * 1000, row_count)
+
+
+def endpoint_label() -> str:
+    """Route pattern, not the raw path, so 404 probes can't grow the label set."""
+    return request.url_rule.rule if request.url_rule is not None else "unmatched"
+
+
+@api.before_app_request
+def start_request_timer() -> None:
+    g.request_started = time.perf_counter()
+
+
+@api.before_app_request
+def start_request_profile() -> Any:
+    """Profile this request (HN_PROFILE, or ?profile= when HN_PROFILE_REQUESTS=1)."""
+    mode = PROFILE_MODE
+    if mode is None and PROFILE_REQUESTS and "profile" in request.args:
+        try:
+            mode = parse_mode(request.args["profile"])
+        except ValueError as error:
+            return jsonify({"error": str(error)}), 400
+
+    if mode is not None:
+        session = ProfileSession(endpoint_label(), mode)
+        if session.start():
+            g.profile_session = session
+    return None
+
+
+@api.after_app_request
+def write_request_profile(response: Response) -> Response:
+    """Stop the request's profiler; the file name is returned in X-Profile-File."""
+    session = g.pop("profile_session", None)
+    if session is not None:
+        path = session.stop()
+        if path is not None:
+            response.headers["X-Profile-File"] = path.name
+    return response
+
+
+@api.after_app_request
+def record_request_metrics(response: Response) -> Response:
+    """Latency, status, errors and body bytes per endpoint (also runs for unhandled 500s)."""
+    endpoint = endpoint_label()
+    started = g.get("request_started")
+    if started is not None:
+        REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, status=response.status_code)
+    if response.status_code >= 500:
+        REQUEST_ERRORS.inc(endpoint=endpoint)
+    if response.content_length:
+        RESPONSE_BYTES.inc(response.content_length, endpoint=endpoint)
+    return response
 
 # ============================================================================
 # VALIDATE SCHEMA 
 # ============================================================================
 
+@PHASE_SECONDS.timed(phase="schema_pragma")
 def validate_table_schema(connection: sqlite3.Connection) -> Tuple[bool, str]:
     """"
     Validate that the hn_posts table exists with required columns. 
@@ -94,120 +223,381 @@ def validate_table_schema(connection: sqlite3.Connection) -> Tuple[bool, str]:
         return False, f"Schema validation error: {error}"
 
 
-# ============================================================================
-# DRY Query Executor (Single Responsibility)
-# ============================================================================
+def cached_schema_validation(connection: sqlite3.Connection) -> Tuple[bool, str]:
+    """
+    Validate the schema once per database file version.
 
-def execute_query(query_name: str, sql_query: str) -> Any: 
+    The result is reused until the pool observes a new mtime/inode for
+    DB_PATH, so steady-state requests skip the PRAGMA round trip.
     """
-    Execute SQL -> JSON response (reusable across endpoints). 
+    return schema_cache.get(
+        connection_pool.fingerprint,
+        lambda: validate_table_schema(connection),
+    )
 
-    Args: 
-        Query_name: For logging (e.g. "DAILY_LEADERS")
-        sql_query: From queries.py
 
-    Returns: 
-        - List of records for multi-row queries. 
-        - Single record for one-row queries. 
-        - Error JSON with 500 status for execution failures. 
+def cached_query_validation(connection: sqlite3.Connection) -> QueryCheck:
+    """
+    Check the rollup tables and compile every registered query (EXPLAIN,
+    defaults bound) once per database file version: at startup, then
+    again after the file changes.
+
+    A DB without the rollup tables (not yet migrated by the ETL) is
+    served through each query's hn_posts fallback, and /health reports
+    the pending migration. Queries that still do not compile answer 500
+    without running, and /health reports them too.
+    """
+    def validate() -> QueryCheck:
+        missing = missing_rollups(connection)
+        if missing:
+            logger.error("❌ %s", migration_error(missing))
+        failures = QUERIES.validate(connection, fallback=bool(missing))
+        for query_name, error in failures.items():
+            logger.error("❌ %s does not compile: %s", query_name, error)
+        return QueryCheck(missing, failures)
 
-    Raises: 
-        pd.errors.DatabaseError: SQL syntax/schema issues
-        sqlite3.Error: Connection failures
+    return query_check_cache.get(connection_pool.fingerprint, validate)
+
+
+def migration_error(missing: List[str]) -> str:
+    return (f"Rollup tables missing: {', '.join(missing)}; serving hn_posts fallback queries. "
+            f"Run the ETL (etl_hn_github.py) once to create and backfill them.")
+
+
+def etl_freshness(connection: sqlite3.Connection) -> Optional[Dict[str, Any]]:
     """
+    Data freshness from the ETL's own bookkeeping: the last run (etl_runs
+    in the run history DB next to DB_PATH), when a run last succeeded, and
+    the created_at watermark.
+
+    None when there is no run history yet (no instrumented run).
+    """
+    runs_path = runs_db_path(DB_PATH)
+    if not runs_path.exists():
+        return None
+    try:
+        runs = sqlite3.connect(f"{runs_path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            last_run = runs.execute(
+                "SELECT started_at, finished_at, status, mode, rows_loaded, duration_seconds "
+                "FROM etl_runs ORDER BY run_id DESC LIMIT 1"
+            ).fetchone()
+            last_ok = runs.execute(
+                "SELECT MAX(finished_at) FROM etl_runs WHERE status = 'ok'"
+            ).fetchone()[0]
+        finally:
+            runs.close()
+    except sqlite3.Error:
+        return None
+    try:
+        watermark = connection.execute(
+            "SELECT value FROM etl_state WHERE key = 'created_at_watermark'"
+        ).fetchone()
+    except sqlite3.OperationalError:
+        watermark = None
+
+    age = None
+    if last_ok:
+        age = round((datetime.now(timezone.utc) - datetime.fromisoformat(last_ok)).total_seconds())
+
+    columns = ("started_at", "finished_at", "status", "mode", "rows_loaded", "duration_seconds")
+    return {
+        "last_run": dict(zip(columns, last_run)) if last_run else None,
+        "last_success_at": last_ok,
+        "seconds_since_last_success": age,
+        "created_at_watermark": watermark[0] if watermark else None,
+    }
+
+
+# ============================================================================
+# DRY Query Executor (Single Responsibility)
+# ============================================================================
 
-    connection = get_database_connection()
+def encode_json(payload: Any) -> bytes:
+    """Serialise a payload once, matching jsonify's sorted-key output."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
 
-    is_valid, validation_message = validate_table_schema(connection)
-    if not is_valid: 
-        logger.error("%s: %s", query_name, validation_message)
-        connection.close()
-        return jsonify({"error": validation_message}), 500
 
+def fetch_records(connection: sqlite3.Connection, query: RegisteredQuery,
+                  values: Tuple[Any, ...], fallback: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run a registered query with bound parameters and build plain dict
+    records straight from the cursor (no DataFrame).
+
+    The SQL text never changes with the values, so sqlite3's statement
+    cache keeps one prepared statement per query and connection. Queries
+    routed to DuckDB (QUERY_ENGINE_BY_NAME) run their DuckDB variant on
+    the snapshot, which is first brought up to the connection's DB
+    version ("snapshot" phase). fallback=True (DB without the rollup
+    tables) runs the hn_posts fallback on SQLite instead. execute +
+    fetchall is the "sql" phase (also per query, and checked against the
+    slow-query threshold); the dict build is "build".
+    """
+    query_name = query.name
+    params = query.bind(values)
+    engine = "sqlite" if fallback else QUERY_ENGINE_BY_NAME.get(query_name, "sqlite")
+    if engine == "duckdb":
+        with PHASE_SECONDS.time(phase="snapshot"):
+            duckdb_snapshot.refresh(connection, connection_pool.fingerprint)
+
+    with PHASE_SECONDS.time(phase="sql") as sql_timer:
+        if engine == "duckdb":
+            columns, rows = duckdb_snapshot.fetch(query.duckdb_sql, params)
+        else:
+            columns, rows = fetch_sqlite(connection, query.sql_for(fallback), params)
+    QUERY_SECONDS.observe(sql_timer.seconds, query=query_name)
+    ROWS_RETURNED.inc(len(rows), query=query_name)
+    log_if_slow(query_name, sql_timer.seconds, len(rows))
+
+    with PHASE_SECONDS.time(phase="build"):
+        return [dict(zip(columns, row)) for row in rows]
+
+
+def run_query(query_name: str, values: Optional[Tuple[Any, ...]] = None) -> Tuple[bytes, int]:
+    """
+    Execute a registered query on a pooled connection -> (encoded JSON body, HTTP status).
 
-    try: 
-        dataframe = pd.read_sql_query(sql_query, connection)
-        row_count = len(dataframe)
-        logger.info(f"✅ %s returned %d rows", query_name, row_count)
+    values: Normalized parameters (RegisteredQuery.parse); None = defaults.
 
-        records = dataframe.to_dict(orient="records")
+    Body shapes:
+        - List of records for multi-row queries.
+        - Single record for one-row queries.
+        - Error payload with 500 status for execution failures.
 
-        if row_count == 0: 
-            # Explicit, non-error empty response
-            return jsonify({"records": [], 'row_count': 0, 'query': query_name})
+    Raises:
+        FileNotFoundError: Missing database file
+        TimeoutError: Connection pool exhausted
+    """
 
-        # Single row -> dict (activity summary)
-        if row_count == 1: 
-            return jsonify(records[0])
+    acquire_started = time.perf_counter()
+    with connection_pool.connection() as connection:
+        PHASE_SECONDS.observe(time.perf_counter() - acquire_started, phase="pool_acquire")
+
+        with PHASE_SECONDS.time(phase="schema"):
+            is_valid, validation_message = cached_schema_validation(connection)
+            query_check = cached_query_validation(connection)
+            compile_error = query_check.invalid_queries.get(query_name)
+        if not is_valid:
+            logger.error("%s: %s", query_name, validation_message)
+            return encode_json({"error": validation_message}), 500
+        if compile_error is not None:
+            return encode_json({"error": f"{query_name} query failed: {compile_error}"}), 500
+
+        query = QUERIES[query_name]
+        try:
+            records = fetch_records(connection, query, query.defaults if values is None else values,
+                                    fallback=bool(query_check.missing_rollups))
+            row_count = len(records)
+            logger.info(f"✅ %s returned %d rows", query_name, row_count)
+
+            if row_count == 0:
+                # Explicit, non-error empty response
+                payload: Any = {"records": [], 'row_count': 0, 'query': query_name}
+            elif row_count == 1:
+                # Single row -> dict (activity summary)
+                payload = records[0]
+            else:
+                # Multi-row -> list of dicts
+                payload = records
+
+            with PHASE_SECONDS.time(phase="encode"):
+                return encode_json(payload), 200
+
+        except QUERY_ERRORS as error:
+            logger.error(f"❌ %s query failed: %s", query_name, error)
+            return encode_json({"error": f"{query_name} query failed: {error}"}), 500
+
+
+def json_response(body: bytes, status: int) -> Response:
+    """Wrap an already-encoded JSON body without re-serialising it."""
+    return Response(body, status=status, mimetype="application/json")
+
+
+def execute_query(query_name: str) -> Any: 
+    """
+    Execute a registered query with the request's parameters -> JSON response
+    (reusable across endpoints). 
+
+    Query-string arguments (?days=30&limit=20) are parsed against the
+    query's declared parameters; an invalid value is a 400 listing them.
+    Successful results are cached per (query_name, normalized parameters,
+    data version) as pre-encoded bytes, so each dashboard view has its own
+    entry and `?days=07` shares the one of `?days=7`. The data version is
+    the DB file fingerprint, so the first request after an ETL load
+    recomputes; queries listed in QUERY_CACHE_TTL_SECONDS also expire so
+    their date('now', ...) window keeps moving.
 
-        # Multi-row -> list of dicts
-        return jsonify(records)
+    Args: 
+        Query_name: Registered in queries.QUERIES (e.g. "DAILY_LEADERS")
 
-    except (pd.errors.DatabaseError, sqlite3.Error) as error:
-        logger.error(f"❌ %s query failed: %s", query_name, error)
-        return jsonify({"error": f"{query_name} query failed: {error}"}), 500
+    Returns: 
+        Flask JSON response (see run_query for shapes).
 
-    finally: 
-        connection.close()
+    Raises: 
+        FileNotFoundError: Missing database file
+        TimeoutError: Connection pool exhausted
+    """
+
+    query = QUERIES[query_name]
+    try:
+        values = query.parse(request.args)
+    except ValueError as error:
+        return json_response(encode_json({"error": str(error), "parameters": query.describe()}), 400)
+
+    cache_key = (query_name, values, connection_pool.current_fingerprint())
+    if "profile_session" in g:
+        # A profiled request always runs the query, or it would only profile a dict lookup
+        cached = None
+        CACHE_LOOKUPS.inc(query=query_name, result="bypass")
+    else:
+        cached = response_cache.get(cache_key)
+        CACHE_LOOKUPS.inc(query=query_name, result="miss" if cached is None else "hit")
+    if cached is not None:
+        return json_response(*cached)
+
+    body, status = run_query(query_name, values)
+    if status == 200:
+        response_cache.put(
+            cache_key, (body, status), QUERY_CACHE_TTL_SECONDS.get(query_name)
+        )
+    return json_response(body, status)
 
 # ============================================================================
 # HN Dashboard API Endpoints
 # ============================================================================
 
-@app.route("/api/dashboard")
+@api.route("/api/dashboard")
 def get_daily_leaders() -> Any: 
-    """Return daily leaders by comment volume. """
-    return execute_query("DAILY_LEADERS", DAILY_LEADERS)
+    """Return daily leaders by comment volume (?limit=). """
+    return execute_query("DAILY_LEADERS")
 
-@app.route("/api/users")
+@api.route("/api/users")
 def get_top_users() -> Any: 
-    """Return the most active users for the last seven days."""
-    return execute_query("TOP_USERS_LAST_7D", TOP_USERS_LAST_7D)
+    """Return the most active users for the last seven days (?days=&limit=&min_comments=)."""
+    return execute_query("TOP_USERS_LAST_7D")
 
-@app.route("/api/trending")
+@api.route("/api/trending")
 def get_trending_topics() -> Any: 
-    """Return trending titles for the last seven days."""
-    return execute_query("TRENDING_TITLES_LAST_7D", TRENDING_TITLES_LAST_7D)
+    """Return trending titles for the last seven days (?days=&limit=&min_mentions=)."""
+    return execute_query("TRENDING_TITLES_LAST_7D")
 
-@app.route("/api/activity")
+@api.route("/api/activity")
 def get_recent_activity() -> Any: 
-    """Return a summary of activity in the last 24 hours."""
-    return execute_query("ACTIVITY_LAST_24H", ACTIVITY_LAST_24H)
+    """Return a summary of activity in the last 24 hours (?days=)."""
+    return execute_query("ACTIVITY_LAST_24H")
+
+@api.route("/metrics")
+def get_metrics() -> Response: 
+    """Prometheus scrape endpoint: per-phase/per-endpoint histograms and counters."""
+    return Response(metrics.render(), content_type=MetricsRegistry.CONTENT_TYPE)
 
-@app.route("/health")
-def health_check() -> Dict[str, Any]: 
-    """Health-check endpoint, including basic schema validation."""
+def health_status() -> Tuple[Dict[str, Any], int]: 
+    """
+    Health payload + HTTP status: schema and query validation, pending
+    rollup migration, ETL freshness, cache stats.
+
+    A DB still missing the rollup tables is "degraded" but answers 200:
+    every endpoint is served (hn_posts fallback), only slower.
+    """
     try: 
-        connection = get_database_connection()
-        is_valid, message = validate_table_schema(connection)
-        connection.close()
+        with connection_pool.connection() as connection:
+            is_valid, message = cached_schema_validation(connection)
+            query_check = cached_query_validation(connection)
+            freshness = etl_freshness(connection)
 
-        status = "healthy" if is_valid else "degraded"
+        is_valid = is_valid and not query_check.invalid_queries
+        status = "healthy" if is_valid and not query_check.missing_rollups else "degraded"
         code = 200 if is_valid else 500
-
-        return jsonify({"status": status, 
-                        "database": str(DB_PATH), 
-                        "details": message,}
-                        , code)
+        migration = None
+        if query_check.missing_rollups:
+            migration = {"missing_rollups": query_check.missing_rollups,
+                         "error": migration_error(query_check.missing_rollups)}
+
+        return {"status": status, 
+                "database": str(DB_PATH), 
+                "details": message,
+                "invalid_queries": query_check.invalid_queries,
+                "migration": migration,
+                "etl": freshness,
+                "cache": response_cache.stats(),
+                "query_engines": {
+                    "duckdb": DUCKDB_QUERIES,
+                    "duckdb_snapshot": duckdb_snapshot.stats() if DUCKDB_QUERIES else None,
+                }}, code
 
     except Exception as error: 
         logger.error(f"Health check failed: %s",error)
-        return jsonify({"status": "unhealthy", "error": str(error)}), 503
+        return {"status": "unhealthy", "error": str(error)}, 503
+
+@api.route("/health")
+def health_check() -> Any: 
+    """Health-check endpoint, including basic schema validation and ETL freshness."""
+    payload, code = health_status()
+    return jsonify(payload), code
 
 # ============================================================================
 # Production Server
 # ============================================================================
 
+def create_app() -> Flask:
+    """
+    Application factory; gunicorn.conf.py serves "serve_hn:create_app()".
+
+    Pool, caches and metrics are per process, so every gunicorn worker
+    gets its own read-only connection pool (a pool inherited through
+    fork() starts empty in the child).
+
+    Registered queries are compiled here, so a query that no longer
+    matches the schema (or a DB still missing the rollup tables) is
+    logged at startup rather than at its first request (validation waits
+    for the database if it does not exist yet).
+    """
+    flask_app = Flask(__name__)
+    flask_app.register_blueprint(api)
+
+    try:
+        with connection_pool.connection() as connection:
+            invalid_queries = cached_query_validation(connection).invalid_queries
+        logger.info("✅ %d/%d registered queries compile",
+                    len(QUERIES) - len(invalid_queries), len(QUERIES))
+    except FileNotFoundError as error:
+        logger.warning("Query validation deferred: %s", error)
+    return flask_app
+
+
+def shutdown() -> None:
+    """Close pooled connections and the DuckDB snapshot (gunicorn worker_exit, dev server exit)."""
+    connection_pool.close()
+    duckdb_snapshot.close()
+    logger.info("🛑 Connection pool closed")
+
+
+# Dev server, Flask test client and benchmarks/bench_api.py
+app = create_app()
+
 if __name__ == "__main__": 
     logger.info("=" * 60)
     logger.info("🚀 HN DASHBOARD API v3.0")
     logger.info(f"📊 Database: {DB_PATH}")
     logger.info("🔑 localhost")
     logger.info("🔗Endpoints: ")
-    logger.info(" GET /api/dashboard   -> Daily leaders")
-    logger.info(" GET /api/users       -> Top users (7D)")
-    logger.info(" GET /api/trending     -> Hot topics (7D)")
-    logger.info(" GET /api/activity     -> 24hr summary")
+    logger.info(" GET /api/dashboard   -> Daily leaders      (?limit=20)")
+    logger.info(" GET /api/users       -> Top users (7D)     (?days=7&limit=10&min_comments=2)")
+    logger.info(" GET /api/trending     -> Hot topics (7D)   (?days=7&limit=8&min_mentions=2)")
+    logger.info(" GET /api/activity     -> 24hr summary      (?days=1)")
     logger.info(" GET /health     -> Production health")
+    logger.info(" GET /metrics    -> Prometheus metrics")
+    if DUCKDB_QUERIES:
+        logger.info(f"🦆 DuckDB engine: {', '.join(DUCKDB_QUERIES)}")
+    if PROFILE_MODE is not None:
+        logger.info(f"📈 Profiling every request ({PROFILE_MODE})")
+    elif PROFILE_REQUESTS:
+        logger.info("📈 ?profile=1 / ?profile=sample enabled")
+    logger.info("⚠️ Flask development server; production: gunicorn -c etl/gunicorn.conf.py")
     logger.info("=" * 60)
-    app.run(host="0.0.0.0", debug=False, port=5000)
\ No newline at end of file
+    try: 
+        app.run(host="0.0.0.0", debug=False, port=5000, threaded=True)
+    finally: 
+        shutdown()
\ No newline at end of file
@@ -0,0 +1,326 @@
+"""
+HN Dashboard API, async (ASGI) variant
+
+Purpose: Same routes and JSON shapes as serve_hn.py, for bursty, highly
+         duplicated dashboard traffic. The event loop never blocks on
+         SQLite: queries run in a bounded thread pool, concurrent identical
+         requests share one query (single flight), and ?stream=1 streams
+         large results as NDJSON instead of building one JSON document.
+Inputs: data/hn_posts.db + the HN_* config of serve_hn.py (pool, caches,
+        metrics and query code are shared with it)
+Outputs: ASGI application `app`
+Usage:
+    pip install uvicorn
+    cd etlpipeline/etl
+    uvicorn serve_hn_async:app --port 5000 --workers 2
+    python serve_hn_async.py                   # HN_BIND / HN_WORKERS
+    curl "http://127.0.0.1:5000/api/trending?stream=1"
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qs
+
+import serve_hn
+from metrics import MetricsRegistry
+from queries import QUERIES
+from query_registry import RegisteredQuery
+from serve_hn import (
+    CACHE_LOOKUPS,
+    QUERY_CACHE_TTL_SECONDS,
+    REQUEST_ERRORS,
+    REQUEST_SECONDS,
+    REQUESTS,
+    RESPONSE_BYTES,
+    cached_query_validation,
+    connection_pool,
+    encode_json,
+    health_status,
+    metrics,
+    response_cache,
+    run_query,
+)
+from single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+
+# Threads running SQLite work; no more than the pool has connections
+QUERY_WORKERS = int(os.environ.get("HN_ASYNC_QUERY_WORKERS", str(serve_hn.DB_POOL_SIZE)))
+# Executor jobs (distinct queries, stream batches) allowed to queue; beyond -> 503
+MAX_PENDING = int(os.environ.get("HN_ASYNC_MAX_PENDING", "64"))
+# Concurrent ?stream=1 responses; each holds a pooled connection until it ends
+MAX_STREAMS = int(os.environ.get("HN_ASYNC_MAX_STREAMS", str(max(1, serve_hn.DB_POOL_SIZE // 2))))
+STREAM_BATCH_ROWS = int(os.environ.get("HN_STREAM_BATCH_ROWS", "1000"))
+
+ROUTES = {
+    "/api/dashboard": "DAILY_LEADERS",
+    "/api/users": "TOP_USERS_LAST_7D",
+    "/api/trending": "TRENDING_TITLES_LAST_7D",
+    "/api/activity": "ACTIVITY_LAST_24H",
+}
+
+COALESCED = metrics.counter(
+    "hn_coalesced_requests_total", "Requests answered by joining an identical in-flight query", ["query"]
+)
+
+flights = SingleFlight()
+stream_slots = asyncio.Semaphore(MAX_STREAMS)
+_executor: Optional[ThreadPoolExecutor] = None
+_pending = 0
+
+
+class Overloaded(Exception):
+    """Too much queued executor work; answered with 503 + Retry-After."""
+
+
+def executor() -> ThreadPoolExecutor:
+    """Created on first use (or lifespan startup), so every worker process owns its threads."""
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=QUERY_WORKERS, thread_name_prefix="hn-query")
+    return _executor
+
+
+async def in_executor(func: Callable[..., Any], *args: Any) -> Any:
+    """Run blocking work on the bounded query pool, or raise Overloaded."""
+    global _pending
+    if _pending >= MAX_PENDING:
+        raise Overloaded(f"{_pending} queries pending")
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor(), func, *args)
+    finally:
+        _pending -= 1
+
+
+# ============================================================================
+# Dashboard queries (cached, coalesced)
+# ============================================================================
+
+def query_and_cache(query_name: str, values: Tuple[Any, ...], cache_key: Tuple[Any, ...]) -> Tuple[bytes, int]:
+    """Executor side of a cache miss: same body/status as serve_hn.run_query."""
+    body, status = run_query(query_name, values)
+    if status == 200:
+        response_cache.put(cache_key, (body, status), QUERY_CACHE_TTL_SECONDS.get(query_name))
+    return body, status
+
+
+async def dashboard_response(query_name: str, values: Tuple[Any, ...]) -> Tuple[bytes, int]:
+    """
+    Cached body, else join the in-flight query for this (query, normalized
+    parameters, DB version), else start it. N identical concurrent misses
+    run the SQL once.
+    """
+    cache_key = (query_name, values, connection_pool.current_fingerprint())
+    cached = response_cache.get(cache_key)
+    CACHE_LOOKUPS.inc(query=query_name, result="miss" if cached is None else "hit")
+    if cached is not None:
+        return cached
+
+    if cache_key in flights:
+        COALESCED.inc(query=query_name)
+    return await flights.run(
+        cache_key, lambda: in_executor(query_and_cache, query_name, values, cache_key)
+    )
+
+
+# ============================================================================
+# Streaming (NDJSON)
+# ============================================================================
+
+class RecordStream:
+    """
+    Cursor over a pooled connection, read in STREAM_BATCH_ROWS batches.
+
+    Every method blocks (run them in the executor); the connection goes
+    back to the pool on close().
+    """
+
+    def __init__(self, query: RegisteredQuery, values: Tuple[Any, ...]) -> None:
+        self._resources = ExitStack()
+        try:
+            connection = self._resources.enter_context(connection_pool.connection())
+            fallback = bool(cached_query_validation(connection).missing_rollups)
+            self.cursor = connection.execute(query.sql_for(fallback), query.bind(values))
+            self._resources.callback(self.cursor.close)
+        except BaseException:
+            self._resources.close()
+            raise
+        self.columns = [column[0] for column in self.cursor.description]
+        self.rows = 0
+
+    def next_chunk(self) -> bytes:
+        """Next batch as NDJSON lines; b"" once the cursor is exhausted."""
+        rows = self.cursor.fetchmany(STREAM_BATCH_ROWS)
+        self.rows += len(rows)
+        columns = self.columns
+        return b"".join(encode_json(dict(zip(columns, row))) + b"\n" for row in rows)
+
+    def close(self) -> None:
+        self._resources.close()
+
+
+async def stream_response(send: Send, query_name: str, values: Tuple[Any, ...]) -> Tuple[int, int]:
+    """
+    One record per line (application/x-ndjson), flushed per batch.
+
+    Bypasses the response cache and coalescing (each stream has its own
+    cursor; always SQLite). Errors before the first byte are normal JSON
+    500s; later ones end the stream early and are logged.
+    """
+    query = QUERIES[query_name]
+    if stream_slots.locked():
+        raise Overloaded(f"{MAX_STREAMS} streams already open")
+
+    async with stream_slots:
+        try:
+            stream = await in_executor(RecordStream, query, values)
+        except sqlite3.Error as error:
+            logger.error("❌ %s stream failed: %s", query_name, error)
+            return await send_body(send, 500, encode_json({"error": f"{query_name} query failed: {error}"}))
+
+        sent = 0
+        try:
+            await send({
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/x-ndjson")],
+            })
+            while True:
+                chunk = await in_executor(stream.next_chunk)
+                if not chunk:
+                    break
+                await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                sent += len(chunk)
+            await send({"type": "http.response.body", "body": b""})
+            logger.info("✅ %s streamed %d rows", query_name, stream.rows)
+        except Exception as error:
+            logger.error("❌ %s stream aborted after %d rows: %s", query_name, stream.rows, error)
+        finally:
+            await asyncio.get_running_loop().run_in_executor(executor(), stream.close)
+        return 200, sent
+
+
+# ============================================================================
+# ASGI application
+# ============================================================================
+
+async def send_body(send: Send, status: int, body: bytes, content_type: str = "application/json",
+                    headers: Iterable[Tuple[bytes, bytes]] = ()) -> Tuple[int, int]:
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("latin-1")),
+            (b"content-length", str(len(body)).encode("latin-1")),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+    return status, len(body)
+
+
+async def handle(scope: Dict[str, Any], send: Send) -> Tuple[int, int]:
+    """Route one HTTP request -> (status, body bytes sent)."""
+    path = scope["path"]
+    if scope["method"] != "GET":
+        return await send_body(send, 405, encode_json({"error": "Method not allowed"}))
+
+    try:
+        if path in ROUTES:
+            query_name = ROUTES[path]
+            args = {
+                name: values[-1]
+                for name, values in parse_qs(scope.get("query_string", b"").decode("latin-1")).items()
+            }
+            try:
+                values = QUERIES[query_name].parse(args)
+            except ValueError as error:
+                return await send_body(send, 400, encode_json(
+                    {"error": str(error), "parameters": QUERIES[query_name].describe()}
+                ))
+            if args.get("stream", "").lower() in ("1", "true", "yes"):
+                return await stream_response(send, query_name, values)
+            body, status = await dashboard_response(query_name, values)
+            return await send_body(send, status, body)
+
+        if path == "/health":
+            payload, code = await in_executor(health_status)
+            payload["coalescing"] = flights.stats()
+            return await send_body(send, code, encode_json(payload))
+
+        if path == "/metrics":
+            return await send_body(send, 200, metrics.render().encode("utf-8"), MetricsRegistry.CONTENT_TYPE)
+
+        return await send_body(send, 404, encode_json({"error": f"Not found: {path}"}))
+
+    except Overloaded as error:
+        logger.warning("Shedding %s: %s", path, error)
+        return await send_body(send, 503, encode_json({"error": f"Server busy: {error}"}),
+                               headers=[(b"retry-after", b"1")])
+    except Exception as error:
+        logger.exception("%s failed", path)
+        return await send_body(send, 500, encode_json({"error": str(error)}))
+
+
+async def lifespan(receive: Receive, send: Send) -> None:
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            executor()
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            # The server has already drained in-flight requests
+            if _executor is not None:
+                await asyncio.to_thread(_executor.shutdown, wait=True)
+            serve_hn.shutdown()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def app(scope: Dict[str, Any], receive: Receive, send: Send) -> None:
+    """ASGI entry point (HTTP + lifespan); same metrics as serve_hn."""
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    started = time.perf_counter()
+    path = scope["path"]
+    endpoint = path if path in ROUTES or path in ("/health", "/metrics") else "unmatched"
+
+    status, size = await handle(scope, send)
+
+    REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+    REQUESTS.inc(endpoint=endpoint, status=status)
+    if status >= 500:
+        REQUEST_ERRORS.inc(endpoint=endpoint)
+    if size:
+        RESPONSE_BYTES.inc(size, endpoint=endpoint)
+
+
+if __name__ == "__main__":
+    try:
+        import uvicorn
+    except ImportError:
+        raise ImportError("serve_hn_async needs an ASGI server: pip install uvicorn") from None
+
+    host, _, port = os.environ.get("HN_BIND", "0.0.0.0:5000").rpartition(":")
+    logger.info(f"🚀 HN DASHBOARD API (async) on {host}:{port}, {QUERY_WORKERS} query threads")
+    uvicorn.run(
+        "serve_hn_async:app",
+        host=host,
+        port=int(port),
+        workers=int(os.environ.get("HN_WORKERS", "1")),
+        log_level=os.environ.get("HN_LOG_LEVEL", "info"),
+    )
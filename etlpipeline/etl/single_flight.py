@@ -0,0 +1,67 @@
+"""
+Request coalescing ("single flight") for serve_hn_async.py
+
+Purpose: When many clients ask for the same thing at once (dashboard burst
+         traffic), run the work once and hand every waiter the same result
+         instead of queueing N identical SQLite queries.
+Inputs: Key (e.g. query name + DB fingerprint) + a coroutine factory
+Outputs: The shared result (or exception) of the single execution
+Usage:
+    flights = SingleFlight()
+    body = await flights.run(("TRENDING", version), lambda: loop.run_in_executor(pool, query))
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with equal keys into one execution.
+
+    The execution runs as its own task, and callers await it through
+    asyncio.shield(): a caller that goes away (client disconnect) does not
+    cancel the work for the others. The key is released when the task
+    finishes, so later calls start a fresh execution (the response cache,
+    not this class, decides how long results stay reusable).
+
+    Not thread-safe: use from one event loop.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        """Executions currently in flight."""
+        return len(self._flights)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._flights
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = asyncio.ensure_future(call())
+            self._flights[key] = flight
+            flight.add_done_callback(lambda done: self._finish(key, done))
+            self.executions += 1
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(flight)
+
+    def _finish(self, key: Hashable, done: "asyncio.Future[Any]") -> None:
+        if self._flights.get(key) is done:
+            del self._flights[key]
+        if not done.cancelled():
+            done.exception()  # retrieved here, so an orphaned failure isn't logged as unhandled
+
+    def stats(self) -> Dict[str, Any]:
+        total = self.executions + self.coalesced
+        return {
+            "in_flight": len(self._flights),
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / total, 4) if total else None,
+        }
@@ -0,0 +1,76 @@
+"""
+Shared pytest setup: the week_1 / week_2 / etl scripts import each other
+by bare module name, so their directories go on sys.path (as in
+benchmarks/run_benchmarks.py).
+"""
+
+import sqlite3
+import sys
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+ETL_DIR = REPO_DIR / "etlpipeline" / "etl"
+WEEK1_DIR = REPO_DIR / "week_1"
+WEEK2_DIR = REPO_DIR / "week_2"
+
+for directory in (ETL_DIR, WEEK1_DIR, WEEK2_DIR):
+    if str(directory) not in sys.path:
+        sys.path.insert(0, str(directory))
+
+
+@lru_cache(maxsize=None)
+def hn_rows():
+    """
+    hn_posts rows relative to now: 80 days (so WEEK_OVER_WEEK_GROWTH has
+    more weeks than its LIMIT), rows inside every date('now', ...) window,
+    and equal counts across users and titles so ties reach each LIMIT.
+    Built once per session, so legacy_db and hn_db hold the same rows.
+    """
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    rows = []
+    for day in range(80):
+        for index in range(30 if day < 10 else 6):
+            created_at = now - timedelta(days=day, minutes=index)
+            comments = index % 5
+            rows.append((
+                len(rows) + 1,
+                f"Add user_{index % 12} to contributors list",
+                f"user_{index % 15}",
+                comments * 0.5,
+                comments,
+                created_at.strftime("%Y-%m-%d %H:%M:%S+00:00"),
+            ))
+    return rows
+
+
+def write_hn_posts(db_path):
+    import etl_hn_github
+
+    conn = sqlite3.connect(db_path)
+    conn.execute(etl_hn_github.CREATE_HN_POSTS)
+    conn.executemany(etl_hn_github.UPSERT_HN_POSTS, hn_rows())
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture
+def legacy_db(tmp_path):
+    """hn_posts.db from before the rollup tables (hn_posts only)."""
+    db_path = str(tmp_path / "legacy.db")
+    write_hn_posts(db_path)
+    return db_path
+
+
+@pytest.fixture
+def hn_db(tmp_path):
+    """The same rows as the ETL leaves them: connect_for_load adds indexes and backfills the rollups."""
+    import etl_hn_github
+
+    db_path = str(tmp_path / "hn_posts.db")
+    write_hn_posts(db_path)
+    etl_hn_github.connect_for_load(db_path).close()
+    return db_path
@@ -0,0 +1,33 @@
+"""analyzer top users: same rows, order and index as the Day 9 sort_values version."""
+
+import pandas as pd
+
+from analyzer import analyze_chunks, rank_top_users
+
+
+def posts():
+    # user_31 and user_18 tie at 40 (user_31 first in the input); user_5 and
+    # user_7 tie at 10 on the k=3 cut-off
+    rows = [("user_31", 40), ("user_5", 10), ("user_18", 25), ("user_7", 10),
+            ("user_18", 15), ("user_2", 3), ("user_31", 0)]
+    return pd.DataFrame({
+        "user": [user for user, _ in rows],
+        "comments": [comments for _, comments in rows],
+        "score": range(len(rows)),
+        "created_at": pd.date_range("2026-02-01", periods=len(rows), freq="h").astype(str),
+    })
+
+
+def test_ties_ordered_by_user_with_baseline_index():
+    top = rank_top_users(posts(), k=3)
+    assert top["user"].tolist() == ["user_18", "user_31", "user_5"]
+    assert top["comments"].tolist() == [40, 40, 10]
+    assert top["rank"].tolist() == [1.0, 1.0, 2.0]
+    # index = position in user order, as groupby().sum().reset_index() gives
+    assert top.index.tolist() == [0, 2, 3]
+
+
+def test_chunked_matches_in_memory():
+    df = posts()
+    chunked = analyze_chunks([df.iloc[:3], df.iloc[3:]], k=3)["top_users_ranked"]
+    pd.testing.assert_frame_equal(chunked, rank_top_users(df, k=3))
@@ -0,0 +1,38 @@
+"""batch_pipeline sharding: output must not depend on the shard size."""
+
+import csv
+
+from batch_pipeline import batch_csv_pipeline, plan_shards
+
+
+def write_quoted_newline_csv(path, rows=2000):
+    with path.open("w", encoding="utf-8", newline="") as out:
+        writer = csv.writer(out)
+        writer.writerow(["id", "note", "price"])
+        for index in range(rows):
+            note = f'line one\nline "two" of {index}\n' if index % 3 == 0 else f"note {index}"
+            price = "abc" if index % 17 == 0 else str(index % 500 - 20)
+            writer.writerow([index if index % 29 else "", note, price])
+
+
+def test_shards_end_on_record_boundaries(tmp_path):
+    source = tmp_path / "quoted.csv"
+    write_quoted_newline_csv(source)
+    shards = plan_shards([source], shard_bytes=997)
+
+    assert len(shards) > 10
+    data = source.read_bytes()
+    for shard in shards:
+        assert data[shard.start:shard.end].count(b'"') % 2 == 0
+
+
+def test_sharded_output_equals_whole_file(tmp_path):
+    source = tmp_path / "quoted.csv"
+    write_quoted_newline_csv(source)
+
+    whole = batch_csv_pipeline(str(source), str(tmp_path / "whole.csv"), workers=1, shard_bytes=0)
+    sharded = batch_csv_pipeline(str(source), str(tmp_path / "sharded.csv"), workers=1, shard_bytes=997)
+
+    assert sharded == whole
+    assert whole[1]
+    assert (tmp_path / "sharded.csv").read_bytes() == (tmp_path / "whole.csv").read_bytes()
@@ -0,0 +1,45 @@
+"""cleaner.day4_clean_sales: input checks and output parity with the pandas path."""
+
+import pandas as pd
+import pytest
+
+from cleaner import day4_clean_sales
+
+
+def test_missing_price_column_writes_nothing(tmp_path):
+    source = tmp_path / "sales.csv"
+    source.write_text("id,amount\n1,10\n2,20\n", encoding="utf-8")
+    output = tmp_path / "cleaned.csv"
+
+    with pytest.raises(KeyError, match="price"):
+        day4_clean_sales(str(source), str(output))
+    assert not output.exists()
+
+
+def test_cleans_prices(tmp_path):
+    source = tmp_path / "sales.csv"
+    source.write_text("id,price\n1,10\n2,\n3,abc\n", encoding="utf-8")
+    output = tmp_path / "cleaned.csv"
+
+    day4_clean_sales(str(source), str(output))
+    assert output.read_text(encoding="utf-8") == "id,price\n1,10.0\n3,\n"
+
+
+@pytest.mark.parametrize("bad_price", [None, "abc", ""])
+def test_matches_pandas_across_batches(tmp_path, bad_price):
+    rows = 200_000
+    source = tmp_path / "sales.csv"
+    with source.open("w", encoding="utf-8") as out:
+        out.write("id,product,price\n")
+        for index in range(rows):
+            price = bad_price if bad_price is not None and index == rows // 2 else index % 997
+            out.write(f"{index},item {index % 50},{price}\n")
+    assert source.stat().st_size > 3 * 1024 * 1024  # several 1 MB mmap batches
+
+    output = tmp_path / "cleaned.csv"
+    day4_clean_sales(str(source), str(output))
+
+    expected = pd.read_csv(source).dropna()
+    expected["price"] = pd.to_numeric(expected["price"], errors="coerce")
+    expected.to_csv(tmp_path / "pandas.csv", index=False)
+    assert output.read_bytes() == (tmp_path / "pandas.csv").read_bytes()
@@ -0,0 +1,18 @@
+"""engines.parity: SQLite and DuckDB return identical results for every catalog query."""
+
+import sqlite3
+
+import pytest
+
+pytest.importorskip("duckdb")
+
+from engines import fetch_sqlite, parity
+from queries import DUCKDB_CATALOG, QUERIES
+
+
+def test_duckdb_parity(hn_db):
+    with sqlite3.connect(f"file:{hn_db}?mode=ro", uri=True) as conn:
+        for name in DUCKDB_CATALOG:
+            query = QUERIES[name]
+            assert fetch_sqlite(conn, query.sql, query.bind(query.defaults))[1], name
+        assert parity(conn, list(DUCKDB_CATALOG)) == dict.fromkeys(DUCKDB_CATALOG)
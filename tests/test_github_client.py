@@ -0,0 +1,87 @@
+"""GitHubSearchClient against the local GitHub stub server: ETag cache, result-cap windows, Retry-After."""
+
+import json
+import threading
+import time
+from email.utils import formatdate
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from github_client import ETagCache, GitHubSearchClient, created_window, retry_after_seconds
+from github_stub_server import make_stub_server, synthesize_issues
+
+
+@pytest.fixture
+def base_url():
+    server = make_stub_server(synthesize_issues(250))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_cache_keeps_the_most_recently_used_entries(tmp_path):
+    path = tmp_path / "etags.json"
+    cache = ETagCache(path, max_entries=2)
+    cache.put("a", '"a"', [])
+    cache.put("b", '"b"', [])
+    cache.get("a")
+    cache.put("c", '"c"', [])
+    assert cache.get("b") is None
+    cache.save()
+
+    cache = ETagCache(path, max_entries=2)
+    cache.put("d", '"d"', [])
+    cache.save()
+    assert list(json.loads(path.read_text())) == ["c", "d"]
+
+
+def test_watermark_queries_are_not_cached(base_url, tmp_path):
+    path = tmp_path / "etags.json"
+    client = GitHubSearchClient(base_url=base_url, etag_cache=ETagCache(path))
+    client.search_issues("hackernews", limit=250)
+    client.search_issues("hackernews created:>=2026-02-19T00:00:00Z", limit=250, order="asc")
+
+    cached = json.loads(path.read_text())
+    assert len(cached) == 3
+    assert {parse_qs(urlparse(url).query)["q"][0] for url in cached} == {"hackernews"}
+
+
+def test_incremental_run_past_the_result_cap(tmp_path):
+    items = synthesize_issues(2500)
+    server = make_stub_server(items)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        queries = []
+        client = GitHubSearchClient(
+            base_url=f"http://127.0.0.1:{server.server_address[1]}",
+            etag_cache=ETagCache(tmp_path / "etags.json"),
+            observer=lambda stats: queries.append(parse_qs(urlparse(stats.url).query)["q"][0]),
+        )
+        watermark = items[2200]["created_at"]
+        issues = client.search_issues(f"hackernews created:>={watermark}", limit=2500, order="asc")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert all(query.count("created:") == 1 for query in queries)
+    assert len({query for query in queries}) > 1
+    newer = [item["id"] for item in reversed(items[:2201])]
+    assert list(dict.fromkeys(issue["id"] for issue in issues)) == newer
+
+
+def test_created_window_merges_the_watermark():
+    assert created_window("hn", "desc", "B") == "hn created:<=B"
+    assert created_window("hn created:>=A", "asc", "B") == "hn created:>=B"
+    assert created_window("hn created:>=A", "desc", "B") == "hn created:A..B"
+    with pytest.raises(ValueError):
+        created_window("hn created:>A", "asc", "B")
+
+
+def test_retry_after_seconds_or_http_date():
+    assert retry_after_seconds("3") == 3.0
+    assert retry_after_seconds(formatdate(time.time() + 30, usegmt=True)) == pytest.approx(30, abs=2)
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds("") is None
@@ -0,0 +1,34 @@
+"""queries.QUERIES on migrated and pre-rollup databases."""
+
+import sqlite3
+
+import pytest
+
+from engines import fetch_sqlite
+from queries import QUERIES, ROLLUP_TABLES, missing_rollups
+
+FALLBACK_QUERIES = [query.name for query in QUERIES if query.fallback_sql is not None]
+
+
+def connect(db_path):
+    return sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+
+
+def test_missing_rollups(legacy_db, hn_db):
+    with connect(legacy_db) as legacy, connect(hn_db) as migrated:
+        assert missing_rollups(legacy) == list(ROLLUP_TABLES)
+        assert missing_rollups(migrated) == []
+        assert QUERIES.validate(legacy, fallback=True) == {}
+        assert set(QUERIES.validate(legacy)) == set(FALLBACK_QUERIES)
+
+
+@pytest.mark.parametrize("query_name", FALLBACK_QUERIES)
+@pytest.mark.parametrize("args", [{}, {"days": "30", "limit": "3", "min_comments": "1"}])
+def test_fallback_matches_rollups(legacy_db, hn_db, query_name, args):
+    query = QUERIES[query_name]
+    params = query.bind(query.parse(args))
+    with connect(legacy_db) as legacy, connect(hn_db) as migrated:
+        expected = fetch_sqlite(migrated, query.sql, params)
+        actual = fetch_sqlite(legacy, query.sql_for(fallback=True), params)
+    assert expected[1]
+    assert actual == expected
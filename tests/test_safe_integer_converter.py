@@ -0,0 +1,35 @@
+"""safe_int_series / safe_int_array match safe_int value for value."""
+
+import numpy as np
+import pytest
+
+from safe_integer_converter import safe_int, safe_int_array, safe_int_series
+
+CLEAN = ["12", b"12", b" 7 ", "3.9", "-4", "1e3", 5, 2.5, True]
+BAD = ["abc", b"x", b"\xff", "", None, float("nan")]
+
+
+def clamp(value):
+    return max(0, min(500, value))
+
+
+@pytest.mark.parametrize("values", [CLEAN, CLEAN + BAD, [b"12", b"-3"]], ids=["clean", "mixed", "bytes"])
+@pytest.mark.parametrize("default", [0, None])
+def test_series_matches_scalar(values, default):
+    expected = [safe_int(value, default, transform=clamp, log=False) for value in values]
+    expected_failed = [safe_int(value, log=False) is None for value in values]
+
+    series, failed, _ = safe_int_series(values, default=default, lower=0, upper=500)
+    assert series.astype(object).where(series.notna(), None).tolist() == expected
+    assert failed.tolist() == expected_failed
+
+    if default is not None:
+        array, failed, _ = safe_int_array(np.array(values, dtype=object), default=default, lower=0, upper=500)
+        assert array.tolist() == expected
+        assert failed.tolist() == expected_failed
+
+
+def test_bytes_are_decoded():
+    assert safe_int(b"12", 0) == 12
+    assert safe_int(b"12", 0, log=False) == 12
+    assert safe_int(b"\xff", 0) == 0
@@ -0,0 +1,92 @@
+"""stream_etl / run_etl incremental runs against the local GitHub stub server."""
+
+import sqlite3
+import threading
+
+import pytest
+
+import etl_hn_github
+import parquet_store
+from db_pool import database_fingerprint
+from github_client import ETagCache, GitHubSearchClient
+from github_stub_server import make_stub_server, synthesize_issues
+from run_report import runs_db_path
+
+
+@pytest.fixture
+def stub():
+    server = make_stub_server([])
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def no_parquet(monkeypatch):
+    monkeypatch.setattr(parquet_store, "PARQUET_MODE", "0")
+
+
+def run_stream(server, db_path, incremental=True, limit=100):
+    client = GitHubSearchClient(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}",
+        etag_cache=ETagCache(),
+    )
+    return etl_hn_github.stream_etl(limit, db_path, incremental=incremental, chunk_size=50, client=client)
+
+
+def loaded_ids(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return {row[0] for row in conn.execute("SELECT id FROM hn_posts")}
+    finally:
+        conn.close()
+
+
+def test_run_stopped_by_limit_leaves_no_gap(stub, tmp_path):
+    db_path = str(tmp_path / "hn_posts.db")
+    issues = synthesize_issues(600)  # newest first
+    stub.RequestHandlerClass.state.items = issues[500:]
+    assert run_stream(stub, db_path, incremental=False) == 100
+
+    # 500 newer issues appear; each incremental run stops at the limit
+    stub.RequestHandlerClass.state.items = issues
+    assert run_stream(stub, db_path) == 100
+
+    watermark = etl_hn_github.read_watermark(db_path)
+    expected = {
+        issue["id"] for issue in issues
+        if issue["created_at"] <= etl_hn_github.to_github_timestamp(watermark)
+    }
+    assert loaded_ids(db_path) == expected
+
+    for _ in range(10):
+        if run_stream(stub, db_path) <= 1:  # only the watermark issue itself
+            break
+    assert loaded_ids(db_path) == {issue["id"] for issue in issues}
+
+
+@pytest.mark.parametrize("stream", [False, True])
+def test_run_without_changes_leaves_the_served_db_alone(stub, tmp_path, monkeypatch, stream):
+    db_path = str(tmp_path / "hn_posts.db")
+    stub.RequestHandlerClass.state.items = synthesize_issues(150)
+    monkeypatch.setenv("GITHUB_API_URL", f"http://127.0.0.1:{stub.server_address[1]}")
+    monkeypatch.setattr(etl_hn_github, "ETAG_CACHE_PATH", None)
+    etl_hn_github.run_etl(limit=200, db_path=db_path, incremental=False, stream=stream, report_path=None)
+
+    # A reader keeps the WAL alive, as serve_hn's pool does
+    reader = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    try:
+        fingerprint = database_fingerprint(db_path)
+        # Only the watermark issue itself comes back, unchanged
+        report = etl_hn_github.run_etl(limit=200, db_path=db_path, stream=stream, report_path=None)
+        assert report["status"] == "ok"
+        assert database_fingerprint(db_path) == fingerprint
+    finally:
+        reader.close()
+
+    runs = sqlite3.connect(runs_db_path(db_path))
+    try:
+        assert runs.execute("SELECT COUNT(*) FROM etl_runs").fetchone()[0] == 2
+    finally:
+        runs.close()
@@ -1,20 +1,81 @@
-import pandas as pd 
-import logging 
-from pathlib import Path 
+import csv
+import numpy as np
+import pandas as pd
+import logging
+from pathlib import Path
+
+from mmap_csv import MmapCsvReader
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# pd.read_csv's default missing-value tokens, so dropna() behaves as before
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+]
+
+def price_is_integer(path: Path) -> bool:
+    """
+    True when read_csv would infer an integer price column for the whole
+    file (every value an integer, none missing). to_csv then writes prices
+    as "10"; otherwise every price is a float ("10.0").
+    """
+    with MmapCsvReader(path) as reader:
+        for batch in reader:
+            prices = pd.to_numeric(pd.Series(batch.columns["price"]), errors="coerce")
+            if prices.dtype.kind not in "iu":
+                return False
+    return True
+
+
 def day4_clean_sales(input_file: str, output_file: str) -> None:
     """
-    Day 4: Pandas class -> production function. 
+    Day 4: Pandas class -> production function.
+
+    Streams the input as mmapped column batches and appends each cleaned
+    batch to the output, so memory stays flat on multi-GB exports. Columns
+    other than price are written as read (no int -> float upcasting);
+    rows with the wrong number of fields are dropped. The price format is
+    chosen once for the whole file (price_is_integer, an extra read pass),
+    so it does not depend on which batch a row lands in.
     """
     path = Path(input_file)
     if not path.exists():
         raise FileNotFoundError(f"{input_file} missing")
-    
-    df = pd.read_csv(input_file)
-    df = df.dropna()
-    df["price"] = pd.to_numeric(df["price"], errors="coerce")
-    df.to_csv(output_file, index=False)
-    logger.info(f"Day 4 cleaned: {input_file} -> {output_file}")
\ No newline at end of file
+
+    kept = dropped = 0
+    with MmapCsvReader(path) as reader:
+        # Checked before the output is opened: a bad input leaves no file behind
+        if reader.fieldnames is None:
+            raise ValueError(f"{input_file} is empty")
+        if "price" not in reader.fieldnames:
+            raise KeyError("price")
+        integer_prices = price_is_integer(path)
+
+        with open(output_file, "w", newline="", encoding="utf-8") as out:
+            writer = csv.writer(out, lineterminator="\n")
+            writer.writerow(reader.fieldnames)
+
+            for batch in reader:
+                columns = batch.columns
+                # None only pads ragged rows, which are dropped anyway
+                missing = np.zeros(len(batch), dtype=bool)
+                missing[list(batch.ragged)] = True
+                for values in columns.values():
+                    missing |= pd.Series(values).isin(NA_VALUES).to_numpy()
+                keep = ~missing
+
+                cleaned = {name: values[keep] for name, values in columns.items()}
+                price = pd.to_numeric(pd.Series(cleaned["price"]), errors="coerce")
+                if not integer_prices:
+                    price = price.astype(float)
+                # Written like to_csv: float repr, NaN as an empty field
+                cleaned["price"] = price.astype(object).where(price.notna(), None).to_numpy()
+
+                writer.writerows(zip(*(values.tolist() for values in cleaned.values())))
+                kept += int(keep.sum())
+                dropped += int(missing.sum())
+
+    logger.info(f"Day 4 cleaned: {input_file} -> {output_file} ({kept} rows, {dropped} dropped)")
@@ -8,11 +8,25 @@ from pathlib import Path
 from typing import List, Dict
 import pandas as pd 
 from row_validation import read_and_validate_csv
-from safe_integer_converter import safe_int
+from safe_integer_converter import safe_int_series
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def clean_rows(valid_rows: List[Dict]) -> pd.DataFrame: 
+    """
+    Validated rows -> cleaned frame (adds price_int, negatives clamped to 0).
+    Shared by production_csv_pipeline and the batch_pipeline workers.
+    """
+    df = pd.DataFrame(valid_rows)
+    if df.empty: 
+        return df
+
+    df["price_int"], _, counts = safe_int_series(df["price"], default=0, lower=0)
+    logger.info(f"price_int: {counts}")
+    return df
+
+
 def production_csv_pipeline(
         raw_csv: str,
         cleaned_csv: str,
@@ -27,17 +41,15 @@ def production_csv_pipeline(
         Path(raw_csv), 
         required_headers=["id", "price"], 
         required_non_empty=["id"], 
-        int_fields=["price"]
+        int_fields=["price"], 
+        engine="pandas"
     )
 
     if errors: 
         logger.warning(f"Skipped {len(errors)} invalid rows")
 
     # Safe integer conversion 
-    df = pd.DataFrame(valid_rows)
-    df["price_int"] = df["price"].apply(
-        lambda x: safe_int(x, default=0, transform= lambda v: max(0,v))
-    )
+    df = clean_rows(valid_rows)
 
     # Save Cleaned + Generate HN data
     df.to_csv(cleaned_csv, index=False)
@@ -2,21 +2,47 @@
 Docstring for week_1.generate_hn_data
 
 Day 8: HN Dataset Gnerator using Day 3 CSV pipeline + synthetic HN data. 
-Production Upgrade: logging, pathlib, specific exceptions, type hints. 
+Production Upgrade: logging, pathlib, specific exceptions, type hints.
+Scale-out: seeded, column-at-a-time generation in chunks, written straight
+to CSV, Parquet (needs pyarrow) or the etlpipeline hn_posts table.
+
+Usage:
+    python generate_hn_data.py --rows 10000000 --format sqlite data/output/hn_10m.db
+    python generate_hn_data.py --rows 112000 --seed 7 data/output/hn_112k.csv
 """
 
 
-import logging 
-import csv 
-from pathlib import Path 
-from typing import List, Dict
-import numpy as np 
+import argparse
+import logging
+import csv
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator, List, Dict, Optional, Union
+import numpy as np
+import pandas as pd
+
+from mmap_csv import MmapCsvReader
 
 # for use throughout the code ✅ ❌
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+ETL_DIR = Path(__file__).resolve().parent.parent / "etlpipeline" / "etl"
+
+HN_COLUMNS = ["id", "title", "user", "score", "comments", "domain", "created_at"]
+FORMATS = ("csv", "parquet", "sqlite")
+DOMAINS = ["hn.com", "github.com", "reddit.com"]
+TITLE_PREFIXES = ["Show HN: ", "Ask HN: ", "Launch HN: ", "Tell HN: ", ""]
+TITLE_TOPICS = [
+    "SQLite", "Postgres", "Rust", "Python", "pandas", "WebAssembly", "LLMs",
+    "Kubernetes", "DuckDB", "Parquet", "CSV parsing", "Linux", "compilers",
+    "static sites", "self-hosting", "ETL pipelines",
+]
+DEFAULT_CHUNK_ROWS = 1_000_000
+
 def extract_csv(input_file: str) -> List[Dict[str, str]]:
     """
     Docstring for extract_csv
@@ -45,33 +71,146 @@ def extract_csv(input_file: str) -> List[Dict[str, str]]:
         raise
 
 
-def generate_rows(rows: List[Dict[str, str]], target_rows: int = 1000) -> List[Dict[str, str]]:
+def count_csv_rows(input_file: Path) -> int:
     """
-    Docstring for generate_rows
-    
-    Transform sales data -> realistic HN dataset (Day 8 Deliverable)
+    Count data rows via mmap_csv (no per-row dicts; the generator only
+    needs how many source rows there are, not their contents).
+    """
+    if not input_file.exists():
+        raise FileNotFoundError(f"Week 1 pipeline missing: {input_file}")
+
+    with MmapCsvReader(input_file) as reader: 
+        count = reader.count_rows()
+
+    logger.info(f"Counted {count} rows in {input_file}")
+    return count
+
+
+def _user_weights(users: int, skew: float) -> Optional[np.ndarray]:
+    """Zipf-like activity: user_k posts (k + 1) ** -skew as often as user_0; 0 = uniform."""
+    if skew <= 0:
+        return None
+    weights = np.arange(1, users + 1, dtype=np.float64) ** -skew
+    return weights / weights.sum()
+
+
+def _titles(ids: np.ndarray, rng: np.random.Generator, repost_rng: np.random.Generator,
+            pool: Optional[np.ndarray], duplicate_rate: float) -> np.ndarray:
+    """
+    Unique "<prefix><topic> #<id>" titles, ~duplicate_rate of them replaced by pool reposts.
+
+    One draw per row from each generator, so where chunks start does not
+    change the stream (two draws from one generator would interleave).
+    """
+    count = len(ids)
+    combo = rng.integers(0, len(TITLE_PREFIXES) * len(TITLE_TOPICS), count)
+    prefixes = np.array(TITLE_PREFIXES, dtype=object)[combo // len(TITLE_TOPICS)]
+    topics = np.array(TITLE_TOPICS, dtype=object)[combo % len(TITLE_TOPICS)]
+    titles = prefixes + topics + " #" + ids.astype(str).astype(object)
+
+    # u < duplicate_rate marks a repost; u / duplicate_rate picks its pool title
+    u = repost_rng.random(count)
+    reposts = u < duplicate_rate
+    if reposts.any():
+        picks = (u[reposts] / duplicate_rate * len(pool)).astype(np.int64)
+        titles[reposts] = pool[picks]
+    return titles
+
+
+def iter_hn_frames(
+        rows: int,
+        seed: Optional[int] = None,
+        chunk_rows: int = DEFAULT_CHUNK_ROWS,
+        users: int = 50,
+        user_skew: float = 0.0,
+        duplicate_rate: float = 0.05,
+        title_pool: int = 1000,
+        days: int = 30,
+        end: Optional[datetime] = None
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a synthetic HN dataset of `rows` rows as DataFrames of <= chunk_rows.
+
+    Each column is drawn a whole chunk at a time from its own
+    numpy.random.Generator (all spawned from `seed`), so a seed (with a
+    fixed `end`) gives the same data for any chunk_rows, and memory depends
+    on chunk_rows only.
+
+    Columns (HN_COLUMNS): id 1..rows; user among `users` (user_skew > 0
+    makes a few users dominate); comments ~ Poisson(3) + 1; score ~
+    Exp(20) + 1; domain; created_at (UTC) spread evenly over the `days`
+    before `end` (default: now, so serve_hn's date('now') windows have
+    rows), nondecreasing in id; title, where ~duplicate_rate of
+    rows reuse one of `title_pool` repost titles and the rest are unique.
+
+    Raises:
+        ValueError: Negative rows, chunk_rows/users/title_pool/days < 1,
+            duplicate_rate outside [0, 1]
     """
-    cleaned = []
+    if rows < 0:
+        raise ValueError(f"rows must be >= 0, got {rows}")
+    if min(chunk_rows, users, title_pool, days) < 1:
+        raise ValueError("chunk_rows, users, title_pool and days must be >= 1")
+    if not 0 <= duplicate_rate <= 1:
+        raise ValueError(f"duplicate_rate must be in [0, 1], got {duplicate_rate}")
+
+    (user_rng, comment_rng, score_rng, domain_rng, time_rng,
+     title_rng, repost_rng, pool_rng) = map(np.random.default_rng, np.random.SeedSequence(seed).spawn(8))
 
-    for i in range(min(target_rows, len(rows))):
-        row = rows[i]
+    user_names = pd.Index([f"user_{k}" for k in range(users)])
+    weights = _user_weights(users, user_skew)
+    pool = "Repost: " + _titles(np.arange(1, title_pool + 1), pool_rng, pool_rng, None, 0.0)
 
-         
-        new_row = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+    if end is None:
+        end = datetime.now(timezone.utc)
+    span = days * 86400
+    start = int(end.timestamp()) - span
+    step = span / max(rows, 1)
 
-        hn_row = {
-            'id': str(i + 1), 
-            'user': f"user_{np.random.randint(0, 50)}",   # 50 Active users
-            'comments': str(np.random.poission(3) + 1),   # HN comment distribution
-            'score': str(int(np.random.exponential(20) + 1)),    # HN score curve
-            'domain': np.random.choice(['hn.com', 'github.com', 'reddit.com'])
+    for first in range(0, rows, chunk_rows):
+        count = min(chunk_rows, rows - first)
+        ids = np.arange(first + 1, first + count + 1, dtype=np.int64)
+        # id slot + jitter inside it, truncated to the second
+        offsets = ((ids - 1) * step + time_rng.uniform(0, step, count)).astype(np.int64)
 
-        }
+        # Keys in HN_COLUMNS order (columns= would box every value to object)
+        yield pd.DataFrame({
+            "id": ids,
+            "title": _titles(ids, title_rng, repost_rng, pool, duplicate_rate),
+            "user": pd.Categorical.from_codes(
+                user_rng.choice(users, size=count, p=weights), categories=user_names
+            ),
+            "score": (score_rng.exponential(20, count) + 1).astype(np.int32),
+            "comments": (comment_rng.poisson(3, count) + 1).astype(np.int32),
+            "domain": pd.Categorical.from_codes(
+                domain_rng.integers(0, len(DOMAINS), count), categories=DOMAINS
+            ),
+            "created_at": pd.to_datetime(start + offsets, unit="s", utc=True),
+        })
 
-        if hn_row.get("id"):
-            cleaned.append(hn_row)
 
-    logger.info(f"Generated {len(cleaned)} HN rows from {len(rows)} sales rows")
+def generate_rows(rows: Union[List[Dict[str, str]], int], target_rows: int = 1000,
+                  seed: Optional[int] = None) -> List[Dict[str, str]]:
+    """
+    Docstring for generate_rows
+    
+    Transform sales data -> realistic HN dataset (Day 8 Deliverable)
+
+    rows: extracted source rows, or just their count (see count_csv_rows)
+    Returns min(target_rows, source rows) rows of str values (iter_hn_frames
+    columns); use iter_hn_frames / generate_hn_dataset for larger datasets.
+    """
+    source_rows = rows if isinstance(rows, int) else len(rows)
+    count = min(target_rows, source_rows)
+
+    frame = next(iter_hn_frames(count, seed=seed, chunk_rows=max(count, 1)), None)
+    if frame is None:
+        cleaned = []
+    else:
+        frame = frame.assign(created_at=format_created_at(frame["created_at"]))
+        cleaned = frame.astype(str).to_dict("records")
+
+    logger.info(f"Generated {len(cleaned)} HN rows from {source_rows} sales rows")
     return cleaned
 
 def save_csv(rows: List[Dict[str, str]], output_file: str) -> None: 
@@ -108,20 +247,181 @@ def save_csv(rows: List[Dict[str, str]], output_file: str) -> None:
     except Exception as e:
         print(f"Error while saving CSV: {e}")
 
-def generate_dataset(input_file: Path, output_file: Path, target_rows: int = 1000) -> None:
+def format_created_at(created_at: pd.Series) -> np.ndarray:
+    """
+    UTC timestamps -> "YYYY-MM-DD HH:MM:SS+00:00" str objects, as
+    str(Timestamp) and the hn_posts table write them.
+
+    Built on fixed-width code points instead of per-value strftime,
+    which is ~20x slower and dominates CSV/SQLite output otherwise.
+    """
+    iso = np.datetime_as_string(
+        created_at.dt.tz_convert(None).to_numpy().astype("datetime64[s]")
+    ).astype("U19")  # "YYYY-MM-DDTHH:MM:SS"
+    out = np.empty((len(iso), 25), dtype=np.uint32)
+    out[:, :19] = iso.view(np.uint32).reshape(-1, 19)
+    out[:, 10] = ord(" ")
+    out[:, 19:] = np.array(["+00:00"]).view(np.uint32)
+    return out.view("U25").ravel().astype(object)
+
+
+def write_csv(frames: Iterable[pd.DataFrame], output_file: Path) -> int:
+    """Append each frame to one CSV (header once); created_at as "YYYY-MM-DD HH:MM:SS+00:00"."""
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    with open(output_file, mode="w", newline="", encoding="utf-8") as f:
+        for frame in frames:
+            frame = frame.assign(created_at=format_created_at(frame["created_at"]))
+            frame.to_csv(f, index=False, header=(total == 0))
+            total += len(frame)
+    return total
+
+
+def write_parquet(frames: Iterable[pd.DataFrame], output_file: Path) -> int:
+    """
+    Write each frame as a row group of one Parquet file (user/domain stay dictionary-encoded).
+
+    Raises:
+        ImportError: pyarrow is not installed
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet output needs pyarrow (pip install pyarrow)") from e
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    total = 0
+    writer = None
+    try:
+        for frame in frames:
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_file, table.schema)
+            writer.write_table(table)
+            total += len(frame)
+    finally:
+        if writer is not None:
+            writer.close()
+    return total
+
+
+def write_sqlite(frames: Iterable[pd.DataFrame], db_path: Path) -> int:
+    """
+    Upsert frames into the etlpipeline hn_posts table (domain is dropped).
+
+    Uses etl_hn_github's schema and upsert: one transaction per frame,
+    then one transaction that rebuilds the daily rollups and moves the
+    created_at watermark, so serve_hn can query the result directly.
+    """
+    if str(ETL_DIR) not in sys.path:
+        sys.path.insert(0, str(ETL_DIR))
+    import etl_hn_github as etl
+
+    conn = etl.connect_for_load(str(db_path))
+    total = 0
+    try:
+        for frame in frames:
+            rows = etl.to_rows(frame.assign(created_at=format_created_at(frame["created_at"])))
+            conn.execute("BEGIN IMMEDIATE")
+            conn.executemany(etl.UPSERT_HN_POSTS, rows)
+            conn.execute("COMMIT")
+            total += len(rows)
+            logger.info(f"Inserted {total} rows into {db_path}")
+
+        conn.execute("BEGIN IMMEDIATE")
+        etl.refresh_rollups(conn, None)
+        etl.advance_watermark(conn)
+        conn.execute("COMMIT")
+        etl.finish_load(conn)
+
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+
+    finally:
+        conn.close()
+
+    return total
+
+
+def parse_end(text: str) -> datetime:
+    """--end: an ISO date or datetime; naive values are taken as UTC."""
+    end = datetime.fromisoformat(text)
+    return end if end.tzinfo else end.replace(tzinfo=timezone.utc)
+
+
+WRITERS = {"csv": write_csv, "parquet": write_parquet, "sqlite": write_sqlite}
+
+
+def generate_hn_dataset(output: Path, rows: int, fmt: str = "csv", seed: Optional[int] = None,
+                        chunk_rows: int = DEFAULT_CHUNK_ROWS, **options) -> int:
+    """
+    Generate `rows` synthetic HN rows chunk by chunk straight into `output`.
+
+    fmt: "csv", "parquet" or "sqlite" (hn_posts table); options go to
+    iter_hn_frames. Returns the number of rows written.
+
+    Raises:
+        ValueError: Unknown fmt (or bad iter_hn_frames options)
+    """
+    if fmt not in WRITERS:
+        raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+
+    frames = iter_hn_frames(rows, seed=seed, chunk_rows=chunk_rows, **options)
+    total = WRITERS[fmt](frames, Path(output))
+    logger.info(f"✅ Generated {total} HN rows -> {output} ({fmt}, seed={seed})")
+    return total
+
+
+def generate_dataset(input_file: Path, output_file: Path, target_rows: int = 1000,
+                     seed: Optional[int] = None) -> None:
     """
     Docstring for generate_hn_dataset
     
     Day 8 pipeline: Day 3 CSV -> HN Dataset. 
     """
-    rows = extract_csv(input_file)
-    cleaned_rows = generate_rows(rows, target_rows)
+    source_rows = count_csv_rows(input_file)
+    cleaned_rows = generate_rows(source_rows, target_rows, seed)
     save_csv(cleaned_rows, output_file)
 
 
 if __name__ == "__main__": 
-    generate_dataset(
-        input_file = Path("week_1/data/input/week1_cleaned.csv"),
-        output_file = Path("data/input/hackernew.csv"),
-        target_rows=1000
-    )
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate a synthetic HN dataset")
+    parser.add_argument("output", nargs="?", type=Path,
+                        help="CSV/Parquet file or SQLite DB; omit for the Day 8 1000-row CSV")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--user-skew", type=float, default=0.0,
+                        help="Zipf exponent for posts per user; 0 = uniform")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05,
+                        help="share of rows reusing a repost title")
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--end", type=parse_end, default=None,
+                        help="latest created_at (ISO date/datetime, UTC); default: now")
+    args = parser.parse_args()
+
+    if args.output is None:
+        generate_dataset(
+            input_file = Path("week_1/data/input/week1_cleaned.csv"),
+            output_file = Path("data/input/hackernew.csv"),
+            target_rows=1000,
+            seed=args.seed
+        )
+    else:
+        generate_hn_dataset(
+            args.output,
+            args.rows,
+            fmt=args.format,
+            seed=args.seed,
+            chunk_rows=args.chunk_rows,
+            users=args.users,
+            user_skew=args.user_skew,
+            duplicate_rate=args.duplicate_rate,
+            days=args.days,
+            end=args.end,
+        )
@@ -1,5 +1,7 @@
 import csv
 import logging
+from collections import Counter
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Any, Iterable, Tuple, Optional 
 
@@ -8,6 +10,11 @@ logging.basicConfig(level=logging.INFO)
 class RowValidationError(ValueError):
     """Custom error for invalid row validation"""
 
+ENGINES = ("python", "pandas", "mmap")
+
+# What int(value.strip()) accepts: sign, digits, single underscores between digits
+INT_PATTERN = r"[+-]?\d+(?:_\d+)*"
+
 def validate_headers(required_headers: Iterable[str], actual_headers: Iterable[str]) -> None:
     """
     Validate that all required headers are present in the CSV file. 
@@ -159,6 +166,8 @@ def read_and_validate_csv(
         required_headers: Iterable[str],
         required_non_empty: Iterable[str], 
         int_fields: Iterable[str], 
+        engine: str = "python", 
+        chunksize: int = 100_000, 
 ) -> Tuple[List[Dict[str, Any]], List[str]]:
     """
     Docstring for read_vallidate_csv
@@ -181,6 +190,19 @@ def read_and_validate_csv(
         int_fields: Iterable[str]
             Columns that should be converted t integers. 
 
+        engine: str
+            "python" (default) validates one csv.DictReader row at a time
+            and logs every row. "pandas" reads `chunksize` rows at a time
+            and checks each column with vectorized masks (see
+            validate_frame); only failing rows get an error message and
+            logging is reduced to per-rule counts. "mmap" applies the same
+            checks to column batches from mmap_csv.MmapCsvReader, so the
+            file is never decoded or split into lists all at once. All
+            engines return the same rows and the same error messages.
+
+        chunksize: int
+            Rows per chunk for engine="pandas".
+
     Output: 
         Tuple[List[Dict[str, Any]], List[str]]
             - first element: list of validated and cleaned row dictionaries
@@ -191,7 +213,7 @@ def read_and_validate_csv(
             If the input CSV file does not exist. 
 
         ValueError: 
-            If required headers are missing. 
+            If required headers are missing or the engine is unknown. 
 
     Usage: 
         valid_rows, errors = read_and_validate_csv(
@@ -212,13 +234,37 @@ def read_and_validate_csv(
         logging.error(message)
         raise FileNotFoundError(message)
     
+    if engine not in ENGINES: 
+        message = f"Unknown engine '{engine}', expected one of: {', '.join(ENGINES)}"
+        logging.error(message)
+        raise ValueError(message)
 
     valid_rows: List[Dict[str, Any]] = []
     errors: List[str] = []
 
+    if engine == "mmap": 
+        try: 
+            from mmap_csv import MmapCsvReader
+        except ImportError:  # imported as week_1.row_validation
+            from week_1.mmap_csv import MmapCsvReader
+
+        with MmapCsvReader(input_path) as reader: 
+            return validate_column_batches(
+                reader, required_headers, required_non_empty, int_fields
+            )
 
     try: 
         with input_path.open(mode="r", encoding="utf-8", newline="") as csv_file:
+            if engine == "pandas": 
+                valid_rows, errors = validate_csv_stream(
+                    csv_file, 
+                    required_headers, 
+                    required_non_empty, 
+                    int_fields, 
+                    chunksize, 
+                )
+                return valid_rows, errors
+
             reader = csv.DictReader(csv_file)
             
             if reader.fieldnames is None:
@@ -259,6 +305,309 @@ def read_and_validate_csv(
         len(valid_rows), 
         len(errors),
     )
-    return valid_rows, errors 
+    return valid_rows, errors
 
 
+def validate_frame(
+        frame: "pd.DataFrame", 
+        required_non_empty: Iterable[str], 
+        int_fields: Iterable[str], 
+        start_row: int = 1, 
+) -> Tuple[List[Dict[str, Any]], List[str], Counter]:
+    """
+    Vectorized validate_row for a whole block of rows.
+
+    Purpose: 
+        Apply the validate_row rules to every row of a DataFrame with
+        column masks instead of a Python loop: a row fails on the first
+        required field that is empty, otherwise on the first int field
+        that int() would reject. Error strings are only built for failing
+        rows, and nothing is logged per row.
+
+    Inputs: 
+        frame: pd.DataFrame
+            Raw string columns (None for missing values), one row per CSV
+            row, in file order.
+
+        required_non_empty: Iterable[str]
+            Columns that must not be empty after stripping whitespace. 
+
+        int_fields: Iterable[str]
+            Columns that should be parsed as integers if present. 
+
+        start_row: int
+            Row number of the first frame row, used in error messages.
+
+    Output: 
+        Tuple[List[Dict[str, Any]], List[str], Counter]
+            - first element: cleaned/typed row dicts for the valid rows
+            - second element: "Row N: ..." messages, in row order
+            - third element: failure counts per "field: rule"
+
+    Raises: 
+        None directly. Errors are returned like validate_row does.
+
+    Usage: 
+        rows, errors, counts = validate_frame(frame, ["id"], ["price"], start_row=1)
+    """
+    import numpy as np
+
+    failed = np.zeros(len(frame), dtype=bool)
+    errors: List[Tuple[int, str]] = []
+    counts: Counter = Counter()
+    stripped_ints = {}
+
+    def record(mask: np.ndarray, rule: str, message: Any, field: Optional[str] = None) -> None: 
+        """Attach `message` (or message(raw value of `field`)) to newly failing rows."""
+        positions = np.flatnonzero(mask & ~failed)
+        if not len(positions): 
+            return
+        counts[rule] += len(positions)
+        if field is None: 
+            errors.extend((position, message) for position in positions.tolist())
+        else: 
+            raw = frame[field].iloc[positions].tolist()
+            errors.extend(zip(positions.tolist(), map(message, raw)))
+
+    for field in required_non_empty: 
+        if field in frame.columns: 
+            column = frame[field]
+            empty = (column.isna() | (column.str.strip() == "")).to_numpy(dtype=bool)
+        else: 
+            empty = np.ones(len(frame), dtype=bool)
+
+        record(empty, f"{field}: required", f"Required field '{field}' is empty.")
+        failed |= empty
+
+    for field in int_fields: 
+        if field not in frame.columns: 
+            continue
+
+        stripped = frame[field].str.strip()
+        is_int = stripped.str.fullmatch(INT_PATTERN).fillna(False).to_numpy(dtype=bool)
+        empty = (stripped == "").to_numpy(dtype=bool)
+
+        record(empty, f"{field}: empty", f"Field '{field}' is empty and cannot be converted to int.")
+        failed |= empty
+
+        # str(None) == "None", which is what the row engine reports for a missing value
+        record(
+            ~is_int, 
+            f"{field}: invalid int", 
+            lambda value, field=field: f"Field '{field}' has invalid integer value: '{value}'.", 
+            field=field, 
+        )
+        failed |= ~is_int
+        stripped_ints[field] = stripped
+
+    valid = ~failed
+    columns = {name: frame[name][valid] for name in frame.columns}
+    for field, stripped in stripped_ints.items(): 
+        try: 
+            columns[field] = stripped[valid].astype(np.int64)
+        except (OverflowError, ValueError): 
+            columns[field] = stripped[valid].map(int)
+
+    # Plain dicts straight from column lists: DataFrame.to_dict boxes every value
+    names = list(columns)
+    rows = [
+        dict(zip(names, values))
+        for values in zip(*(column.tolist() for column in columns.values()))
+    ]
+
+    errors.sort(key=lambda error: error[0])
+    return (
+        rows, 
+        [f"Row {start_row + position}: {message}" for position, message in errors], 
+        counts, 
+    )
+
+
+def validate_csv_stream(
+        csv_file: Iterable[str], 
+        required_headers: Iterable[str], 
+        required_non_empty: Iterable[str], 
+        int_fields: Iterable[str], 
+        chunksize: int = 100_000, 
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    engine="pandas" body of read_and_validate_csv, for any open text stream.
+
+    Tokenizes with csv.reader (same dialect and quoting as DictReader) and
+    validates runs of well-formed rows with validate_frame. Rows whose
+    field count differs from the header are rare and keep DictReader
+    semantics (restval None / extras under the None key) via validate_row.
+    Also used by batch_pipeline on in-memory shards (header + byte range).
+    """
+    import pandas as pd
+
+    required_non_empty = list(required_non_empty)
+    int_fields = list(int_fields)
+
+    if chunksize < 1: 
+        message = "chunksize must be >= 1"
+        logging.error(message)
+        raise ValueError(message)
+
+    reader = csv.reader(csv_file)
+    fieldnames = next(reader, None)
+
+    if fieldnames is None:
+        message = "CSV file has no header row."
+        logging.error(message)
+        raise ValueError(message)
+    
+    validate_headers(required_headers, fieldnames)
+
+    # DictReader keeps the last value of a repeated header name
+    last_index = {name: index for index, name in enumerate(fieldnames)}
+    columns = list(last_index)
+    positions = list(last_index.values())
+    width = len(fieldnames)
+
+    valid_rows: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    counts: Counter = Counter()
+    row_number = 0
+
+    def flush(block: List[List[str]], start_row: int) -> None: 
+        if not block: 
+            return
+        frame = pd.DataFrame(block, dtype=object)
+        frame = frame.iloc[:, positions].set_axis(columns, axis=1)
+        rows, block_errors, block_counts = validate_frame(
+            frame, required_non_empty, int_fields, start_row=start_row
+        )
+        valid_rows.extend(rows)
+        errors.extend(block_errors)
+        counts.update(block_counts)
+
+    while True: 
+        chunk = list(islice(reader, chunksize))
+        if not chunk: 
+            break
+
+        block_start = row_number + 1
+        if all(len(fields) == width for fields in chunk): 
+            # Common case: no blank or ragged lines in this chunk
+            row_number += len(chunk)
+            flush(chunk, block_start)
+            continue
+
+        block: List[List[str]] = []
+        for fields in chunk: 
+            if not fields: 
+                continue  # DictReader skips blank lines without numbering them
+            row_number += 1
+
+            if len(fields) == width: 
+                block.append(fields)
+                continue
+
+            flush(block, block_start)
+            block = []
+            block_start = row_number + 1
+
+            _validate_ragged_row(
+                fieldnames, fields, row_number, required_non_empty, int_fields, 
+                valid_rows, errors, counts, 
+            )
+
+        flush(block, block_start)
+
+    _log_summary(valid_rows, errors, counts)
+    return valid_rows, errors
+
+
+def validate_column_batches(
+        reader: "MmapCsvReader", 
+        required_headers: Iterable[str], 
+        required_non_empty: Iterable[str], 
+        int_fields: Iterable[str], 
+) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    engine="mmap" body of read_and_validate_csv.
+
+    Same rules and messages as validate_csv_stream, but fed by
+    mmap_csv.MmapCsvReader: each ColumnBatch becomes a DataFrame without
+    going through per-row lists, and the decoded file is never held in
+    memory at once. Ragged records (rare) still go through validate_row.
+    """
+    import pandas as pd
+
+    required_non_empty = list(required_non_empty)
+    int_fields = list(int_fields)
+
+    if reader.fieldnames is None:
+        message = "CSV file has no header row."
+        logging.error(message)
+        raise ValueError(message)
+    
+    validate_headers(required_headers, reader.fieldnames)
+
+    valid_rows: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    counts: Counter = Counter()
+
+    for batch in reader: 
+        frame = pd.DataFrame(batch.columns)
+        run_start = 0
+
+        # Regular runs in between ragged records, in file order
+        for position in sorted(batch.ragged) + [len(batch)]: 
+            if position > run_start: 
+                rows, run_errors, run_counts = validate_frame(
+                    frame.iloc[run_start:position], required_non_empty, int_fields, 
+                    start_row=batch.start_row + run_start, 
+                )
+                valid_rows.extend(rows)
+                errors.extend(run_errors)
+                counts.update(run_counts)
+
+            if position < len(batch): 
+                _validate_ragged_row(
+                    reader.fieldnames, batch.ragged[position], batch.start_row + position, 
+                    required_non_empty, int_fields, valid_rows, errors, counts, 
+                )
+            run_start = position + 1
+
+    _log_summary(valid_rows, errors, counts)
+    return valid_rows, errors
+
+
+def _validate_ragged_row(
+        fieldnames: List[str], 
+        fields: List[str], 
+        row_number: int, 
+        required_non_empty: List[str], 
+        int_fields: List[str], 
+        valid_rows: List[Dict[str, Any]], 
+        errors: List[str], 
+        counts: Counter, 
+) -> None:
+    """validate_row on the dict csv.DictReader would build for a record of the wrong width."""
+    width = len(fieldnames)
+    row: Dict[Optional[str], Any] = dict(zip(fieldnames, fields))
+    if len(fields) > width: 
+        row[None] = fields[width:]
+    else: 
+        row.update((name, None) for name in fieldnames[len(fields):])
+
+    is_valid, cleaned_row, error = validate_row(row, required_non_empty, int_fields)
+    if is_valid and cleaned_row is not None: 
+        valid_rows.append(cleaned_row)
+    else: 
+        errors.append(f"Row {row_number}: {error}")
+        counts["ragged row"] += 1
+
+
+def _log_summary(valid_rows: List[Dict[str, Any]], errors: List[str], counts: Counter) -> None:
+    """One warning per failing rule instead of one log line per row."""
+    for rule, count in sorted(counts.items()): 
+        logging.warning("Validation failures (%s): %d rows", rule, count)
+
+    logging.info(
+        "Finished validation. Valid rows: %d, Errors: %d", 
+        len(valid_rows), 
+        len(errors),
+    )
@@ -1,13 +1,42 @@
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, Dict, Tuple
 import logging 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+def _text(value: Any) -> Any: 
+    """Bytes decoded as UTF-8 (like float(b"12") does), anything else unchanged."""
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def _parse_int(value: Any) -> int: 
+    """
+    The safe_int conversion rules with no logging and no default handling.
+
+    Raises TypeError / ValueError (and OverflowError for "inf") on bad input.
+    """
+    value = _text(value)
+    if isinstance(value, str):
+        return int(float(value.strip()))
+    return int(value)  # floats truncate
+
+
+def _float_or_nan(value: Any) -> float: 
+    """_parse_int before truncation, NaN instead of raising (safe_int_series fallback)."""
+    try: 
+        value = _text(value)
+        if isinstance(value, str): 
+            return float(value.strip())
+        return float(int(value)) if not isinstance(value, float) else value
+    except (TypeError, ValueError, OverflowError): 
+        return float("nan")
+
+
 def safe_int(
         value: Any, 
         default: Optional[int] = None,
-        transform: Optional[Callable[[int], int]] = None 
+        transform: Optional[Callable[[int], int]] = None, 
+        log: bool = True
 ) -> Optional[int]:
     
     """
@@ -31,6 +60,10 @@ def safe_int(
             Optional callable applied to the successfully parsed integer 
             (e.g., to clamp to a range or apply business rules). 
 
+        log: 
+            False skips every logging call (hot path for per-row use). For
+            whole columns prefer safe_int_series / safe_int_array.
+
 
     Output:
         Optional[int]:
@@ -53,6 +86,21 @@ def safe_int(
         safe_int("10", transform=lambda x: x if x >= 0 else 0) -> 10
     """
 
+    if not log: 
+        # Zero-logging hot path: same results, no LogRecord per call
+        if value is None: 
+            return default
+        try: 
+            parsed = _parse_int(value)
+        except (TypeError, ValueError): 
+            return default
+        if transform is None: 
+            return parsed
+        try: 
+            return transform(parsed)
+        except ValueError: 
+            return default
+
     if value is None:
         logger.info("safe_int received None, returning default.", extra={"default": default})
         return default 
@@ -60,15 +108,7 @@ def safe_int(
     try: 
 
         # Handle all types safely 
-        if isinstance(value, (str, bytes)):
-            cleaned = str(value).strip()
-            parsed = int(float(cleaned))
-
-        elif isinstance(value, float):
-            parsed = int(value) # Truncation
-
-        else:
-            parsed = int(value)
+        parsed = _parse_int(value)
 
         logger.info("Successfully parsed value to int.", extra={"raw_value": value, "parsed": parsed})
 
@@ -99,6 +139,106 @@ def safe_int(
         raise
 
 
+def safe_int_series(
+        values: Any, 
+        default: Optional[int] = None, 
+        lower: Optional[int] = None, 
+        upper: Optional[int] = None
+) -> Tuple["pd.Series", "np.ndarray", Dict[str, int]]:
+    """
+    Vectorized safe_int for a whole column.
+
+    Purpose: 
+        Convert a column in a few array operations instead of one safe_int
+        call (and several log records) per value. Values are parsed with
+        a single astype(float64) and truncated like int(float(...)); if any
+        value is rejected, the column is re-parsed once with the scalar
+        rules (no logging), so the result matches safe_int value for value.
+
+    Inputs: 
+        values: 
+            pd.Series, np.ndarray or any sequence (str, bytes, int, float, None).
+
+        default: 
+            Returned for values that fail to parse. None gives a nullable
+            Int64 result with <NA> there; otherwise the result is int64.
+
+        lower / upper: 
+            Optional clamp applied to successfully parsed values (the array
+            form of transform=lambda v: max(lower, min(upper, v))). The
+            default is not clamped, matching safe_int.
+
+    Output: 
+        Tuple[pd.Series, np.ndarray, Dict[str, int]]
+            - converted values (same index as a Series input)
+            - boolean mask of values that fell back to `default`
+            - counts: total, parsed, missing, invalid, clamped
+
+    Raises: 
+        None. Unparseable values (including inf and values outside int64)
+        count as invalid instead of raising.
+
+    Examples: 
+        ints, failed, counts = safe_int_series(df["price"], default=0, lower=0)
+    """
+    import numpy as np
+    import pandas as pd
+
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    missing = series.isna().to_numpy(dtype=bool)
+
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series): 
+        numeric = series.astype(np.float64).to_numpy()
+        exact = series.astype(np.int64).to_numpy() if not missing.any() else None
+    else: 
+        try: 
+            # float() per element in C: strips whitespace, like the scalar path
+            numeric = series.astype(np.float64).to_numpy()
+        except (TypeError, ValueError): 
+            # Some values are bad: one pass with the scalar rules, NaN marks failures
+            numeric = np.fromiter(map(_float_or_nan, series), dtype=np.float64, count=len(series))
+        exact = None
+
+    numeric = np.trunc(numeric)
+    failed = ~np.isfinite(numeric) | (np.abs(numeric) >= 2**63)
+    parsed = np.where(failed, 0, numeric).astype(np.int64) if exact is None else exact
+
+    clamped = np.zeros(len(parsed), dtype=bool)
+    if lower is not None or upper is not None: 
+        bounded = np.clip(parsed, lower, upper)
+        clamped = (bounded != parsed) & ~failed
+        parsed = bounded
+
+    if default is None: 
+        result = pd.Series(pd.array(parsed, dtype="Int64"), index=series.index, name=series.name)
+        result[failed] = pd.NA
+    else: 
+        result = pd.Series(np.where(failed, default, parsed), index=series.index, name=series.name)
+
+    counts = {
+        "total": len(parsed), 
+        "parsed": int((~failed).sum()), 
+        "missing": int(missing.sum()), 
+        "invalid": int((failed & ~missing).sum()), 
+        "clamped": int(clamped.sum()), 
+    }
+    return result, failed, counts
+
+
+def safe_int_array(
+        values: Any, 
+        default: int = 0, 
+        lower: Optional[int] = None, 
+        upper: Optional[int] = None
+) -> Tuple["np.ndarray", "np.ndarray", Dict[str, int]]:
+    """
+    safe_int_series for plain arrays: returns an int64 ndarray (default
+    must be an int so failures have a value), the failure mask and counts.
+    """
+    result, failed, counts = safe_int_series(values, default=default, lower=lower, upper=upper)
+    return result.to_numpy(dtype="int64"), failed, counts
+
+
 if __name__ == "__main__":
 
     print("🧪 Testing safe_int...")
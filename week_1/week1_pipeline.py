@@ -16,7 +16,7 @@ logger = logging.getLogger(__name__)
 
 from week_1.row_validation import validate_headers, read_and_validate_csv
 
-from week_1.safe_integer_converter import safe_int
+from week_1.safe_integer_converter import safe_int_series
 
 def week1_master_pipeline(
         raw_csv: str, 
@@ -29,7 +29,7 @@ def week1_master_pipeline(
     """
 
     valid_rows, errors = read_and_validate_csv(
-        Path(raw_csv), required_headers, required_headers, int_fields
+        Path(raw_csv), required_headers, required_headers, int_fields, engine="pandas"
     )
 
     if errors: 
@@ -39,9 +39,8 @@ def week1_master_pipeline(
     df["price"] = pd.to_numeric(df["price"], errors ="coerce")
     df = df.dropna(subset=["price"])
 
-    df["price_int"] = df["price"].apply(
-        lambda x: safe_int(x, default=0, transform=lambda v: max(0, v))
-    )
+    df["price_int"], _, counts = safe_int_series(df["price"], default=0, lower=0)
+    logger.info(f"price_int: {counts}")
 
     Path(cleaned_csv). parent.mkdir(parents=True, exist_ok=True)
     df.to_csv(cleaned_csv, index=False)
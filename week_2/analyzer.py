@@ -1,12 +1,188 @@
 import logging 
+import sqlite3
+from datetime import datetime, timedelta, timezone
 from pathlib import Path 
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, List, Optional, Tuple, Union
 import pandas as pd 
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-def analyze_top_posts(csv_path: Path) -> Dict[str, pd.DataFrame]: 
+REQUIRED_COLUMNS = ["user", "comments", "score", "created_at"]
+TOP_K = 10
+# Default rows per chunk of the out-of-core mode (analyze_top_posts(chunksize=...))
+CHUNK_ROWS = 100_000
+
+PostsSource = Union[Path, pd.DataFrame, sqlite3.Connection]
+
+def read_posts(path: Path, columns: List[str], days: Optional[int] = None) -> pd.DataFrame: 
+    """
+    Read only `columns` from a CSV, a .parquet file or the etlpipeline
+    Parquet dataset (event_date=YYYY-MM-DD partitions, needs pyarrow).
+
+    days: dataset only; reads just the partitions of the last N days.
+    """
+    if path.is_dir(): 
+        filters = None
+        if days is not None: 
+            since = (datetime.now(timezone.utc).date() - timedelta(days=days)).isoformat()
+            filters = [("event_date", ">=", since)]
+        return pd.read_parquet(path, columns=columns, filters=filters)
+
+    if days is not None: 
+        raise ValueError("days needs the partitioned Parquet dataset (a directory)")
+    if path.suffix == ".parquet": 
+        return pd.read_parquet(path, columns=columns)
+    return pd.read_csv(path, usecols=lambda column: column in columns)
+
+
+def posts_query(columns: List[str], days: Optional[int] = None) -> Tuple[str, List[Any]]: 
+    """SELECT of `columns` from hn_posts (etlpipeline DB); days: only the last N days."""
+    query = f"SELECT {', '.join(columns)} FROM hn_posts"
+    params: List[Any] = []
+    if days is not None: 
+        query += " WHERE created_at >= date('now', ?)"
+        params.append(f"-{int(days)} days")
+    return query, params
+
+
+def read_posts_sql(connection: sqlite3.Connection, columns: List[str], days: Optional[int] = None) -> pd.DataFrame: 
+    """Read `columns` of hn_posts (etlpipeline DB); days: only the last N days."""
+    query, params = posts_query(columns, days)
+    return pd.read_sql_query(query, connection, params=params)
+
+
+def iter_posts(source: PostsSource, columns: List[str], days: Optional[int],
+               chunksize: int) -> Iterable[pd.DataFrame]: 
+    """
+    The analyzer's input in chunks of `chunksize` rows: a CSV in file
+    order, or hn_posts in created_at order (its index keeps that cheap).
+    """
+    if isinstance(source, sqlite3.Connection): 
+        query, params = posts_query(columns, days)
+        return pd.read_sql_query(f"{query} ORDER BY created_at", source, params=params, chunksize=chunksize)
+
+    if isinstance(source, pd.DataFrame) or source.is_dir() or source.suffix == ".parquet": 
+        raise ValueError("chunksize needs a CSV file or a DB connection")
+    if days is not None: 
+        raise ValueError("days needs a DB connection or the Parquet dataset")
+    return pd.read_csv(source, usecols=lambda column: column in columns, chunksize=chunksize)
+
+
+def load_posts(source: PostsSource, columns: List[str], days: Optional[int] = None) -> pd.DataFrame: 
+    """
+    The analyzer's input as a DataFrame: an already-loaded frame (used as
+    is, never modified), a hn_posts DB connection, or a file / dataset path.
+    """
+    if isinstance(source, pd.DataFrame): 
+        if days is not None: 
+            raise ValueError("days needs a DB connection or the Parquet dataset")
+        return source
+    if isinstance(source, sqlite3.Connection): 
+        return read_posts_sql(source, columns, days)
+    return read_posts(source, columns, days)
+
+
+def rank_top_users(df: pd.DataFrame, k: int = TOP_K) -> pd.DataFrame: 
+    """Users by total comments with a dense rank; top k picked with nlargest, not a full sort."""
+    return ranked_frame(df.groupby('user')['comments'].sum(), k)
+
+
+def ranked_frame(totals: pd.Series, k: int = TOP_K) -> pd.DataFrame: 
+    """
+    Per-user totals (user index) -> top k rows of user, comments, dense rank.
+
+    Same rows and index as the Day 9 sort_values version (index = the
+    user's position in user order), with equal totals ordered by user.
+    nlargest(keep='all') keeps every tie at the cut-off, so only those
+    rows are sorted.
+    """
+    top = totals.sort_index().reset_index().nlargest(k, 'comments', keep='all')
+    return (top.sort_values(['comments', 'user'], ascending=[False, True])
+            .head(k)
+            .assign(rank=lambda x: x["comments"].rank(ascending=False, method="dense")))
+
+
+def compute_score_growth(df: pd.DataFrame, k: int = TOP_K) -> pd.DataFrame: 
+    """
+    LAG(score) per user ordered by created_at, as one vectorized pass:
+    sort once by (user, created_at), then groupby shift/diff. Returns the
+    first k rows (by user, created_at) that have a previous post.
+    """
+    ordered = (df.assign(created_at=pd.to_datetime(df['created_at']))
+               .sort_values(['user', 'created_at'], kind='stable'))
+    scores = ordered.groupby('user', sort=False)['score']
+    ordered['prev_score'] = scores.shift(1)
+    ordered['score_growth'] = scores.diff()
+    return ordered.dropna(subset=['score_growth']).head(k)
+
+
+def analyze_chunks(chunks: Iterable[pd.DataFrame], k: int = TOP_K) -> Dict[str, pd.DataFrame]: 
+    """
+    Out-of-core analyze_top_posts: memory grows with distinct users, not rows.
+
+    - Per-user comment sums are merged chunk by chunk (sum is associative),
+      and the top k are picked from the final totals as in memory.
+    - LAG diffs cross chunk boundaries by carrying each user's last row
+      into the next chunk, where it is placed before that user's rows.
+    - The first k growth rows by (user, created_at) are kept as a running
+      k-row frame instead of collecting every row.
+
+    Within a chunk rows are ordered by created_at; across chunks a user's
+    rows follow input order, so input ordered by created_at (HN exports,
+    iter_posts on a DB) gives the in-memory results. Rows older than the
+    carried row are counted and logged.
+    """
+    totals: Optional[pd.Series] = None
+    carried: Optional[pd.DataFrame] = None
+    best: Optional[pd.DataFrame] = None
+    out_of_order = 0
+
+    for chunk in chunks: 
+        missing = set(REQUIRED_COLUMNS) - set(chunk.columns)
+        if missing: 
+            raise ValueError(f"Missing columns: {missing}")
+        if chunk.empty: 
+            continue
+
+        chunk_totals = chunk.groupby('user')['comments'].sum()
+        totals = chunk_totals if totals is None else pd.concat([totals, chunk_totals]).groupby(level=0).sum()
+
+        chunk = (chunk.assign(created_at=pd.to_datetime(chunk['created_at']), _carried=False)
+                 .sort_values(['user', 'created_at'], kind='stable'))
+        if carried is not None: 
+            chunk = pd.concat([carried[carried['user'].isin(chunk['user'])], chunk])
+            chunk = chunk.sort_values('user', kind='stable')
+
+        by_user = chunk.groupby('user', sort=False)
+        chunk['prev_score'] = by_user['score'].shift(1)
+        chunk['score_growth'] = by_user['score'].diff()
+        out_of_order += int((chunk['created_at'] < by_user['created_at'].shift(1)).sum())
+
+        last_rows = by_user.tail(1).assign(_carried=True)
+        carried = last_rows if carried is None else pd.concat(
+            [carried[~carried['user'].isin(last_rows['user'])], last_rows]
+        )
+
+        growth = chunk[~chunk['_carried']].dropna(subset=['score_growth']).head(k)
+        best = growth if best is None else (pd.concat([best, growth])
+                                            .sort_values(['user', 'created_at'], kind='stable')
+                                            .head(k))
+
+    if totals is None: 
+        raise ValueError("No rows to analyze")
+    if out_of_order: 
+        logger.warning(f"{out_of_order} rows older than the previous row of their user "
+                       f"in an earlier chunk: their LAG follows input order")
+
+    return {
+        'top_users_ranked': ranked_frame(totals, k), 
+        'score_growth': best.drop(columns='_carried') 
+    }
+
+
+def analyze_top_posts(csv_path: PostsSource, days: Optional[int] = None,
+                      chunksize: Optional[int] = None) -> Dict[str, pd.DataFrame]: 
     """
     Docstring for analyze_top_posts
     
@@ -14,7 +190,12 @@ def analyze_top_posts(csv_path: Path) -> Dict[str, pd.DataFrame]:
         EVOLVE Day 8 GROUP BY -> Window functions (RANK, LAG) on HN dat
 
     Inputs:  
-        csv_path: Path to Day 7 cleaned HN CSV (user, comments, score, date, ...)
+        csv_path: Path to Day 7 cleaned HN CSV (user, comments, score, date, ...),
+            the etlpipeline Parquet dataset (data/hn_posts_parquet), a
+            DataFrame already in memory, or a connection to hn_posts.db
+        days: Parquet dataset / DB connection only: analyze the last N days
+        chunksize: CSV / DB connection only: stream the input in chunks of
+            this many rows (analyze_chunks) instead of loading it whole
 
     Outputs: Dict with 'top_users_ranked' 'score_growth' DataFrames
 
@@ -24,46 +205,44 @@ def analyze_top_posts(csv_path: Path) -> Dict[str, pd.DataFrame]:
 
     Usage: 
         results = analyze_top_posts(Path("data/output/hn_clean.csv))
+        results = analyze_top_posts(Path("../etlpipeline/data/hn_posts_parquet"), days=7)
+        results = analyze_top_posts(sqlite3.connect("../etlpipeline/data/hn_posts.db"), days=7)
+        results = analyze_top_posts(Path("hn_export_50gb.csv"), chunksize=CHUNK_ROWS)
         logger.info(f"Window analysis: {len(results['top_users_ranked'])} users")
 
     Production Notes: 
         - Builds Day 8 analyzer -> adds Day 9 window functons
         - Input validation before pandas 
+        - Reads only the 4 needed columns (Parquet: + partition pruning)
+        - Vectorized groupby shift/diff (no per-user apply), nlargest top-k
+        - Optional chunked mode: flat RAM on inputs larger than memory
         - Specific try/except pandas errors
         - Single Responsibility: HN window analysis
     """
-    if not csv_path.exists():
-        logger.error(f"CSV not found: {csv_path}")
-        raise FileNotFoundError(f"CSV missing: {csv_path}")
-    
-    required_cols = ["user", "comments", "score", "created_at"]
-    
+    if isinstance(csv_path, Path) and not csv_path.exists():
+        logger.error(f"Input not found: {csv_path}")
+        raise FileNotFoundError(f"Input missing: {csv_path}")
+
     try: 
-        df = pd.read_csv(csv_path)
-        missing = set(required_cols) - set(df.columns)
+        if chunksize is not None: 
+            results = analyze_chunks(iter_posts(csv_path, REQUIRED_COLUMNS, days, chunksize))
+            logger.info(f"Window analysis complete (chunks of {chunksize}): "
+                        f"{len(results['top_users_ranked'])} ranked users")
+            return results
+
+        df = load_posts(csv_path, REQUIRED_COLUMNS, days)
+        missing = set(REQUIRED_COLUMNS) - set(df.columns)
         if missing: 
             raise ValueError(f"Missing columns: {missing}")
+        df = df[[column for column in df.columns if column in REQUIRED_COLUMNS]]
 
         # EVOLTUION 1: Day 8 GROUP BY -> Day 9 RANK window
-        top_users = (df.groupby('user')['comments']
-                     .sum()
-                     .reset_index()
-                     .assign(rank=lambda x: x["comments"].rank(ascending=False, method="dense"))
-                     .sort_values('comments', ascending=False)
-                     .head(10))
+        top_users = rank_top_users(df)
         
         # EVOLUTION 2: LAG score growth by user (Day 9 window skill)
-        df['created_at'] = pd.to_datetime(df['created_at'])
-        score_growth = (df.sort_values(['user', 'created_at'])
-                        .groupby('user')
-                        .apply(lambda g: g.assign(
-                            prev_score=g['score'].shift(1),
-                            score_growth=g['score'].diff()
-                            ))
-                        .dropna(subset=['score_growth']))
         results = {
             'top_users_ranked': top_users, 
-            'score_growth': score_growth.head(10) 
+            'score_growth': compute_score_growth(df) 
         }
         
         logger.info(f"Window analysis complete: {len(top_users)} ranked users")
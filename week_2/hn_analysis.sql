@@ -1,6 +1,8 @@
 -- hnanalysis.sql
 -- Purpose: Production-ready Hacker News analytics dashboard
 -- Inputs: hn_posts table (id, title, user, score, comments, created_at)
+--         user_daily rollup (event_date, user, posts, total_comments),
+--         maintained by etlpipeline/etl/etl_hn_github.py on every load
 -- Output: metric | event_date | user | value
 -- Usage: Point BI tool / Python script at this query for HN KPIs
 
@@ -12,17 +14,6 @@ WITH top_posts AS (
         AND comments > 10
 ), 
 
-user_daily AS (
-    -- user activity per day
-    SELECT 
-        DATE(created_at) AS event_date, 
-        user, 
-        COUNT(*) AS posts, 
-        SUM(comments) AS total_comments
-    FROM hn_posts 
-    GROUP BY DATE(created_at), user
-), 
-
 daily_leaders AS (
     -- Top user per day
     SELECT 
@@ -3,6 +3,7 @@
 /*
 Days 8-12 -> hnanalysis.sql deliverable 
 Top posts + users + time + growth -> Production Dashboard 
+user_daily = ETL rollup table (one row per day x user), no CTE needed
 */
 
 WITH top_posts AS (
@@ -12,17 +13,6 @@ WITH top_posts AS (
     WHERE score > 50 AND comments > 10
 ), 
 
-user_daily AS (
-    -- Day 12: user activity per day
-    SELECT 
-        DATE(created_at) AS event_date, 
-        user, 
-        COUNT(*) AS posts, 
-        SUM(comments) AS total_comments
-    FROM hn_posts 
-    GROUP BY DATE(created_at), user
-), 
-
 daily_leaders AS (
     -- Day 12 Block 1 : Top user per day
     SELECT 